@@ -38,6 +38,8 @@ BASE_DIR  = _find_base_dir()
 _DB_DIR = os.path.join(BASE_DIR, "database SQL")
 DB_PATH      = os.path.join(_DB_DIR, "nesk3.db")
 ARCHIV_DB_PATH = os.path.join(_DB_DIR, "archiv.db")
+DIENSTPLAN_CACHE_DB_PATH = os.path.join(_DB_DIR, "dienstplan_cache.db")
+SUCHINDEX_DB_PATH        = os.path.join(_DB_DIR, "suchindex.db")
 os.makedirs(_DB_DIR, exist_ok=True)
 
 # ─── Anwendungseinstellungen ──────────────────────────────────────────────────
@@ -1,4 +1,4 @@
 """Datenbank-Paket"""
-from .connection import get_connection, test_connection
+from .connection import get_connection, test_connection, reset_verbindungen
 
-__all__ = ["get_connection", "test_connection"]
+__all__ = ["get_connection", "test_connection", "reset_verbindungen"]
@@ -0,0 +1,55 @@
+"""
+Änderungs-Monitor für Ansichten
+Mehrere PCs arbeiten auf derselben (OneDrive-)Datenbank. Statt bei jeder
+Navigation alles neu abzufragen, merkt sich eine Seite den Änderungsstand
+der Tabellen / Datenbanken, die sie anzeigt, und lädt nur neu, wenn sich
+dieser Stand geändert hat.
+
+  • Haupt-DB: Stand je Tabelle aus database.lesecache (lokale Schreibzugriffe
+    je Tabelle, Änderungen anderer PCs über PRAGMA data_version)
+  • Neben-Datenbanken (Einsätze, Stellungnahmen, …): Änderungszeit und
+    Größe der DB-Datei und ihres WAL
+
+pruefen() wird periodisch (GUI-Timer) aufgerufen und fragt data_version ab.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import lesecache
+
+# Abfrage-Intervall für den GUI-Timer
+PRUEF_INTERVALL_MS = 5000
+
+
+def _datei_stand(name: str) -> tuple:
+    from database.registry import pfad
+    p = pfad(name)
+    stand = []
+    for datei in (p, p + "-wal"):
+        try:
+            st = os.stat(datei)
+            stand.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stand.append(None)
+    return tuple(stand)
+
+
+def stand(tabellen=(), datenbanken=()) -> tuple:
+    """
+    Änderungsstand für die Haupt-DB-`tabellen` und die registrierten
+    Neben-`datenbanken` (Namen aus database.registry). Zwei gleiche Stände
+    bedeuten: seitdem nichts geändert.
+    """
+    return (
+        lesecache.tabellen_stand(tabellen) if tabellen else (),
+        tuple(_datei_stand(n) for n in datenbanken),
+    )
+
+
+def pruefen() -> bool:
+    """
+    Prüft, ob andere Verbindungen / PCs die Haupt-DB geändert haben
+    (PRAGMA data_version). Gibt True zurück, wenn ja.
+    """
+    return lesecache.fremde_aenderungen_pruefen()
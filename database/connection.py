@@ -2,14 +2,32 @@
 SQLite Datenbankverbindung
 Verwaltet Verbindungen zur Nesk3 SQLite-Datenbank.
 WAL-Modus für sicheres gleichzeitiges Lesen von mehreren PCs.
+
+db_cursor() verwendet pro Thread eine dauerhaft geöffnete Verbindung
+(PRAGMAs nur einmal beim Öffnen), statt bei jedem Aufruf neu zu verbinden –
+die Datenbank liegt auf OneDrive, jedes Öffnen kostet Dateisystem-Zugriffe.
+Nach einer Wiederherstellung / einem Austausch der DB-Datei muss
+reset_verbindungen() aufgerufen werden.
 """
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DB_PATH
+from database.messung import MessVerbindung
+
+# Nach dieser Leerlaufzeit (Sekunden) wird eine Pool-Verbindung vor der
+# Wiederverwendung geprüft (SELECT 1 + Datei-Identität)
+_PRUEF_INTERVALL = 30.0
+
+_lokal      = threading.local()
+_pool_lock  = threading.Lock()
+_generation = 0   # wird von reset_verbindungen() erhöht
+_statistik  = {'geoeffnet': 0, 'wiederverwendet': 0, 'verworfen': 0}
 
 
 def _row_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
@@ -20,7 +38,7 @@ def _row_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
 
 def get_connection() -> sqlite3.Connection:
     """Gibt eine neue SQLite-Verbindung zurück (WAL-Modus, dict-Zeilen)."""
-    conn = sqlite3.connect(DB_PATH, timeout=10)
+    conn = sqlite3.connect(DB_PATH, timeout=10, factory=MessVerbindung)
     conn.row_factory = _row_factory
     conn.execute("PRAGMA journal_mode = WAL")
     conn.execute("PRAGMA foreign_keys = ON")
@@ -46,21 +64,177 @@ def test_connection() -> tuple[bool, str]:
         return False, str(e)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+#  Verbindungs-Pool (eine Verbindung pro Thread)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _PoolVerbindung:
+    """Dauerhafte Verbindung eines Threads samt Zustand für die Gesundheitsprüfung."""
+
+    def __init__(self, oeffnen=None, pfad: str = DB_PATH):
+        self.pfad         = pfad
+        self.conn         = (oeffnen or get_connection)()
+        self.generation   = _generation
+        self.datei_id     = _datei_id(pfad)
+        self.pid          = os.getpid()
+        self.benutzt_am   = time.monotonic()
+        self.in_benutzung = False
+
+    def ist_gesund(self) -> bool:
+        if self.generation != _generation or self.pid != os.getpid():
+            return False
+        if time.monotonic() - self.benutzt_am < _PRUEF_INTERVALL:
+            return True
+        # Länger unbenutzt: Verbindung und DB-Datei prüfen
+        if _datei_id(self.pfad) != self.datei_id:
+            return False
+        try:
+            self.conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def schliessen(self) -> None:
+        if self.pid != os.getpid():
+            return   # per fork geerbte Verbindung nur verwerfen, nie benutzen
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+def _datei_id(pfad: str = DB_PATH):
+    """Identität der DB-Datei (ändert sich, wenn die Datei ersetzt wurde)."""
+    try:
+        st = os.stat(pfad)
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+
+def _thread_verbindungen() -> dict:
+    """Pool-Verbindungen des aktuellen Threads (Schlüssel = DB-Pfad)."""
+    verbindungen = getattr(_lokal, 'verbindungen', None)
+    if verbindungen is None:
+        verbindungen = _lokal.verbindungen = {}
+    return verbindungen
+
+
+def _pool_verbindung(pfad: str = DB_PATH, oeffnen=None) -> _PoolVerbindung:
+    """Warme Verbindung des aktuellen Threads zu `pfad` (bei Bedarf neu geöffnet)."""
+    verbindungen = _thread_verbindungen()
+    pv = verbindungen.get(pfad)
+    if pv is not None and pv.in_benutzung:
+        return pv   # verschachtelter Aufruf – Verbindung nicht antasten
+    if pv is not None and not pv.ist_gesund():
+        pv.schliessen()
+        pv = None
+        with _pool_lock:
+            _statistik['verworfen'] += 1
+    if pv is None:
+        pv = _PoolVerbindung(oeffnen, pfad)
+        verbindungen[pfad] = pv
+        with _pool_lock:
+            _statistik['geoeffnet'] += 1
+    else:
+        with _pool_lock:
+            _statistik['wiederverwendet'] += 1
+    return pv
+
+
+@contextmanager
+def gepoolte_verbindung(pfad: str = DB_PATH, oeffnen=None, commit: bool = False):
+    """
+    Liefert die warme Verbindung des aktuellen Threads zu `pfad`
+    (Commit bei commit=True, sonst Rollback offener Transaktionen).
+    Verschachtelte Aufrufe erhalten eine eigene, neue Verbindung, damit
+    Commit/Rollback des inneren Blocks den äußeren nicht beeinflusst.
+    """
+    pv = _pool_verbindung(pfad, oeffnen)
+    if pv.in_benutzung:
+        with _eigene_verbindung(oeffnen, commit) as conn:
+            yield conn
+        return
+
+    conn = pv.conn
+    pv.in_benutzung = True
+    try:
+        yield conn
+        if commit:
+            conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            pv.generation = -1   # Verbindung unbrauchbar → beim nächsten Mal neu öffnen
+        raise
+    finally:
+        # Offene (nicht committete) Transaktion wie beim früheren close() verwerfen
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            pv.generation = -1
+        pv.in_benutzung = False
+        pv.benutzt_am   = time.monotonic()
+
+
+def schliesse_thread_verbindung() -> None:
+    """
+    Schließt alle Pool-Verbindungen des aktuellen Threads.
+    Sollte am Ende langlebiger Worker-Threads aufgerufen werden
+    (beim Thread-Ende werden sie sonst erst vom Garbage Collector geschlossen).
+    """
+    verbindungen = _thread_verbindungen()
+    for pv in list(verbindungen.values()):
+        if not pv.in_benutzung:
+            pv.schliessen()
+    _lokal.verbindungen = {p: pv for p, pv in verbindungen.items() if pv.in_benutzung}
+
+
+def reset_verbindungen() -> None:
+    """
+    Verwirft alle Pool-Verbindungen – nach Backup-Wiederherstellung oder
+    Austausch der DB-Datei aufrufen. Die Verbindungen des aufrufenden Threads
+    werden sofort geschlossen, die anderer Threads vor ihrer nächsten Nutzung.
+    """
+    global _generation
+    with _pool_lock:
+        _generation += 1
+    schliesse_thread_verbindung()
+
+
+def pool_statistik() -> dict:
+    """Zähler des Verbindungs-Pools (geöffnet / wiederverwendet / verworfen)."""
+    with _pool_lock:
+        return dict(_statistik, generation=_generation)
+
+
 @contextmanager
 def db_cursor(commit: bool = False):
     """
     Kontextmanager für DB-Cursor mit automatischem Commit/Rollback.
     Cursor liefert Zeilen als dict.
 
+    Verwendet die warme Verbindung des aktuellen Threads. Verschachtelte
+    Aufrufe erhalten eine eigene, neue Verbindung (wie bisher), damit
+    Commit/Rollback des inneren Blocks den äußeren nicht beeinflusst.
+
     Verwendung:
         with db_cursor(commit=True) as cur:
             cur.execute("INSERT ...")
     """
+    with gepoolte_verbindung(DB_PATH, get_connection, commit) as conn:
+        yield conn.cursor()
+
+
+@contextmanager
+def _eigene_verbindung(oeffnen, commit: bool):
+    """Einmal-Verbindung (bisheriges Verhalten von db_cursor)."""
     conn = None
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        yield cur
+        conn = (oeffnen or get_connection)()
+        yield conn
         if commit:
             conn.commit()
     except Exception:
@@ -0,0 +1,40 @@
+"""
+ISO-Datumsspalten für Tabellen mit dd.MM.yyyy-Datum
+Stellungnahmen, Verspätungen und Einsätze speichern das Datum als
+dd.MM.yyyy. Eine generierte Spalte iso_datum (yyyy-MM-dd) macht es
+sortier- und indexierbar; Monat/Jahr-Filter werden zu Bereichsabfragen.
+"""
+
+
+def iso_datum_spalte(tabelle: str, spalte: str = "datum") -> str:
+    """ALTER TABLE für die generierte Spalte iso_datum (NULL bei ungültigem Datum)."""
+    return (
+        f"ALTER TABLE {tabelle} ADD COLUMN iso_datum TEXT GENERATED ALWAYS AS ("
+        f"CASE WHEN length({spalte}) = 10 THEN "
+        f"substr({spalte},7,4) || '-' || substr({spalte},4,2) || '-' || substr({spalte},1,2) "
+        f"END) VIRTUAL;"
+    )
+
+
+def zeitraum(jahr: int, monat: int | None = None) -> tuple[str, str]:
+    """Halboffener ISO-Bereich [von, bis) für ein Jahr bzw. einen Monat."""
+    if monat is None:
+        return f"{jahr:04d}-01-01", f"{jahr + 1:04d}-01-01"
+    if monat == 12:
+        return f"{jahr:04d}-12-01", f"{jahr + 1:04d}-01-01"
+    return f"{jahr:04d}-{monat:02d}-01", f"{jahr:04d}-{monat + 1:02d}-01"
+
+
+def zeitraum_filter(where_parts: list, params: list,
+                    jahr: int | None, monat: int | None) -> None:
+    """
+    Ergänzt WHERE-Bedingungen für Monat/Jahr auf iso_datum.
+    Mit Jahr als Bereich (indexfähig), nur Monat als Vergleich des Monatsteils.
+    """
+    if jahr:
+        von, bis = zeitraum(jahr, monat or None)
+        where_parts.append("iso_datum >= ? AND iso_datum < ?")
+        params.extend([von, bis])
+    elif monat:
+        where_parts.append("substr(iso_datum, 6, 2) = ?")
+        params.append(f"{monat:02d}")
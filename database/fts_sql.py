@@ -0,0 +1,89 @@
+"""
+FTS5-Volltextsuche für die Suchfelder
+Pro Tabelle eine FTS5-Tabelle <tabelle>_fts mit externem Inhalt
+(content=<tabelle>), per Trigger bei INSERT/UPDATE/DELETE synchron gehalten.
+Suchbegriffe werden als Präfix-Suche ("begriff"*) verknüpft, Treffer
+nach Relevanz (bm25) sortiert. Wörter mit Ziffern (Flug-/Einsatznummern)
+finden über such_filter() zusätzlich Teilstrings in Kennungsspalten
+("123" → "LH123"), die der Wort-Präfix-Index nicht abdeckt.
+"""
+import re
+
+
+def fts_schema(tabelle: str, spalten: list[str], id_spalte: str = "id") -> str:
+    """
+    Migrationsskript: FTS5-Tabelle, Sync-Trigger und Neuaufbau aus den
+    vorhandenen Zeilen.
+    """
+    fts   = f"{tabelle}_fts"
+    liste = ", ".join(spalten)
+    neu   = ", ".join(f"new.{s}" for s in spalten)
+    alt   = ", ".join(f"old.{s}" for s in spalten)
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {liste},
+    content='{tabelle}', content_rowid='{id_spalte}',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabelle} BEGIN
+    INSERT INTO {fts}(rowid, {liste}) VALUES (new.{id_spalte}, {neu});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabelle} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {liste}) VALUES ('delete', old.{id_spalte}, {alt});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {tabelle} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {liste}) VALUES ('delete', old.{id_spalte}, {alt});
+    INSERT INTO {fts}(rowid, {liste}) VALUES (new.{id_spalte}, {neu});
+END;
+
+INSERT INTO {fts}({fts}) VALUES ('rebuild');
+"""
+
+
+def match_ausdruck(suchtext: str | None) -> str | None:
+    """
+    Wandelt eine Sucheingabe in einen FTS5-MATCH-Ausdruck um:
+    jedes Wort als Präfix, alle Wörter müssen vorkommen.
+    None, wenn die Eingabe keine Wörter enthält.
+    """
+    woerter = re.findall(r"\w+", suchtext or "")
+    if not woerter:
+        return None
+    return " ".join(f'"{w}"*' for w in woerter)
+
+
+def such_filter(
+    suchtext: str | None,
+    fts: str,
+    id_spalte: str,
+    infix_spalten: tuple[str, ...] = (),
+) -> tuple[str | None, list[str], list]:
+    """
+    Suchbedingungen für eine Sucheingabe.
+    Wörter ohne Ziffern gehen in den MATCH-Ausdruck (Join auf `fts`, Ranking).
+    Wörter mit Ziffern treffen als Präfix ODER als Teilstring (LIKE) in einer
+    der `infix_spalten` – diese Spalten sind kurze Kennungen, der LIKE-Scan
+    betrifft also nur Nummern-Suchen.
+
+    Returns:
+        (match, bedingungen, params) – match für "<fts> MATCH ?" (oder None),
+        bedingungen/params als zusätzliche WHERE-Teile.
+    """
+    if not infix_spalten:
+        return match_ausdruck(suchtext), [], []
+    woerter  = re.findall(r"\w+", suchtext or "")
+    normal   = [w for w in woerter if not re.search(r"\d", w)]
+    nummern  = [w for w in woerter if re.search(r"\d", w)]
+    bedingungen: list[str] = []
+    params: list = []
+    for w in nummern:
+        teile = [f"{id_spalte} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"]
+        params.append(f'"{w}"*')
+        for spalte in infix_spalten:
+            teile.append(f"{spalte} LIKE ?")
+            params.append(f"%{w}%")
+        bedingungen.append("(" + " OR ".join(teile) + ")")
+    return match_ausdruck(" ".join(normal)), bedingungen, params
@@ -0,0 +1,280 @@
+"""
+Lese-Cache für die Abfrage-Funktionen (functions/*)
+Ergebnisse von Lesefunktionen auf der Haupt-Datenbank werden im Speicher
+gehalten, bis sich eine ihrer Tabellen ändert:
+  • lokale Schreibzugriffe (gemeldet von database.messung.MessVerbindung)
+    verwerfen nur die Einträge der betroffenen Tabellen – inklusive der
+    Tabellen, die per Fremdschlüssel-Kaskade oder Trigger mitgeändert werden
+  • PRAGMA data_version zeigt Schreibzugriffe anderer Verbindungen /
+    anderer PCs auf die gemeinsame DB an → der gesamte Cache wird verworfen
+
+Verwendung:
+    @gecacht("fahrzeuge", "fahrzeug_status")
+    def lade_alle_fahrzeuge(nur_aktive: bool = False) -> list[dict]: ...
+"""
+import functools
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_PATH
+from database.messung import beobachte_schreibzugriffe, normpfad
+
+_MAX_EINTRAEGE = 2000
+
+_PFAD      = normpfad(DB_PATH)
+_lock      = threading.RLock()
+_eintraege: dict[tuple, tuple] = {}     # (funktion, args, kwargs) → (wert, tabellen)
+_versionen = Counter()                  # tabelle → Änderungszähler
+_zaehler: dict[str, list[int]] = {}     # funktion → [treffer, fehlgriffe]
+_epoche    = 0                          # wird bei jedem vollständigen Leeren erhöht
+_globale_leerungen = 0
+_folgetabellen: tuple[int, dict] | None = None   # (schema_version, folgen)
+_db_identitaet: tuple | None = None     # (Pool-Generation, Datei-Identität) beim letzten Prüfen
+_aktiv = True
+
+_RE_TRIGGER_ZIEL = re.compile(
+    r"(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Decorator
+# ──────────────────────────────────────────────────────────────────────────────
+
+def gecacht(*tabellen: str):
+    """
+    Cacht das Ergebnis einer Lesefunktion der Haupt-DB, bis eine der
+    angegebenen Tabellen geändert wird. Argumente müssen hashbar sein
+    (sonst wird ungecacht gelesen). Rückgaben werden als Kopie geliefert,
+    damit Aufrufer den Cache-Inhalt nicht verändern.
+    """
+    tabellen = tuple(t.lower() for t in tabellen)
+
+    def dekorator(funktion):
+        name = f"{funktion.__module__}.{funktion.__qualname__}"
+        _zaehler.setdefault(name, [0, 0])
+
+        @functools.wraps(funktion)
+        def wrapper(*args, **kwargs):
+            if not _aktiv:
+                return funktion(*args, **kwargs)
+            schluessel = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(schluessel)
+            except TypeError:
+                return funktion(*args, **kwargs)
+
+            fremde_aenderungen_pruefen()
+            with _lock:
+                eintrag = _eintraege.get(schluessel)
+                if eintrag is not None:
+                    _zaehler[name][0] += 1
+                    return _kopie(eintrag[0])
+                _zaehler[name][1] += 1
+                stand = (_epoche, tuple(_versionen[t] for t in tabellen))
+
+            wert = funktion(*args, **kwargs)
+
+            with _lock:
+                # Während des Lesens geändert → Ergebnis nicht speichern
+                if stand == (_epoche, tuple(_versionen[t] for t in tabellen)):
+                    if len(_eintraege) >= _MAX_EINTRAEGE:
+                        _eintraege.pop(next(iter(_eintraege)))
+                    _eintraege[schluessel] = (wert, tabellen)
+            return _kopie(wert)
+
+        return wrapper
+
+    return dekorator
+
+
+def _kopie(wert):
+    if isinstance(wert, list):
+        return [dict(z) if isinstance(z, dict) else z for z in wert]
+    if isinstance(wert, dict):
+        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in wert.items()}
+    return wert
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Invalidierung
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _schreibzugriff(conn, tabellen: set) -> None:
+    """Beobachter für database.messung: lokale Änderung an `tabellen`."""
+    if getattr(conn, "pfad", None) != _PFAD:
+        return
+    betroffen = set()
+    folgen = _folgen(conn)
+    for t in tabellen:
+        betroffen |= folgen.get(t, {t})
+    tabellen_verwerfen(betroffen)
+
+
+def tabellen_verwerfen(tabellen) -> None:
+    """Verwirft alle Einträge, die eine der Tabellen lesen."""
+    with _lock:
+        for t in tabellen:
+            _versionen[t] += 1
+        tabellen = set(tabellen)
+        for schluessel in [s for s, (_, tb) in _eintraege.items() if tabellen.intersection(tb)]:
+            del _eintraege[schluessel]
+
+
+def leeren() -> None:
+    """Verwirft den gesamten Cache (z. B. nach Änderungen anderer PCs)."""
+    global _epoche, _globale_leerungen
+    with _lock:
+        _epoche += 1
+        _eintraege.clear()
+        _globale_leerungen += 1
+
+
+def fremde_aenderungen_pruefen() -> bool:
+    """
+    Vergleicht PRAGMA data_version der Thread-Verbindung mit dem zuletzt
+    gesehenen Wert. Der Wert ändert sich nur durch Commits ANDERER
+    Verbindungen (anderer Thread, anderer Prozess, anderer PC).
+    Eine neue Verbindung (z. B. eines Worker-Threads) übernimmt ihren Wert
+    nur als Ausgangsstand – Änderungen anderer PCs meldet weiterhin die
+    Verbindung des GUI-Threads. Geleert wird zusätzlich, wenn die DB-Datei
+    ersetzt bzw. der Pool zurückgesetzt wurde (reset_verbindungen).
+    Gibt True zurück, wenn der Cache geleert wurde.
+    """
+    global _db_identitaet
+    from database.connection import db_cursor, pool_statistik
+    try:
+        with db_cursor() as cur:
+            conn = cur.connection
+            version = cur.execute("PRAGMA data_version").fetchone()["data_version"]
+            zuletzt = getattr(conn, "cache_data_version", None)
+            conn.cache_data_version = version
+    except Exception:
+        leeren()
+        return True
+    if zuletzt is None:
+        try:
+            st = os.stat(DB_PATH)
+            datei = (st.st_dev, st.st_ino)
+        except OSError:
+            datei = None
+        identitaet = (pool_statistik()["generation"], datei)
+        with _lock:
+            ersetzt = _db_identitaet is not None and _db_identitaet != identitaet
+            _db_identitaet = identitaet
+        if ersetzt:
+            leeren()
+        return ersetzt
+    if zuletzt != version:
+        leeren()
+        return True
+    return False
+
+
+def tabellen_stand(tabellen) -> tuple:
+    """
+    Änderungsstand der Tabellen: ändert sich bei jedem Schreibzugriff auf
+    eine davon und bei jedem vollständigen Leeren (fremde Änderungen).
+    """
+    with _lock:
+        return (_epoche, tuple(_versionen[t.lower()] for t in tabellen))
+
+
+def _folgen(conn) -> dict[str, set[str]]:
+    """
+    Tabelle → alle Tabellen, die bei einer Änderung mitbetroffen sein können
+    (Fremdschlüssel ON DELETE/UPDATE CASCADE / SET NULL und Trigger-Ziele).
+    Aus dem Schema ermittelt, neu nur nach Schema-Änderungen (Migrationen).
+    """
+    global _folgetabellen
+    direkt: dict[str, set[str]] = {}
+    try:
+        cur = sqlite3.Cursor(conn)
+        cur.row_factory = None
+        schema_version = cur.execute("PRAGMA schema_version").fetchone()[0]
+        if _folgetabellen is not None and _folgetabellen[0] == schema_version:
+            return _folgetabellen[1]
+        namen = [r[0] for r in cur.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()]
+        for kind in namen:
+            for fk in cur.execute("SELECT * FROM pragma_foreign_key_list(?)", (kind,)).fetchall():
+                eltern, on_update, on_delete = fk[2], fk[5], fk[6]
+                if on_update != "NO ACTION" or on_delete != "NO ACTION":
+                    direkt.setdefault(eltern.lower(), set()).add(kind.lower())
+        for tabelle, sql in cur.execute(
+            "SELECT tbl_name, sql FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchall():
+            rumpf = (sql or "").split("BEGIN", 1)[-1]
+            for ziel in _RE_TRIGGER_ZIEL.findall(rumpf):
+                direkt.setdefault(tabelle.lower(), set()).add(ziel.lower())
+    except sqlite3.Error:
+        return {}
+
+    folgen: dict[str, set[str]] = {}
+    for start in direkt:
+        gesehen, offen = {start}, [start]
+        while offen:
+            for naechste in direkt.get(offen.pop(), ()):
+                if naechste not in gesehen:
+                    gesehen.add(naechste)
+                    offen.append(naechste)
+        folgen[start] = gesehen
+    _folgetabellen = (schema_version, folgen)
+    return folgen
+
+
+beobachte_schreibzugriffe(_schreibzugriff)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Steuerung / Diagnose
+# ──────────────────────────────────────────────────────────────────────────────
+
+def setze_aktiv(aktiv: bool) -> None:
+    global _aktiv
+    _aktiv = aktiv
+    if not aktiv:
+        leeren()
+
+
+def statistik() -> dict:
+    """
+    Treffer/Fehlgriffe je Funktion und gesamt:
+    {'funktionen': [{funktion, treffer, fehlgriffe, quote}], 'treffer',
+     'fehlgriffe', 'eintraege', 'globale_leerungen', 'aktiv'}
+    """
+    with _lock:
+        funktionen = [
+            {
+                "funktion":   name,
+                "treffer":    t,
+                "fehlgriffe": f,
+                "quote":      t / (t + f) if t + f else 0.0,
+            }
+            for name, (t, f) in _zaehler.items()
+        ]
+        eintraege = len(_eintraege)
+        leerungen = _globale_leerungen
+    funktionen.sort(key=lambda e: e["treffer"] + e["fehlgriffe"], reverse=True)
+    return {
+        "funktionen":        funktionen,
+        "treffer":           sum(e["treffer"] for e in funktionen),
+        "fehlgriffe":        sum(e["fehlgriffe"] for e in funktionen),
+        "eintraege":         eintraege,
+        "globale_leerungen": leerungen,
+        "aktiv":             _aktiv,
+    }
+
+
+def zaehler_zuruecksetzen() -> None:
+    with _lock:
+        for z in _zaehler.values():
+            z[0] = z[1] = 0
@@ -0,0 +1,418 @@
+"""
+Abfrage-Messung für alle SQLite-Verbindungen
+Jede Anweisung wird mit SQL, aufrufender Funktion, Dauer und Zeilenzahl
+in einem Ringpuffer erfasst; daraus entstehen Kennzahlen je Anweisung
+(Anzahl, p50/p95/max). Langsame Abfragen landen in einem rotierenden
+Log je PC (lokal, nicht im OneDrive-Ordner), optional mit EXPLAIN QUERY
+PLAN bei vollständigen Tabellen-Scans.
+
+Aktiv über die Verbindungsklasse MessVerbindung (siehe
+database.connection.get_connection und database.registry). Dieselbe
+Klasse meldet Schreibzugriffe je Tabelle an registrierte Beobachter
+(z. B. database.lesecache).
+"""
+import logging
+import os
+import re
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from logging.handlers import RotatingFileHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_RING_GROESSE = 5000
+_MAX_ANWEISUNGEN = 2000   # verschiedene Anweisungen in Zähler/Plänen (danach kürzen)
+
+
+def _lokaler_log_pfad() -> str:
+    """
+    Log-Datei je PC: lokal (%LOCALAPPDATA%, sonst Home-Verzeichnis) statt im
+    geteilten OneDrive-Ordner – RotatingFileHandler ist nicht prozessübergreifend
+    sicher. Der Rechnername im Dateinamen trennt auch servergespeicherte Profile.
+    """
+    lokal = os.environ.get("LOCALAPPDATA")
+    ordner = (os.path.join(lokal, "Nesk3", "logs") if lokal
+              else os.path.join(os.path.expanduser("~"), ".nesk3", "logs"))
+    rechner = re.sub(r"[^\w.-]", "_", socket.gethostname() or "pc")
+    return os.path.join(ordner, f"langsame_abfragen_{rechner}.log")
+
+
+_LOG_PFAD = _lokaler_log_pfad()
+
+_lock      = threading.Lock()
+_ring: deque = deque(maxlen=_RING_GROESSE)   # je Eintrag: _Messwert
+_anzahl    = Counter()                       # Gesamtzahl je Anweisung (über den Ring hinaus)
+_plaene: dict[str, str] = {}                 # Anweisung → Query-Plan (nur bei Scans)
+_optionen  = {
+    'aktiv':      True,
+    'langsam_ms': 100.0,     # ab dieser Dauer ins Log
+    'query_plan': False,     # EXPLAIN QUERY PLAN für SELECTs erfassen
+}
+_logger: logging.Logger | None = None
+
+_EIGENE_DATEIEN = (
+    os.path.normcase(os.path.abspath(__file__)).rsplit(".", 1)[0],
+    os.path.normcase(os.path.join(os.path.dirname(os.path.abspath(__file__)), "connection")),
+    os.path.normcase(os.path.join(os.path.dirname(os.path.abspath(__file__)), "registry")),
+)
+_RE_LEER = re.compile(r"\s+")
+# Platzhalter-Listen variabler Länge: IN (?, ?, …) und VALUES (?, ?), (?, ?), …
+_RE_PLATZHALTER = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_TUPEL_FOLGE = re.compile(r"\(\?, …\)(?:\s*,\s*\(\?, …\))+")
+_RE_SCHREIBEN = re.compile(
+    r"\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+(?:[\"`\[]?(\w+)[\"`\]]?\.)?[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+# Beobachter für Schreibzugriffe: f(verbindung, tabellen: set[str])
+# Aufruf beim Ausführen der Anweisung und erneut bei Commit/Rollback.
+_schreib_beobachter: list = []
+
+
+class _Messwert:
+    """
+    Eine erfasste Ausführung (wird beim Abholen der Zeilen ergänzt).
+    offen: Anweisung liefert Zeilen, die noch nicht alle abgeholt sind –
+    ein Eintrag ins Langsam-Log erfolgt erst danach (mit Zeilenzahl).
+    """
+    __slots__ = ("sql", "aufrufer", "zeitpunkt", "dauer_ms", "zeilen", "geloggt", "offen")
+
+    def __init__(self, sql: str, aufrufer: str, dauer_ms: float, zeilen: int):
+        self.sql       = sql
+        self.aufrufer  = aufrufer
+        self.zeitpunkt = time.time()
+        self.dauer_ms  = dauer_ms
+        self.zeilen    = zeilen
+        self.geloggt   = False
+        self.offen     = False
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Verbindungs- und Cursor-Klasse
+# ──────────────────────────────────────────────────────────────────────────────
+
+class MessCursor(sqlite3.Cursor):
+    """Cursor, der execute/executemany und das Abholen der Zeilen misst."""
+
+    _messwert: _Messwert | None = None
+
+    def execute(self, sql, parameter=()):
+        self._abschliessen()
+        if not _optionen['aktiv']:
+            self._messwert = None
+            super().execute(sql, parameter)
+        else:
+            start = time.perf_counter()
+            super().execute(sql, parameter)
+            self._messwert = _erfassen(self, sql, parameter, start)
+        if _schreib_beobachter:
+            _schreibzugriff(self.connection, sql)
+        return self
+
+    def executemany(self, sql, folge):
+        self._abschliessen()
+        if not _optionen['aktiv']:
+            self._messwert = None
+            super().executemany(sql, folge)
+        else:
+            start = time.perf_counter()
+            super().executemany(sql, folge)
+            self._messwert = _erfassen(self, sql, None, start)
+        if _schreib_beobachter:
+            _schreibzugriff(self.connection, sql)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        zeile = super().fetchone()
+        self._nachtrag(start, 0 if zeile is None else 1, zeile is None)
+        return zeile
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        size = self.arraysize if size is None else size
+        zeilen = super().fetchmany(size)
+        self._nachtrag(start, len(zeilen), len(zeilen) < size)
+        return zeilen
+
+    def fetchall(self):
+        start = time.perf_counter()
+        zeilen = super().fetchall()
+        self._nachtrag(start, len(zeilen), True)
+        return zeilen
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            zeile = super().__next__()
+        except StopIteration:
+            self._nachtrag(start, 0, True)
+            raise
+        self._nachtrag(start, 1, False)
+        return zeile
+
+    def close(self):
+        self._abschliessen()
+        super().close()
+
+    def __del__(self):
+        self._abschliessen()
+
+    def _nachtrag(self, start: float, zeilen: int, fertig: bool) -> None:
+        m = self._messwert
+        if m is None:
+            return
+        m.dauer_ms += (time.perf_counter() - start) * 1000
+        m.zeilen   += zeilen
+        if fertig:
+            self._abschliessen()
+
+    def _abschliessen(self) -> None:
+        """Zeilenabruf beendet (erschöpft, Cursor geschlossen oder neu benutzt)."""
+        m = self._messwert
+        if m is None or not m.offen:
+            return
+        m.offen = False
+        if not m.geloggt and m.dauer_ms >= _optionen['langsam_ms']:
+            _langsam_loggen(m)
+
+
+class MessVerbindung(sqlite3.Connection):
+    """
+    sqlite3-Verbindung, deren Cursor (auch conn.execute) gemessen werden.
+    pfad: normalisierter Dateipfad der Datenbank
+    geaenderte_tabellen: in der laufenden Transaktion beschriebene Tabellen
+    """
+
+    def __init__(self, database, *args, **kwargs):
+        super().__init__(database, *args, **kwargs)
+        self.pfad = normpfad(os.fspath(database))
+        self.geaenderte_tabellen: set[str] = set()
+
+    def commit(self):
+        super().commit()
+        self._transaktion_beendet()
+
+    def rollback(self):
+        super().rollback()
+        self._transaktion_beendet()
+
+    def _transaktion_beendet(self) -> None:
+        if self.geaenderte_tabellen:
+            tabellen, self.geaenderte_tabellen = self.geaenderte_tabellen, set()
+            _beobachter_melden(self, tabellen)
+
+    def cursor(self, factory=MessCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameter=()):
+        return self.cursor().execute(sql, parameter)
+
+    def executemany(self, sql, folge):
+        return self.cursor().executemany(sql, folge)
+
+
+def normpfad(pfad: str) -> str:
+    """Vergleichbarer Datenbankpfad (Schlüssel für Beobachter / Caches)."""
+    return os.path.normcase(os.path.abspath(pfad))
+
+
+def _schreibzugriff(conn, sql: str) -> None:
+    m = _RE_SCHREIBEN.match(sql)
+    if m is None:
+        return
+    schema, tabelle = m.group(1), m.group(2)
+    if schema and schema.lower() not in ("main", "temp"):
+        return   # angehängte Datenbank (ATTACH)
+    tabelle = tabelle.lower()
+    if isinstance(conn, MessVerbindung):
+        conn.geaenderte_tabellen.add(tabelle)
+    _beobachter_melden(conn, {tabelle})
+
+
+def _beobachter_melden(conn, tabellen: set) -> None:
+    for beobachter in list(_schreib_beobachter):
+        try:
+            beobachter(conn, tabellen)
+        except Exception:
+            pass
+
+
+def _aufrufer() -> str:
+    """Erste Funktion außerhalb der DB-Schicht: 'modul.funktion:zeile'."""
+    f = sys._getframe(3)
+    while f is not None:
+        datei = os.path.normcase(f.f_code.co_filename).rsplit(".", 1)[0]
+        if datei not in _EIGENE_DATEIEN and "contextlib" not in datei:
+            modul = f.f_globals.get("__name__", "?")
+            return f"{modul}.{f.f_code.co_name}:{f.f_lineno}"
+        f = f.f_back
+    return "?"
+
+
+def _normalisieren(sql: str) -> str:
+    """Einheitlicher Schlüssel je Anweisung (Leerraum, Platzhalter-Listen zusammengefasst)."""
+    text = _RE_PLATZHALTER.sub("(?, …)", _RE_LEER.sub(" ", sql).strip())
+    return _RE_TUPEL_FOLGE.sub("(?, …), …", text)
+
+
+def _zaehler_kuerzen() -> None:
+    """Nur die häufigsten Anweisungen behalten (Aufruf unter _lock)."""
+    behalten = dict(_anzahl.most_common(_MAX_ANWEISUNGEN // 2))
+    _anzahl.clear()
+    _anzahl.update(behalten)
+    for text in [t for t in _plaene if t not in behalten]:
+        del _plaene[text]
+
+
+def _erfassen(cur: sqlite3.Cursor, sql: str, parameter, start: float) -> _Messwert:
+    dauer_ms = (time.perf_counter() - start) * 1000
+    text = _normalisieren(sql)
+    zeilen = cur.rowcount if cur.rowcount > 0 else 0
+    m = _Messwert(text, _aufrufer(), dauer_ms, zeilen)
+    m.offen = cur.description is not None   # SELECT & Co.: Log nach dem Abholen
+    with _lock:
+        _ring.append(m)
+        _anzahl[text] += 1
+        if len(_anzahl) > _MAX_ANWEISUNGEN:
+            _zaehler_kuerzen()
+        plan_fehlt = _optionen['query_plan'] and text not in _plaene
+    if plan_fehlt and parameter is not None and text.split(" ", 1)[0].upper() in ("SELECT", "WITH"):
+        _plan_erfassen(cur.connection, text, sql, parameter)
+    if not m.offen and dauer_ms >= _optionen['langsam_ms']:
+        _langsam_loggen(m)
+    return m
+
+
+def _plan_erfassen(conn: sqlite3.Connection, text: str, sql: str, parameter) -> None:
+    """EXPLAIN QUERY PLAN; gespeichert wird der Plan nur bei vollständigen Scans."""
+    try:
+        cur = sqlite3.Cursor(conn)   # ungemessen
+        cur.row_factory = None
+        zeilen = cur.execute("EXPLAIN QUERY PLAN " + sql, parameter).fetchall()
+    except sqlite3.Error:
+        return
+    details = [str(z[3]) for z in zeilen]
+    scan = any(d.startswith("SCAN ") and "CONSTANT" not in d for d in details)
+    with _lock:
+        _plaene[text] = "\n".join(details) if scan else ""
+    if scan:
+        _log().info("SCAN  %s\n    %s", text, "\n    ".join(details))
+
+
+def _log() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger("nesk3.langsame_abfragen")
+        logger.propagate = False
+        try:
+            os.makedirs(os.path.dirname(_LOG_PFAD), exist_ok=True)
+            handler = RotatingFileHandler(
+                _LOG_PFAD, maxBytes=1_000_000, backupCount=3, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s  %(message)s"))
+            logger.addHandler(handler)
+        except OSError:
+            logger.addHandler(logging.NullHandler())
+        logger.setLevel(logging.INFO)
+        _logger = logger
+    return _logger
+
+
+def _langsam_loggen(m: _Messwert) -> None:
+    m.geloggt = True
+    try:
+        _log().info("%8.1f ms  %5d Zeilen  %s  |  %s", m.dauer_ms, m.zeilen, m.aufrufer, m.sql)
+    except Exception:
+        pass
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Öffentliche API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def setze_optionen(aktiv: bool | None = None, langsam_ms: float | None = None,
+                   query_plan: bool | None = None) -> dict:
+    """Ändert die Mess-Optionen; gibt die aktuellen Optionen zurück."""
+    with _lock:
+        if aktiv is not None:
+            _optionen['aktiv'] = aktiv
+        if langsam_ms is not None:
+            _optionen['langsam_ms'] = float(langsam_ms)
+        if query_plan is not None:
+            _optionen['query_plan'] = query_plan
+            if query_plan:
+                _plaene.clear()
+        return dict(_optionen)
+
+
+def beobachte_schreibzugriffe(funktion) -> None:
+    """Registriert f(verbindung, tabellen) für Schreibzugriffe auf allen Verbindungen."""
+    if funktion not in _schreib_beobachter:
+        _schreib_beobachter.append(funktion)
+
+
+def optionen() -> dict:
+    with _lock:
+        return dict(_optionen)
+
+
+def letzte_abfragen(anzahl: int = 200) -> list[dict]:
+    """Die zuletzt erfassten Ausführungen (neueste zuerst)."""
+    with _lock:
+        werte = list(_ring)[-anzahl:]
+    return [
+        {"sql": m.sql, "aufrufer": m.aufrufer, "zeitpunkt": m.zeitpunkt,
+         "dauer_ms": m.dauer_ms, "zeilen": m.zeilen}
+        for m in reversed(werte)
+    ]
+
+
+def statistik() -> list[dict]:
+    """
+    Kennzahlen je Anweisung, teuerste (Summe der Dauer im Ringpuffer) zuerst:
+    sql, aufrufer, anzahl, p50_ms, p95_ms, max_ms, zeilen_schnitt, plan.
+    """
+    with _lock:
+        werte  = list(_ring)
+        anzahl = dict(_anzahl)
+        plaene = dict(_plaene)
+
+    gruppen: dict[str, list[_Messwert]] = {}
+    for m in werte:
+        gruppen.setdefault(m.sql, []).append(m)
+
+    ergebnis = []
+    for sql, ms in gruppen.items():
+        dauer = sorted(m.dauer_ms for m in ms)
+        n = len(dauer)
+        ergebnis.append({
+            "sql":            sql,
+            "aufrufer":       Counter(m.aufrufer for m in ms).most_common(1)[0][0],
+            "anzahl":         anzahl.get(sql, n),
+            "summe_ms":       sum(dauer),
+            "p50_ms":         dauer[n // 2],
+            "p95_ms":         dauer[min(n - 1, int(n * 0.95))],
+            "max_ms":         dauer[-1],
+            "zeilen_schnitt": sum(m.zeilen for m in ms) / n,
+            "plan":           plaene.get(sql, ""),
+        })
+    ergebnis.sort(key=lambda e: e["summe_ms"], reverse=True)
+    return ergebnis
+
+
+def zuruecksetzen() -> None:
+    """Leert Ringpuffer, Zähler und erfasste Query-Pläne."""
+    with _lock:
+        _ring.clear()
+        _anzahl.clear()
+        _plaene.clear()
+
+
+def log_pfad() -> str:
+    return _LOG_PFAD
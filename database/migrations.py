@@ -1,7 +1,12 @@
 ﻿"""
 Datenbankmigrationen
-Erstellt alle benötigten Tabellen beim ersten Start (SQLite)
+Erstellt alle benötigten Tabellen beim ersten Start (SQLite).
+Nummerierte Migrationsschritte, die erreichte Version steht in
+PRAGMA user_version. Die Engine (migriere) gilt auch für die
+Neben-Datenbanken, siehe database.registry.
 """
+import sqlite3
+
 from .connection import get_connection
 
 
@@ -51,6 +56,17 @@ CREATE TABLE IF NOT EXISTS dienstplan (
     erstellt_am     TEXT DEFAULT (datetime('now','localtime'))
 );
 
+CREATE TABLE IF NOT EXISTS dienstplan_import_dateien (
+    datei           TEXT PRIMARY KEY,          -- Pfad relativ zum Dienstplan-Ordner
+    mtime_ns        INTEGER NOT NULL,
+    groesse         INTEGER NOT NULL,
+    sha1            TEXT DEFAULT '',
+    datum           TEXT DEFAULT '',           -- YYYY-MM-DD
+    anzahl          INTEGER DEFAULT 0,
+    fehler          TEXT DEFAULT '',
+    importiert_am   TEXT DEFAULT (datetime('now','localtime'))
+);
+
 CREATE TABLE IF NOT EXISTS backup_log (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
     dateiname       TEXT NOT NULL,
@@ -176,51 +192,247 @@ _DEFAULT_POSITIONEN = [
 ]
 
 
-def run_migrations():
-    """Fuehrt alle Migrationen aus und erstellt die SQLite-Datenbank-Tabellen."""
-    conn = get_connection()
-    try:
-        conn.executescript(SQL_SCHEMA)
-        cur = conn.cursor()
-
-        for name, beschreibung in _DEFAULT_ABTEILUNGEN:
-            cur.execute(
-                "INSERT OR IGNORE INTO abteilungen (name, beschreibung) VALUES (?, ?)",
-                (name, beschreibung)
-            )
-        for name, kuerzel in _DEFAULT_POSITIONEN:
-            cur.execute(
-                "INSERT OR IGNORE INTO positionen (name, kuerzel) VALUES (?, ?)",
-                (name, kuerzel)
-            )
-        cur.execute(
-            "INSERT OR IGNORE INTO settings (schluessel, wert) VALUES (?, ?)",
-            ('dienstplan_ordner', _default_ordner)
-        )
+# ──────────────────────────────────────────────────────────────────────────────
+#  Migrations-Engine (Schema-Version in PRAGMA user_version)
+# ──────────────────────────────────────────────────────────────────────────────
 
-        # Neue Spalten für uebergabe_protokolle nachrüsten (SQLite ALTER TABLE)
-        for col, defn in [
-            ("handys_anzahl", "INTEGER DEFAULT 0"),
-            ("handys_notiz",  "TEXT DEFAULT ''"),
-            ("archiviert",    "INTEGER DEFAULT 0"),
-        ]:
+def _anweisungen(skript: str):
+    """Zerlegt ein SQL-Skript in einzelne Anweisungen (auch CREATE TRIGGER … END;)."""
+    puffer = ""
+    for teil in skript.split(";"):
+        puffer += teil + ";"
+        if sqlite3.complete_statement(puffer):
+            anweisung = puffer.strip()
+            puffer = ""
+            if anweisung.rstrip(";").strip():
+                yield anweisung
+    rest = puffer.rstrip(";").strip()
+    if rest:
+        yield rest
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Aktuelle Schema-Version der Datenbank (PRAGMA user_version)."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migriere(conn: sqlite3.Connection, schritte: list) -> int:
+    """
+    Bringt die Datenbank auf den neuesten Stand.
+    schritte: nummerierte Migrationsschritte (Index + 1 = Version), jeweils
+    ein SQL-Skript oder eine Funktion f(conn). Nur fehlende Schritte laufen,
+    jeder in einer eigenen Transaktion zusammen mit dem neuen user_version.
+    Ist das Schema aktuell, kostet der Aufruf nur ein PRAGMA.
+    Gibt die Anzahl ausgeführter Schritte zurück.
+    """
+    if schema_version(conn) >= len(schritte):
+        return 0
+
+    isolation = conn.isolation_level
+    conn.isolation_level = None          # Transaktionen selbst steuern
+    ausgefuehrt = 0
+    try:
+        for nr, schritt in enumerate(schritte, start=1):
+            conn.execute("BEGIN IMMEDIATE")
             try:
-                cur.execute(
-                    f"ALTER TABLE uebergabe_protokolle ADD COLUMN {col} {defn}"
-                )
+                # Nach dem Sperren erneut prüfen (anderer PC kann parallel migrieren)
+                if schema_version(conn) >= nr:
+                    conn.execute("ROLLBACK")
+                    continue
+                if callable(schritt):
+                    schritt(conn)
+                else:
+                    for anweisung in _anweisungen(schritt):
+                        conn.execute(anweisung)
+                conn.execute(f"PRAGMA user_version = {nr}")
+                conn.execute("COMMIT")
+                ausgefuehrt += 1
             except Exception:
-                pass  # Spalte existiert bereits
-
-        # gesendet-Flag für Fahrzeugschäden (E-Mail-Tracking)
-        try:
-            cur.execute("ALTER TABLE fahrzeug_schaeden ADD COLUMN gesendet INTEGER DEFAULT 0")
-        except Exception:
-            pass
-
-        conn.commit()
-        print("[OK] Datenbank bereit.")
-    except Exception as e:
-        conn.rollback()
-        raise e
+                conn.execute("ROLLBACK")
+                raise
+    finally:
+        conn.isolation_level = isolation
+    return ausgefuehrt
+
+
+def spalte_hinzufuegen(conn: sqlite3.Connection, tabelle: str, spalte: str, definition: str) -> None:
+    """ALTER TABLE … ADD COLUMN, falls die Spalte noch nicht existiert."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    vorhanden = {r[1] for r in cur.execute(f"PRAGMA table_info({tabelle})").fetchall()}
+    if spalte not in vorhanden:
+        conn.execute(f"ALTER TABLE {tabelle} ADD COLUMN {spalte} {definition}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Migrationsschritte der Haupt-Datenbank (nesk3.db)
+#  Neue Schritte nur hinten anhängen – bestehende nie ändern.
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _v1_basisschema(conn: sqlite3.Connection) -> None:
+    """Schema- und Datenstand vor Einführung der Versionierung (idempotent)."""
+    for anweisung in _anweisungen(SQL_SCHEMA):
+        conn.execute(anweisung)
+
+    for name, beschreibung in _DEFAULT_ABTEILUNGEN:
+        conn.execute(
+            "INSERT OR IGNORE INTO abteilungen (name, beschreibung) VALUES (?, ?)",
+            (name, beschreibung)
+        )
+    for name, kuerzel in _DEFAULT_POSITIONEN:
+        conn.execute(
+            "INSERT OR IGNORE INTO positionen (name, kuerzel) VALUES (?, ?)",
+            (name, kuerzel)
+        )
+    conn.execute(
+        "INSERT OR IGNORE INTO settings (schluessel, wert) VALUES (?, ?)",
+        ('dienstplan_ordner', _default_ordner)
+    )
+
+    # Neue Spalten für uebergabe_protokolle nachrüsten (SQLite ALTER TABLE)
+    for col, defn in [
+        ("handys_anzahl", "INTEGER DEFAULT 0"),
+        ("handys_notiz",  "TEXT DEFAULT ''"),
+        ("archiviert",    "INTEGER DEFAULT 0"),
+    ]:
+        spalte_hinzufuegen(conn, "uebergabe_protokolle", col, defn)
+
+    # gesendet-Flag für Fahrzeugschäden (E-Mail-Tracking)
+    spalte_hinzufuegen(conn, "fahrzeug_schaeden", "gesendet", "INTEGER DEFAULT 0")
+
+    # Herkunft importierter Schichten (Bulk-Import der Tagesdienstpläne)
+    for col, defn in [
+        ("vollname",     "TEXT DEFAULT ''"),
+        ("dienst",       "TEXT DEFAULT ''"),
+        ("ist_krank",    "INTEGER DEFAULT 0"),
+        ("excel_row",    "INTEGER"),
+        ("quelle_datei", "TEXT DEFAULT ''"),
+    ]:
+        spalte_hinzufuegen(conn, "dienstplan", col, defn)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_dienstplan_import "
+        "ON dienstplan(datum, excel_row, vollname)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dienstplan_mitarbeiter "
+        "ON dienstplan(mitarbeiter_id, datum)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dienstplan_quelle "
+        "ON dienstplan(quelle_datei)"
+    )
+
+
+# v2: aktueller Fahrzeugstatus als Tabelle (per Trigger gepflegt) + Indizes
+#     für Status-Historie, Schäden und Termine je Fahrzeug und Datum
+_V2_FAHRZEUG_STATUS_AKTUELL = """
+CREATE TABLE IF NOT EXISTS fahrzeug_status_aktuell (
+    fahrzeug_id     INTEGER PRIMARY KEY REFERENCES fahrzeuge(id) ON DELETE CASCADE,
+    status_id       INTEGER NOT NULL,
+    status          TEXT NOT NULL,
+    von             TEXT,
+    bis             TEXT,
+    grund           TEXT,
+    erstellt_am     TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_fahrzeug_status_neueste
+    ON fahrzeug_status(fahrzeug_id, erstellt_am, id);
+CREATE INDEX IF NOT EXISTS idx_fahrzeug_status_von
+    ON fahrzeug_status(fahrzeug_id, von);
+CREATE INDEX IF NOT EXISTS idx_fahrzeug_schaeden_fz
+    ON fahrzeug_schaeden(fahrzeug_id, datum);
+CREATE INDEX IF NOT EXISTS idx_fahrzeug_schaeden_datum
+    ON fahrzeug_schaeden(datum);
+CREATE INDEX IF NOT EXISTS idx_fahrzeug_termine_fz
+    ON fahrzeug_termine(fahrzeug_id, datum);
+
+CREATE TRIGGER IF NOT EXISTS fahrzeug_status_aktuell_ai AFTER INSERT ON fahrzeug_status BEGIN
+    INSERT OR REPLACE INTO fahrzeug_status_aktuell
+        (fahrzeug_id, status_id, status, von, bis, grund, erstellt_am)
+    SELECT fahrzeug_id, id, status, von, bis, grund, erstellt_am
+    FROM fahrzeug_status WHERE fahrzeug_id = new.fahrzeug_id
+    ORDER BY erstellt_am DESC, id DESC LIMIT 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fahrzeug_status_aktuell_au AFTER UPDATE ON fahrzeug_status BEGIN
+    DELETE FROM fahrzeug_status_aktuell
+    WHERE fahrzeug_id IN (old.fahrzeug_id, new.fahrzeug_id);
+    INSERT OR REPLACE INTO fahrzeug_status_aktuell
+        (fahrzeug_id, status_id, status, von, bis, grund, erstellt_am)
+    SELECT fahrzeug_id, id, status, von, bis, grund, erstellt_am
+    FROM fahrzeug_status WHERE fahrzeug_id = old.fahrzeug_id
+    ORDER BY erstellt_am DESC, id DESC LIMIT 1;
+    INSERT OR REPLACE INTO fahrzeug_status_aktuell
+        (fahrzeug_id, status_id, status, von, bis, grund, erstellt_am)
+    SELECT fahrzeug_id, id, status, von, bis, grund, erstellt_am
+    FROM fahrzeug_status WHERE fahrzeug_id = new.fahrzeug_id
+    ORDER BY erstellt_am DESC, id DESC LIMIT 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fahrzeug_status_aktuell_ad AFTER DELETE ON fahrzeug_status BEGIN
+    DELETE FROM fahrzeug_status_aktuell WHERE fahrzeug_id = old.fahrzeug_id;
+    INSERT OR REPLACE INTO fahrzeug_status_aktuell
+        (fahrzeug_id, status_id, status, von, bis, grund, erstellt_am)
+    SELECT fahrzeug_id, id, status, von, bis, grund, erstellt_am
+    FROM fahrzeug_status WHERE fahrzeug_id = old.fahrzeug_id
+    ORDER BY erstellt_am DESC, id DESC LIMIT 1;
+END;
+
+INSERT OR REPLACE INTO fahrzeug_status_aktuell
+    (fahrzeug_id, status_id, status, von, bis, grund, erstellt_am)
+SELECT fahrzeug_id, id, status, von, bis, grund, erstellt_am
+FROM (
+    SELECT *, ROW_NUMBER() OVER (
+        PARTITION BY fahrzeug_id ORDER BY erstellt_am DESC, id DESC
+    ) AS nr
+    FROM fahrzeug_status
+)
+WHERE nr = 1;
+"""
+
+
+# v3: importierte Schichten je Quelldatei eindeutig (statt je Datum) –
+#     zwei Dateien desselben Tages überschrieben sich sonst gegenseitig, und
+#     das Entfernen der einen löschte die Schichten der anderen. Doppelte
+#     Zeilen je Datei bereinigen, Importstand zurücksetzen → der nächste
+#     Import liest alle Dateien neu ein.
+_V3_DIENSTPLAN_JE_DATEI = """
+DROP INDEX IF EXISTS idx_dienstplan_import;
+
+DELETE FROM dienstplan
+WHERE quelle_datei != '' AND excel_row IS NOT NULL
+  AND id NOT IN (
+      SELECT MAX(id) FROM dienstplan
+      WHERE quelle_datei != '' AND excel_row IS NOT NULL
+      GROUP BY quelle_datei, excel_row
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dienstplan_quelle_zeile
+    ON dienstplan(quelle_datei, excel_row);
+DROP INDEX IF EXISTS idx_dienstplan_quelle;
+
+UPDATE dienstplan_import_dateien SET mtime_ns = 0, sha1 = '';
+"""
+
+
+MIGRATIONEN = [
+    _v1_basisschema,
+    _V2_FAHRZEUG_STATUS_AKTUELL,
+    _V3_DIENSTPLAN_JE_DATEI,
+]
+
+
+def run_migrations():
+    """Bringt die Haupt-Datenbank per Migrations-Engine auf den aktuellen Stand."""
+    conn = get_connection()
+    try:
+        n = migriere(conn, MIGRATIONEN)
+        if n:
+            print(f"[OK] Datenbank bereit ({n} Migration(en) ausgeführt, Version {len(MIGRATIONEN)}).")
+        else:
+            print("[OK] Datenbank bereit.")
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -0,0 +1,162 @@
+"""
+Register aller SQLite-Datenbanken von Nesk3
+Kennt jede Datenbankdatei (nesk3, archiv, stellungnahmen, verspaetungen,
+einsaetze, dienstplan_cache, suchindex, …), bringt ihr Schema einmal pro
+Prozess per Migrations-Engine (PRAGMA user_version) auf den aktuellen Stand
+und gibt warme Verbindungen aus dem Thread-Pool von database.connection aus.
+Mit anhaengen() lassen sich weitere Datenbanken per ATTACH in dieselbe
+Verbindung einbinden (datenbankübergreifende Abfragen in einer Transaktion).
+
+Verwendung:
+    registriere('verspaetungen', pfad, [_CREATE_SQL, _V2_SQL])
+    with verbindung('verspaetungen', commit=True) as conn:
+        conn.execute("INSERT ...")
+"""
+import importlib
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_PATH
+from database.connection import get_connection, gepoolte_verbindung, _row_factory
+from database.messung import MessVerbindung
+from database.migrations import migriere
+
+
+class _Datenbank:
+    """Eintrag im Register: Pfad, Migrationen und Verbindungs-Einstellungen."""
+
+    def __init__(self, name: str, pfad: str, migrationen: list | None = None,
+                 row_factory=None, timeout: float = 5, foreign_keys: bool = False):
+        self.name         = name
+        self.pfad         = pfad
+        self.migrationen  = migrationen or []
+        self.row_factory  = row_factory
+        self.timeout      = timeout
+        self.foreign_keys = foreign_keys
+
+    def oeffnen(self, pfad: str | None = None) -> sqlite3.Connection:
+        """Neue Verbindung mit WAL-Modus und busy_timeout."""
+        pfad = pfad or self.pfad
+        if pfad == DB_PATH:
+            return get_connection()
+        conn = sqlite3.connect(pfad, timeout=self.timeout, factory=MessVerbindung)
+        conn.row_factory = self.row_factory
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous  = NORMAL")
+        conn.execute("PRAGMA busy_timeout  = 5000")
+        if self.foreign_keys:
+            conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+
+_datenbanken: dict[str, _Datenbank] = {}
+_schema_ok:   set[str] = set()        # Pfade, deren Schema in diesem Prozess geprüft ist
+_lock = threading.Lock()
+
+# Datenbanken, deren Schema im besitzenden Modul registriert wird
+# (wird bei Bedarf importiert, z. B. für anhaengen() aus einem anderen Modul)
+_BESITZER = {
+    'archiv':           'functions.archiv_functions',
+    'dienstplan_cache': 'functions.dienstplan_cache',
+    'suchindex':        'functions.suchindex',
+    'stellungnahmen':   'functions.stellungnahmen_db',
+    'verspaetungen':    'functions.verspaetung_db',
+    'einsaetze':        'gui.dienstliches',
+}
+
+
+def registriere(name: str, pfad: str, migrationen: list | None = None, *,
+                row_factory=None, timeout: float = 5,
+                foreign_keys: bool = False) -> None:
+    """
+    Meldet eine Datenbank beim Register an (bzw. aktualisiert den Eintrag).
+    migrationen: nummerierte Schritte für database.migrations.migriere()
+    (SQL-Skript oder Funktion f(conn)); nur hinten anhängen.
+    """
+    with _lock:
+        _datenbanken[name] = _Datenbank(
+            name, pfad, migrationen, row_factory, timeout, foreign_keys
+        )
+
+
+def _eintrag(name: str) -> _Datenbank:
+    db = _datenbanken.get(name)
+    if db is None and name in _BESITZER:
+        importlib.import_module(_BESITZER[name])
+        db = _datenbanken.get(name)
+    if db is None:
+        raise KeyError(f"Unbekannte Datenbank: {name}")
+    return db
+
+
+def pfad(name: str) -> str:
+    """Dateipfad der registrierten Datenbank."""
+    return _eintrag(name).pfad
+
+
+def namen() -> list[str]:
+    """Namen aller bekannten Datenbanken."""
+    return sorted(set(_datenbanken) | set(_BESITZER))
+
+
+def _schema_sicherstellen(db: _Datenbank, pfad: str) -> None:
+    """Legt den Ordner an und migriert die Datenbank (einmal pro Prozess)."""
+    if pfad in _schema_ok:
+        return
+    with _lock:
+        if pfad in _schema_ok:
+            return
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        if db.migrationen:
+            conn = db.oeffnen(pfad)
+            try:
+                migriere(conn, db.migrationen)
+            finally:
+                conn.close()
+        _schema_ok.add(pfad)
+
+
+@contextmanager
+def verbindung(name: str, commit: bool = False, pfad: str | None = None):
+    """
+    Warme Verbindung zur Datenbank `name` (eine pro Thread und Datei).
+    Bei commit=True wird am Ende committet, bei Fehlern zurückgerollt.
+    pfad: abweichende Datei mit demselben Schema (z. B. anderes Archiv).
+    """
+    db = _eintrag(name)
+    pfad = pfad or db.pfad
+    _schema_sicherstellen(db, pfad)
+    with gepoolte_verbindung(pfad, lambda: db.oeffnen(pfad), commit) as conn:
+        yield conn
+
+
+def anhaengen(conn: sqlite3.Connection, name: str, alias: str | None = None,
+              pfad: str | None = None) -> str:
+    """
+    Hängt die Datenbank `name` per ATTACH an `conn` an (falls noch nicht
+    geschehen) und gibt den Alias zurück, unter dem ihre Tabellen
+    erreichbar sind (z. B. archiv.uebergabe_protokolle).
+    Muss außerhalb einer offenen Transaktion aufgerufen werden.
+    """
+    db = _eintrag(name)
+    pfad = pfad or db.pfad
+    alias = alias or name
+    _schema_sicherstellen(db, pfad)
+    cur = conn.cursor()
+    cur.row_factory = None
+    angehaengt = {r[1]: r[2] for r in cur.execute("PRAGMA database_list").fetchall()}
+    if alias in angehaengt:
+        if os.path.normcase(os.path.abspath(angehaengt[alias] or '')) == \
+                os.path.normcase(os.path.abspath(pfad)):
+            return alias
+        conn.execute(f"DETACH DATABASE {alias}")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (pfad,))
+    return alias
+
+
+# Haupt-Datenbank (Migrationen über database.migrations.run_migrations beim Start)
+registriere('nesk3', DB_PATH, row_factory=_row_factory, timeout=10, foreign_keys=True)
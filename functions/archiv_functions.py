@@ -4,19 +4,17 @@ Protokolle können in eine eigene archiv.db exportiert und
 von dort wieder in die Haupt-Datenbank (nesk3.db) importiert werden.
 """
 from __future__ import annotations
-import sqlite3
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ARCHIV_DB_PATH
-from database.connection import db_cursor
+from database.connection import _row_factory
+from database.registry import registriere, verbindung, anhaengen
 
 
 # ── Archiv-DB Schema (ohne FK-Constraints, damit archivierte Dtaen unabhängig) ──
 _ARCHIV_SCHEMA = """
-PRAGMA journal_mode = WAL;
-
 CREATE TABLE IF NOT EXISTS uebergabe_protokolle (
     id                  INTEGER PRIMARY KEY AUTOINCREMENT,
     orig_id             INTEGER,
@@ -56,24 +54,13 @@ CREATE TABLE IF NOT EXISTS uebergabe_handy_eintraege (
 """
 
 
-def _get_archiv_conn(archiv_path: str | None = None) -> sqlite3.Connection:
-    """Öffnet eine Verbindung zur Archiv-Datenbank."""
-    path = archiv_path or ARCHIV_DB_PATH
-    conn = sqlite3.connect(path, timeout=10)
-    conn.row_factory = lambda c, r: dict(zip([x[0] for x in c.description], r))
-    conn.execute("PRAGMA journal_mode = WAL")
-    conn.execute("PRAGMA synchronous = NORMAL")
-    return conn
+registriere("archiv", ARCHIV_DB_PATH, [_ARCHIV_SCHEMA], row_factory=_row_factory, timeout=10)
 
 
 def init_archiv_db(archiv_path: str | None = None) -> None:
-    """Erstellt die Archiv-DB-Tabellen falls nicht vorhanden."""
-    conn = _get_archiv_conn(archiv_path)
-    try:
-        conn.executescript(_ARCHIV_SCHEMA)
-        conn.commit()
-    finally:
-        conn.close()
+    """Erstellt die Archiv-DB-Tabellen falls nicht vorhanden (einmal je Prozess)."""
+    with verbindung("archiv", pfad=archiv_path):
+        pass
 
 
 def exportiere_in_archiv(
@@ -83,106 +70,90 @@ def exportiere_in_archiv(
     """
     Kopiert Protokolle aus der Haupt-DB in die Archiv-DB und löscht
     sie anschließend aus der Haupt-DB.
+    Beide Datenbanken laufen über eine Verbindung (Archiv per ATTACH),
+    Kopieren und Löschen geschehen in einer Transaktion.
 
     Gibt die Anzahl erfolgreich exportierter Protokolle zurück.
     """
     if not protokoll_ids:
         return 0
 
-    init_archiv_db(archiv_path)
-    arch_conn = _get_archiv_conn(archiv_path)
     count = 0
+    placeholders = ",".join("?" * len(protokoll_ids))
 
-    try:
-        arch_cur = arch_conn.cursor()
-        with db_cursor() as main_cur:
-            placeholders = ",".join("?" * len(protokoll_ids))
-
-            # Protokolle laden
-            main_cur.execute(
-                f"""
-                SELECT id, datum, schicht_typ, beginn_zeit, ende_zeit,
-                       patienten_anzahl, personal, ereignisse, massnahmen,
-                       uebergabe_notiz, ersteller, abzeichner, status,
-                       COALESCE(handys_anzahl,0) AS handys_anzahl,
-                       COALESCE(handys_notiz,'') AS handys_notiz,
-                       erstellt_am, geaendert_am
-                FROM uebergabe_protokolle
-                WHERE id IN ({placeholders})
+    with verbindung("nesk3", commit=True) as conn:
+        anhaengen(conn, "archiv", pfad=archiv_path)
+        cur = conn.cursor()
+
+        # Protokolle laden
+        cur.execute(
+            f"""
+            SELECT id, datum, schicht_typ, beginn_zeit, ende_zeit,
+                   patienten_anzahl, personal, ereignisse, massnahmen,
+                   uebergabe_notiz, ersteller, abzeichner, status,
+                   COALESCE(handys_anzahl,0) AS handys_anzahl,
+                   COALESCE(handys_notiz,'') AS handys_notiz,
+                   erstellt_am, geaendert_am
+            FROM main.uebergabe_protokolle
+            WHERE id IN ({placeholders})
+            """,
+            list(protokoll_ids),
+        )
+        protokolle = cur.fetchall() or []
+
+        for p in protokolle:
+            orig_id = p["id"]
+
+            # In Archiv schreiben
+            cur.execute(
+                """
+                INSERT INTO archiv.uebergabe_protokolle
+                    (orig_id, datum, schicht_typ, beginn_zeit, ende_zeit,
+                     patienten_anzahl, personal, ereignisse, massnahmen,
+                     uebergabe_notiz, ersteller, abzeichner, status,
+                     handys_anzahl, handys_notiz, erstellt_am, geaendert_am)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    orig_id,
+                    p["datum"], p["schicht_typ"], p["beginn_zeit"], p["ende_zeit"],
+                    p["patienten_anzahl"], p["personal"], p["ereignisse"],
+                    p["massnahmen"], p["uebergabe_notiz"], p["ersteller"],
+                    p["abzeichner"], p["status"],
+                    p["handys_anzahl"], p["handys_notiz"],
+                    p["erstellt_am"], p["geaendert_am"],
+                ),
+            )
+            arch_id = cur.lastrowid
+
+            # Fahrzeug-Notizen und Handy-Einträge direkt übernehmen
+            cur.execute(
+                """
+                INSERT INTO archiv.uebergabe_fahrzeug_notizen
+                    (protokoll_id, fahrzeug_id, fahrzeug_kz, notiz)
+                SELECT ?, ufn.fahrzeug_id, COALESCE(f.kennzeichen,''), ufn.notiz
+                FROM main.uebergabe_fahrzeug_notizen ufn
+                LEFT JOIN main.fahrzeuge f ON f.id = ufn.fahrzeug_id
+                WHERE ufn.protokoll_id = ?
                 """,
-                list(protokoll_ids),
+                (arch_id, orig_id),
             )
-            protokolle = main_cur.fetchall() or []
-
-            for p in protokolle:
-                orig_id = p["id"]
-
-                # Fahrzeug-Notizen laden
-                main_cur.execute(
-                    """
-                    SELECT ufn.fahrzeug_id, ufn.notiz,
-                           COALESCE(f.kennzeichen,'') AS fahrzeug_kz
-                    FROM uebergabe_fahrzeug_notizen ufn
-                    LEFT JOIN fahrzeuge f ON f.id = ufn.fahrzeug_id
-                    WHERE ufn.protokoll_id = ?
-                    """,
-                    (orig_id,),
-                )
-                fz_notizen = main_cur.fetchall() or []
-
-                # Handy-Einträge laden
-                main_cur.execute(
-                    "SELECT geraet_nr, notiz FROM uebergabe_handy_eintraege WHERE protokoll_id = ?",
-                    (orig_id,),
-                )
-                handys = main_cur.fetchall() or []
-
-                # In Archiv schreiben
-                arch_cur.execute(
-                    """
-                    INSERT INTO uebergabe_protokolle
-                        (orig_id, datum, schicht_typ, beginn_zeit, ende_zeit,
-                         patienten_anzahl, personal, ereignisse, massnahmen,
-                         uebergabe_notiz, ersteller, abzeichner, status,
-                         handys_anzahl, handys_notiz, erstellt_am, geaendert_am)
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                    """,
-                    (
-                        orig_id,
-                        p["datum"], p["schicht_typ"], p["beginn_zeit"], p["ende_zeit"],
-                        p["patienten_anzahl"], p["personal"], p["ereignisse"],
-                        p["massnahmen"], p["uebergabe_notiz"], p["ersteller"],
-                        p["abzeichner"], p["status"],
-                        p["handys_anzahl"], p["handys_notiz"],
-                        p["erstellt_am"], p["geaendert_am"],
-                    ),
-                )
-                arch_id = arch_cur.lastrowid
-
-                for fn in fz_notizen:
-                    arch_cur.execute(
-                        "INSERT INTO uebergabe_fahrzeug_notizen (protokoll_id, fahrzeug_id, fahrzeug_kz, notiz) VALUES (?,?,?,?)",
-                        (arch_id, fn["fahrzeug_id"], fn["fahrzeug_kz"], fn["notiz"]),
-                    )
-                for h in handys:
-                    arch_cur.execute(
-                        "INSERT INTO uebergabe_handy_eintraege (protokoll_id, geraet_nr, notiz) VALUES (?,?,?)",
-                        (arch_id, h["geraet_nr"], h["notiz"]),
-                    )
-                count += 1
-
-        # Commit Archiv
-        arch_conn.commit()
-
-        # Aus Haupt-DB löschen (eigene Transaktion)
-        with db_cursor(commit=True) as del_cur:
-            del_cur.execute(
-                f"DELETE FROM uebergabe_protokolle WHERE id IN ({placeholders})",
-                list(protokoll_ids),
+            cur.execute(
+                """
+                INSERT INTO archiv.uebergabe_handy_eintraege (protokoll_id, geraet_nr, notiz)
+                SELECT ?, geraet_nr, notiz
+                FROM main.uebergabe_handy_eintraege
+                WHERE protokoll_id = ?
+                """,
+                (arch_id, orig_id),
             )
+            count += 1
 
-    finally:
-        arch_conn.close()
+        # Aus Haupt-DB löschen
+        cur.execute(
+            f"DELETE FROM main.uebergabe_protokolle WHERE id IN ({placeholders})",
+            list(protokoll_ids),
+        )
 
     return count
 
@@ -198,9 +169,7 @@ def lade_archiv_protokolle(
     if not os.path.exists(archiv_path or ARCHIV_DB_PATH):
         return []
 
-    init_archiv_db(archiv_path)
-    conn = _get_archiv_conn(archiv_path)
-    try:
+    with verbindung("archiv", pfad=archiv_path) as conn:
         cur = conn.cursor()
         if schicht_typ:
             cur.execute(
@@ -223,8 +192,6 @@ def lade_archiv_protokolle(
                 """
             )
         return cur.fetchall() or []
-    finally:
-        conn.close()
 
 
 def lade_archiv_protokoll_detail(
@@ -235,8 +202,7 @@ def lade_archiv_protokoll_detail(
     Gibt ein vollständiges Protokoll mit Untereinträgen aus dem Archiv zurück.
     Returns: { "protokoll": {...}, "fahrzeuge": [...], "handys": [...] }
     """
-    conn = _get_archiv_conn(archiv_path)
-    try:
+    with verbindung("archiv", pfad=archiv_path) as conn:
         cur = conn.cursor()
         cur.execute(
             "SELECT * FROM uebergabe_protokolle WHERE id = ?", (archiv_id,)
@@ -256,8 +222,6 @@ def lade_archiv_protokoll_detail(
         handys = cur.fetchall() or []
 
         return {"protokoll": proto, "fahrzeuge": fz, "handys": handys}
-    finally:
-        conn.close()
 
 
 def importiere_aus_archiv(
@@ -266,96 +230,84 @@ def importiere_aus_archiv(
 ) -> int:
     """
     Kopiert Protokolle aus dem Archiv zurück in die Haupt-DB und löscht
-    sie danach aus dem Archiv.
+    sie danach aus dem Archiv (eine Verbindung, Archiv per ATTACH,
+    eine Transaktion).
 
     Gibt die Anzahl erfolgreich importierter Protokolle zurück.
     """
     if not archiv_ids:
         return 0
 
-    arch_conn = _get_archiv_conn(archiv_path)
     count = 0
+    placeholders = ",".join("?" * len(archiv_ids))
 
-    try:
-        arch_cur = arch_conn.cursor()
-        placeholders = ",".join("?" * len(archiv_ids))
-        arch_cur.execute(
-            f"SELECT * FROM uebergabe_protokolle WHERE id IN ({placeholders})",
+    with verbindung("nesk3", commit=True) as conn:
+        anhaengen(conn, "archiv", pfad=archiv_path)
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT * FROM archiv.uebergabe_protokolle WHERE id IN ({placeholders})",
             list(archiv_ids),
         )
-        protokolle = arch_cur.fetchall() or []
+        protokolle = cur.fetchall() or []
 
         for p in protokolle:
             arch_id = p["id"]
 
-            arch_cur.execute(
-                "SELECT fahrzeug_id, notiz FROM uebergabe_fahrzeug_notizen WHERE protokoll_id = ?",
-                (arch_id,),
+            cur.execute(
+                """
+                INSERT INTO main.uebergabe_protokolle
+                    (datum, schicht_typ, beginn_zeit, ende_zeit,
+                     patienten_anzahl, personal, ereignisse, massnahmen,
+                     uebergabe_notiz, ersteller, abzeichner, status,
+                     handys_anzahl, handys_notiz, erstellt_am, archiviert)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,0)
+                """,
+                (
+                    p["datum"], p["schicht_typ"], p["beginn_zeit"], p["ende_zeit"],
+                    p["patienten_anzahl"], p["personal"], p["ereignisse"],
+                    p["massnahmen"], p["uebergabe_notiz"], p["ersteller"],
+                    p["abzeichner"], p["status"],
+                    p.get("handys_anzahl", 0), p.get("handys_notiz", ""),
+                    p.get("erstellt_am", ""),
+                ),
             )
-            fz_notizen = arch_cur.fetchall() or []
+            new_id = cur.lastrowid
 
-            arch_cur.execute(
-                "SELECT geraet_nr, notiz FROM uebergabe_handy_eintraege WHERE protokoll_id = ? ORDER BY id",
-                (arch_id,),
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO main.uebergabe_fahrzeug_notizen
+                    (protokoll_id, fahrzeug_id, notiz)
+                SELECT ?, fahrzeug_id, notiz
+                FROM archiv.uebergabe_fahrzeug_notizen
+                WHERE protokoll_id = ? AND COALESCE(notiz,'') != ''
+                """,
+                (new_id, arch_id),
+            )
+            cur.execute(
+                """
+                INSERT INTO main.uebergabe_handy_eintraege (protokoll_id, geraet_nr, notiz)
+                SELECT ?, geraet_nr, notiz
+                FROM archiv.uebergabe_handy_eintraege
+                WHERE protokoll_id = ?
+                ORDER BY id
+                """,
+                (new_id, arch_id),
             )
-            handys = arch_cur.fetchall() or []
-
-            with db_cursor(commit=True) as main_cur:
-                main_cur.execute(
-                    """
-                    INSERT INTO uebergabe_protokolle
-                        (datum, schicht_typ, beginn_zeit, ende_zeit,
-                         patienten_anzahl, personal, ereignisse, massnahmen,
-                         uebergabe_notiz, ersteller, abzeichner, status,
-                         handys_anzahl, handys_notiz, erstellt_am, archiviert)
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,0)
-                    """,
-                    (
-                        p["datum"], p["schicht_typ"], p["beginn_zeit"], p["ende_zeit"],
-                        p["patienten_anzahl"], p["personal"], p["ereignisse"],
-                        p["massnahmen"], p["uebergabe_notiz"], p["ersteller"],
-                        p["abzeichner"], p["status"],
-                        p.get("handys_anzahl", 0), p.get("handys_notiz", ""),
-                        p.get("erstellt_am", ""),
-                    ),
-                )
-                new_id = main_cur.lastrowid
-
-                for fn in fz_notizen:
-                    if fn.get("notiz"):
-                        main_cur.execute(
-                            """
-                            INSERT OR IGNORE INTO uebergabe_fahrzeug_notizen
-                                (protokoll_id, fahrzeug_id, notiz)
-                            VALUES (?, ?, ?)
-                            """,
-                            (new_id, fn["fahrzeug_id"], fn["notiz"]),
-                        )
-                for h in handys:
-                    main_cur.execute(
-                        "INSERT INTO uebergabe_handy_eintraege (protokoll_id, geraet_nr, notiz) VALUES (?,?,?)",
-                        (new_id, h["geraet_nr"], h["notiz"]),
-                    )
-
             count += 1
 
         # Aus Archiv löschen
-        arch_cur.execute(
-            f"DELETE FROM uebergabe_protokolle WHERE id IN ({placeholders})",
+        cur.execute(
+            f"DELETE FROM archiv.uebergabe_protokolle WHERE id IN ({placeholders})",
             list(archiv_ids),
         )
         # Zugehörige Untereinträge löschen (kein ON DELETE CASCADE in archiv)
-        arch_cur.execute(
-            f"DELETE FROM uebergabe_fahrzeug_notizen WHERE protokoll_id IN ({placeholders})",
+        cur.execute(
+            f"DELETE FROM archiv.uebergabe_fahrzeug_notizen WHERE protokoll_id IN ({placeholders})",
             list(archiv_ids),
         )
-        arch_cur.execute(
-            f"DELETE FROM uebergabe_handy_eintraege WHERE protokoll_id IN ({placeholders})",
+        cur.execute(
+            f"DELETE FROM archiv.uebergabe_handy_eintraege WHERE protokoll_id IN ({placeholders})",
             list(archiv_ids),
         )
-        arch_conn.commit()
-
-    finally:
-        arch_conn.close()
 
     return count
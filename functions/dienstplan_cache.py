@@ -0,0 +1,297 @@
+"""
+Dienstplan-Parse-Cache
+Zwischenspeicher für DienstplanParser-Ergebnisse: In-Memory-LRU plus
+persistenter SQLite-Speicher unter "database SQL/dienstplan_cache.db".
+
+Schlüssel = Datei-Identität (Pfad, mtime, Größe, optional Inhalts-Hash)
+          + Parser-Optionen (alle_anzeigen, round_dispo)
+          + Version der Ausschlussliste (nur für Ansichten mit Ausschlüssen).
+Ändert sich die Excel-Datei, passt der Schlüssel nicht mehr und die Datei
+wird neu eingelesen. Wird die Ausschlussliste in den Einstellungen geändert,
+werden die betroffenen Einträge verworfen (siehe ausschluss_geaendert()).
+
+Verwendung:
+    from functions.dienstplan_cache import parse_alle_ansichten
+    ansichten = parse_alle_ansichten(pfad)
+"""
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DIENSTPLAN_CACHE_DB_PATH
+from database.registry import registriere, verbindung
+
+_MAX_MEMORY = 32     # Einträge im In-Memory-LRU
+_MAX_DISK   = 500    # Einträge im persistenten Speicher
+
+_MODUS_EINZEL = 'einzel'   # parse()
+_MODUS_ALLE   = 'alle'     # parse_alle_ansichten()
+
+# Bei Änderungen am Ergebnis-Format erhöhen (alte Einträge passen dann nicht mehr)
+_FORMAT_VERSION = 2
+
+_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    schluessel          TEXT PRIMARY KEY,
+    pfad                TEXT NOT NULL,
+    mtime_ns            INTEGER NOT NULL,
+    groesse             INTEGER NOT NULL,
+    ausschluss_version  TEXT DEFAULT '',
+    ergebnis            TEXT NOT NULL,
+    zugriff_am          TEXT DEFAULT (datetime('now','localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_parse_cache_pfad ON parse_cache(pfad);
+"""
+
+registriere('dienstplan_cache', DIENSTPLAN_CACHE_DB_PATH, [_CREATE_SQL])
+
+# schluessel → (pfad, mtime_ns, groesse, ausschluss_version, ergebnis_json)
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+_lock = threading.Lock()
+_statistik = {'memory_treffer': 0, 'disk_treffer': 0, 'fehlgriffe': 0}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Öffentliche API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def parse(pfad: str, alle_anzeigen: bool = False, round_dispo: bool = True,
+          mit_hash: bool = False, fortschritt=None, abbrechen=None) -> dict:
+    """
+    Wie DienstplanParser(pfad, alle_anzeigen, round_dispo).parse(),
+    aber aus dem Cache, solange sich Datei und Optionen nicht geändert haben.
+    fortschritt/abbrechen werden bei einem Cache-Fehlgriff an den Parser durchgereicht.
+    """
+    from functions.dienstplan_parser import DienstplanParser
+    return _cached(
+        pfad, _MODUS_EINZEL, alle_anzeigen, round_dispo, mit_hash,
+        mit_ausschluss=not alle_anzeigen,
+        erzeugen=lambda: DienstplanParser(
+            pfad, alle_anzeigen, round_dispo,
+            fortschritt=fortschritt, abbrechen=abbrechen,
+        ).parse(),
+    )
+
+
+def parse_alle_ansichten(pfad: str, mit_hash: bool = False,
+                         fortschritt=None, abbrechen=None) -> dict:
+    """
+    Wie DienstplanParser(pfad).parse_alle_ansichten(), aber aus dem Cache.
+    Enthält die Export-Ansicht und hängt daher von der Ausschlussliste ab.
+    """
+    from functions.dienstplan_parser import DienstplanParser
+    return _cached(
+        pfad, _MODUS_ALLE, None, None, mit_hash,
+        mit_ausschluss=True,
+        erzeugen=lambda: DienstplanParser(
+            pfad, fortschritt=fortschritt, abbrechen=abbrechen,
+        ).parse_alle_ansichten(),
+    )
+
+
+def uebernehmen(pfad: str, ansichten: dict) -> None:
+    """
+    Legt ein lokal fortgeschriebenes Ergebnis von parse_alle_ansichten()
+    (siehe DienstplanParser.aktualisiere_zeile) für den aktuellen Dateistand
+    ab – die nächste Abfrage nach dem eigenen Speichern liest die Datei nicht neu.
+    Die Anzeige-Ansicht wird zusätzlich als parse(alle_anzeigen=True) hinterlegt.
+    """
+    if not ansichten.get('success'):
+        return
+    for modus, alle_anzeigen, round_dispo, mit_ausschluss, ergebnis in (
+        (_MODUS_ALLE,   None, None, True,  ansichten),
+        (_MODUS_EINZEL, True, True, False, ansichten['display']),
+    ):
+        kopf = _schluessel(pfad, modus, alle_anzeigen, round_dispo, False, mit_ausschluss)
+        if kopf is None:
+            return
+        schluessel, norm, st, version = kopf
+        ergebnis_json = json.dumps(ergebnis, ensure_ascii=False)
+        _memory_speichern(schluessel, (norm, st.st_mtime_ns, st.st_size, version, ergebnis_json))
+        _disk_schreiben(schluessel, norm, st.st_mtime_ns, st.st_size, version, ergebnis_json)
+
+
+def invalidieren(pfad: Optional[str] = None) -> None:
+    """Verwirft alle Einträge für *pfad* bzw. den gesamten Cache (pfad=None)."""
+    with _lock:
+        if pfad is None:
+            _memory.clear()
+        else:
+            norm = _norm_pfad(pfad)
+            for k in [k for k, v in _memory.items() if v[0] == norm]:
+                del _memory[k]
+    try:
+        with _disk() as con:
+            if pfad is None:
+                con.execute("DELETE FROM parse_cache")
+            else:
+                con.execute("DELETE FROM parse_cache WHERE pfad = ?", (_norm_pfad(pfad),))
+    except Exception:
+        pass
+
+
+def ausschluss_geaendert() -> None:
+    """
+    Wird nach einer Änderung der Ausschlussliste aufgerufen.
+    Verwirft alle Einträge, die mit einer anderen Listen-Version erzeugt wurden.
+    """
+    version = _ausschluss_version()
+    with _lock:
+        for k in [k for k, v in _memory.items() if v[3] and v[3] != version]:
+            del _memory[k]
+    try:
+        with _disk() as con:
+            con.execute(
+                "DELETE FROM parse_cache WHERE ausschluss_version != ''"
+                " AND ausschluss_version != ?",
+                (version,),
+            )
+    except Exception:
+        pass
+
+
+def statistik() -> dict:
+    """Gibt Treffer-/Fehlgriff-Zähler und die aktuelle LRU-Größe zurück."""
+    with _lock:
+        return dict(_statistik, memory_eintraege=len(_memory))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Intern
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _norm_pfad(pfad: str) -> str:
+    return os.path.normcase(os.path.abspath(str(pfad)))
+
+
+def _datei_hash(pfad: str) -> str:
+    h = hashlib.sha1()
+    with open(pfad, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _ausschluss_version() -> str:
+    """Prüfsumme der aktuellen Ausschlussliste (Einstellungen + feste Namen)."""
+    try:
+        from functions.settings_functions import get_ausgeschlossene_namen
+        namen = sorted(set(get_ausgeschlossene_namen()))
+    except Exception:
+        namen = []
+    return hashlib.sha1(json.dumps(namen).encode('utf-8')).hexdigest()[:16]
+
+
+def _schluessel(pfad: str, modus: str, alle_anzeigen, round_dispo, mit_hash: bool,
+                mit_ausschluss: bool) -> Optional[tuple]:
+    """(schluessel, norm_pfad, stat, ausschluss_version) oder None, falls die Datei fehlt."""
+    try:
+        st = os.stat(pfad)
+    except OSError:
+        return None
+
+    norm     = _norm_pfad(pfad)
+    version  = _ausschluss_version() if mit_ausschluss else ''
+    inhalt   = _datei_hash(pfad) if mit_hash else ''
+    roh_key  = json.dumps(
+        [norm, st.st_mtime_ns, st.st_size, inhalt, modus, alle_anzeigen, round_dispo, version,
+         _FORMAT_VERSION]
+    )
+    return hashlib.sha1(roh_key.encode('utf-8')).hexdigest(), norm, st, version
+
+
+def _cached(pfad: str, modus: str, alle_anzeigen, round_dispo, mit_hash: bool,
+            mit_ausschluss: bool, erzeugen) -> dict:
+    """Gemeinsamer Lookup: Memory → Disk → Parser (nur Erfolge werden gespeichert)."""
+    kopf = _schluessel(pfad, modus, alle_anzeigen, round_dispo, mit_hash, mit_ausschluss)
+    if kopf is None:
+        return erzeugen()
+    schluessel, norm, st, version = kopf
+
+    with _lock:
+        eintrag = _memory.get(schluessel)
+        if eintrag is not None:
+            _memory.move_to_end(schluessel)
+            _statistik['memory_treffer'] += 1
+            return json.loads(eintrag[4])
+
+    ergebnis_json = _disk_lesen(schluessel)
+    if ergebnis_json is not None:
+        _memory_speichern(schluessel, (norm, st.st_mtime_ns, st.st_size, version, ergebnis_json))
+        with _lock:
+            _statistik['disk_treffer'] += 1
+        return json.loads(ergebnis_json)
+
+    with _lock:
+        _statistik['fehlgriffe'] += 1
+    ergebnis = erzeugen()
+    if ergebnis.get('success'):
+        ergebnis_json = json.dumps(ergebnis, ensure_ascii=False)
+        _memory_speichern(schluessel, (norm, st.st_mtime_ns, st.st_size, version, ergebnis_json))
+        _disk_schreiben(schluessel, norm, st.st_mtime_ns, st.st_size, version, ergebnis_json)
+    return ergebnis
+
+
+def _memory_speichern(schluessel: str, eintrag: tuple) -> None:
+    norm, mtime_ns, groesse = eintrag[0], eintrag[1], eintrag[2]
+    with _lock:
+        # Veraltete Stände derselben Datei entfernen
+        for k in [k for k, v in _memory.items()
+                  if v[0] == norm and (v[1], v[2]) != (mtime_ns, groesse)]:
+            del _memory[k]
+        _memory[schluessel] = eintrag
+        _memory.move_to_end(schluessel)
+        while len(_memory) > _MAX_MEMORY:
+            _memory.popitem(last=False)
+
+
+def _disk():
+    """Context-Manager für den persistenten Cache (Verbindung aus dem DB-Register)."""
+    return verbindung('dienstplan_cache', commit=True)
+
+
+def _disk_lesen(schluessel: str) -> Optional[str]:
+    try:
+        with _disk() as con:
+            row = con.execute(
+                "SELECT ergebnis FROM parse_cache WHERE schluessel = ?", (schluessel,)
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                "UPDATE parse_cache SET zugriff_am = datetime('now','localtime')"
+                " WHERE schluessel = ?",
+                (schluessel,),
+            )
+            return row[0]
+    except Exception:
+        return None
+
+
+def _disk_schreiben(schluessel: str, norm: str, mtime_ns: int, groesse: int,
+                    version: str, ergebnis_json: str) -> None:
+    try:
+        with _disk() as con:
+            con.execute(
+                "DELETE FROM parse_cache WHERE pfad = ? AND (mtime_ns != ? OR groesse != ?)",
+                (norm, mtime_ns, groesse),
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO parse_cache"
+                " (schluessel, pfad, mtime_ns, groesse, ausschluss_version, ergebnis)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (schluessel, norm, mtime_ns, groesse, version, ergebnis_json),
+            )
+            con.execute(
+                "DELETE FROM parse_cache WHERE schluessel IN ("
+                " SELECT schluessel FROM parse_cache"
+                " ORDER BY zugriff_am DESC LIMIT -1 OFFSET ?)",
+                (_MAX_DISK,),
+            )
+    except Exception:
+        pass
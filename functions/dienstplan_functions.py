@@ -1,25 +1,105 @@
 """
 Dienstplan-Funktionen (CRUD)
 Lese-, Schreib- und Löschoperationen für Dienstpläne/Schichten
+sowie der Bulk-Import aller Tagesdienstpläne in die Tabelle 'dienstplan'.
 """
-from typing import Optional
-from datetime import date
+import os
+import re
+import sys
+import hashlib
+from typing import Optional, Callable
+from datetime import date, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from database.connection import db_cursor
 from database.models import Dienstplan
 
 
+# Parser-Schichttyp → schicht_typ der Tabelle (CHECK regulaer|nacht|bereitschaft)
+_SCHICHT_TYP_MAP = {
+    'tagdienst_vormittag':  'regulaer',
+    'tagdienst_nachmittag': 'regulaer',
+    'nachtschicht_frueh':   'nacht',
+    'nachtschicht_spaet':   'nacht',
+    'tagdienst':            'regulaer',
+    'nachtdienst':          'nacht',
+}
+_BEREITSCHAFT_DIENSTE = frozenset({'R', 'B1', 'B2'})
+
+_IMPORT_BATCH = 5000   # Zeilen je Schreib-Transaktion
+
+
+def _row_to_schicht(row: dict) -> Dienstplan:
+    """Wandelt eine DB-Zeile in ein Dienstplan-Objekt um."""
+    def _zeit(s):
+        try:
+            h, m = (s or '').split(':')[:2]
+            return time(int(h), int(m))
+        except Exception:
+            return None
+
+    try:
+        datum = date.fromisoformat(row['datum'])
+    except Exception:
+        datum = None
+    typ = row.get('schicht_typ') or 'regulaer'
+    return Dienstplan(
+        id               = row['id'],
+        mitarbeiter_id   = row.get('mitarbeiter_id'),
+        mitarbeiter_name = row.get('mitarbeiter_name') or row.get('vollname') or '',
+        datum            = datum,
+        start_uhrzeit    = _zeit(row.get('start_uhrzeit')),
+        end_uhrzeit      = _zeit(row.get('end_uhrzeit')),
+        position         = row.get('position') or '',
+        schicht_typ      = 'regulär' if typ == 'regulaer' else typ,
+        notizen          = row.get('notizen') or '',
+        erstellt_am      = row.get('erstellt_am'),
+    )
+
+
+_SCHICHT_SELECT = """
+    SELECT d.*,
+           COALESCE(NULLIF(m.vorname || ' ' || m.nachname, ' '), d.vollname)
+               AS mitarbeiter_name
+    FROM dienstplan d
+    LEFT JOIN mitarbeiter m ON m.id = d.mitarbeiter_id
+"""
+
+
 def get_alle_schichten(von: Optional[date] = None, bis: Optional[date] = None) -> list[Dienstplan]:
     """Gibt alle Schichten zurück, optional gefiltert nach Datumsbereich."""
-    # TODO: Implementierung folgt
-    return []
+    sql    = _SCHICHT_SELECT + " WHERE 1=1"
+    params: list = []
+    if von:
+        sql += " AND d.datum >= ?"
+        params.append(von.isoformat())
+    if bis:
+        sql += " AND d.datum <= ?"
+        params.append(bis.isoformat())
+    sql += " ORDER BY d.datum, d.start_uhrzeit, d.excel_row"
+    with db_cursor() as cur:
+        cur.execute(sql, params)
+        return [_row_to_schicht(r) for r in cur.fetchall()]
 
 
 def get_schichten_fuer_mitarbeiter(mitarbeiter_id: int,
                                     von: Optional[date] = None,
                                     bis: Optional[date] = None) -> list[Dienstplan]:
     """Gibt alle Schichten eines Mitarbeiters zurück."""
-    # TODO: Implementierung folgt
-    return []
+    sql    = _SCHICHT_SELECT + " WHERE d.mitarbeiter_id = ?"
+    params: list = [mitarbeiter_id]
+    if von:
+        sql += " AND d.datum >= ?"
+        params.append(von.isoformat())
+    if bis:
+        sql += " AND d.datum <= ?"
+        params.append(bis.isoformat())
+    sql += " ORDER BY d.datum, d.start_uhrzeit"
+    with db_cursor() as cur:
+        cur.execute(sql, params)
+        return [_row_to_schicht(r) for r in cur.fetchall()]
 
 
 def schicht_erstellen(s: Dienstplan) -> Dienstplan:
@@ -49,3 +129,287 @@ def get_statistik() -> dict:
         "schichten_heute":         0,
         "schichten_diesen_monat":  0,
     }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  BULK-IMPORT – Tagesdienstpläne → Tabelle 'dienstplan'
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _datei_sha1(pfad: str) -> str:
+    h = hashlib.sha1()
+    with open(pfad, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _iso_datum(datum_str: Optional[str], dateiname: str) -> str:
+    """
+    Wandelt das Parser-Datum (DD.MM.YYYY, auch zweistelliges Jahr) in YYYY-MM-DD um.
+    Fallback: Datum aus dem Dateinamen (DD.MM.YYYY, YYYY_MM_DD oder YYYY-MM-DD).
+    Gibt '' zurück, wenn kein Datum erkennbar ist.
+    """
+    kandidaten = []
+    if datum_str:
+        kandidaten.append(datum_str)
+    kandidaten.append(dateiname)
+    for text in kandidaten:
+        m = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{2,4})', text)
+        if m:
+            t, mo, j = (int(x) for x in m.groups())
+            if j < 100:
+                j += 2000
+        else:
+            m = re.search(r'(\d{4})[-_](\d{2})[-_](\d{2})', text)
+            if not m:
+                continue
+            j, mo, t = (int(x) for x in m.groups())
+        try:
+            return date(j, mo, t).isoformat()
+        except ValueError:
+            continue
+    return ''
+
+
+def _schichten_aus_ergebnis(ergebnis: dict, datum: str) -> list[dict]:
+    """Normalisiert ein Parser-Ergebnis (Anzeige-Ansicht) zu Schicht-Zeilen."""
+    schichten = []
+    for liste in ('betreuer', 'dispo', 'kranke'):
+        for p in ergebnis.get(liste, []):
+            ist_krank = bool(p.get('ist_krank'))
+            if ist_krank:
+                dienst = 'KRANK'
+                typ    = _SCHICHT_TYP_MAP.get(p.get('krank_schicht_typ'), 'regulaer')
+                ist_dispo = p.get('krank_ist_dispo')
+            else:
+                dienst = p.get('dienst_kategorie') or ''
+                if dienst in _BEREITSCHAFT_DIENSTE:
+                    typ = 'bereitschaft'
+                else:
+                    typ = _SCHICHT_TYP_MAP.get(p.get('schicht_typ'), 'regulaer')
+                ist_dispo = p.get('ist_dispo')
+            schichten.append({
+                'datum':         datum,
+                'vollname':      p.get('vollname', ''),
+                'excel_row':     p.get('excel_row'),
+                'dienst':        dienst,
+                'ist_krank':     1 if ist_krank else 0,
+                'start_uhrzeit': p.get('start_zeit') or '',
+                'end_uhrzeit':   p.get('end_zeit') or '',
+                'position':      'Dispo' if ist_dispo else 'Betreuer',
+                'schicht_typ':   typ,
+            })
+    return schichten
+
+
+def _importiere_datei(pfad: str, datei: str, alter_sha1: str) -> dict:
+    """
+    Worker (läuft im Prozess-Pool): hasht und parst eine Datei.
+    Bei unverändertem Inhalt (gleicher SHA1) wird nicht geparst.
+    """
+    from functions.dienstplan_parser import DienstplanParser
+    ergebnis = {'datei': datei, 'sha1': '', 'datum': '', 'schichten': None, 'fehler': ''}
+    try:
+        ergebnis['sha1'] = _datei_sha1(pfad)
+        if ergebnis['sha1'] == alter_sha1:
+            return ergebnis   # Inhalt unverändert, nur mtime aktualisieren
+        parsed = DienstplanParser(pfad, alle_anzeigen=True).parse()
+        if not parsed.get('success'):
+            ergebnis['fehler'] = parsed.get('error') or 'Parse-Fehler'
+            return ergebnis
+        datum = _iso_datum(parsed.get('datum'), os.path.basename(pfad))
+        if not datum:
+            ergebnis['fehler'] = 'Kein Datum erkannt'
+            return ergebnis
+        ergebnis['datum']     = datum
+        ergebnis['schichten'] = _schichten_aus_ergebnis(parsed, datum)
+    except Exception as e:
+        ergebnis['fehler'] = str(e)
+    return ergebnis
+
+
+def _zeilen_je_datei(schichten: list[dict]) -> list[dict]:
+    """
+    Eine Schicht je Excel-Zeile (Zeilenidentität = Quelldatei + excel_row,
+    wie der eindeutige Index); bei Doppelten gilt die letzte.
+    """
+    eindeutig: dict = {}
+    for i, s in enumerate(schichten):
+        schluessel = s['excel_row'] if s['excel_row'] is not None else ('ohne', i)
+        eindeutig[schluessel] = s
+    return list(eindeutig.values())
+
+
+def _schreibe_import(ergebnisse: list[dict], dateistand: dict, ma_map: dict) -> int:
+    """
+    Schreibt eine Gruppe von Datei-Ergebnissen in einer Transaktion.
+    Gibt die Anzahl geschriebener Schichten zurück.
+    """
+    with db_cursor(commit=True) as cur:
+        zeilen = []
+        anzahl: dict[str, int] = {}
+        for erg in ergebnisse:
+            if erg['schichten'] is not None:
+                cur.execute("DELETE FROM dienstplan WHERE quelle_datei = ?", (erg['datei'],))
+                schichten = _zeilen_je_datei(erg['schichten'])
+                anzahl[erg['datei']] = len(schichten)
+                for s in schichten:
+                    zeilen.append((
+                        ma_map.get(s['vollname'].lower()), s['datum'],
+                        s['start_uhrzeit'], s['end_uhrzeit'], s['position'],
+                        s['schicht_typ'], s['vollname'], s['dienst'],
+                        s['ist_krank'], s['excel_row'], erg['datei'],
+                    ))
+        cur.executemany("""
+            INSERT INTO dienstplan
+                (mitarbeiter_id, datum, start_uhrzeit, end_uhrzeit, position,
+                 schicht_typ, vollname, dienst, ist_krank, excel_row, quelle_datei)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(quelle_datei, excel_row) DO UPDATE SET
+                mitarbeiter_id = excluded.mitarbeiter_id,
+                datum          = excluded.datum,
+                vollname       = excluded.vollname,
+                start_uhrzeit  = excluded.start_uhrzeit,
+                end_uhrzeit    = excluded.end_uhrzeit,
+                position       = excluded.position,
+                schicht_typ    = excluded.schicht_typ,
+                dienst         = excluded.dienst,
+                ist_krank      = excluded.ist_krank
+        """, zeilen)
+
+        cur.executemany("""
+            INSERT INTO dienstplan_import_dateien
+                (datei, mtime_ns, groesse, sha1, datum, anzahl, fehler, importiert_am)
+            VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now','localtime'))
+            ON CONFLICT(datei) DO UPDATE SET
+                mtime_ns      = excluded.mtime_ns,
+                groesse       = excluded.groesse,
+                sha1          = excluded.sha1,
+                datum         = CASE WHEN excluded.datum != '' THEN excluded.datum ELSE datum END,
+                anzahl        = CASE WHEN excluded.anzahl >= 0 THEN excluded.anzahl ELSE anzahl END,
+                fehler        = excluded.fehler,
+                importiert_am = excluded.importiert_am
+        """, [
+            # Fehlerhafte Dateien ohne mtime/SHA1 vermerken → nächster Lauf parst erneut
+            (erg['datei'],
+             0 if erg['fehler'] else dateistand[erg['datei']][0], dateistand[erg['datei']][1],
+             '' if erg['fehler'] else erg['sha1'], erg['datum'],
+             anzahl.get(erg['datei'], -1), erg['fehler'])
+            for erg in ergebnisse
+        ])
+    return len(zeilen)
+
+
+def _entferne_geloeschte(dateien: list[str]):
+    """Entfernt Schichten und Dateistand von Dateien, die nicht mehr im Ordner liegen."""
+    with db_cursor(commit=True) as cur:
+        cur.executemany("DELETE FROM dienstplan WHERE quelle_datei = ?", [(d,) for d in dateien])
+        cur.executemany(
+            "DELETE FROM dienstplan_import_dateien WHERE datei = ?", [(d,) for d in dateien]
+        )
+
+
+def importiere_dienstplan_ordner(
+    ordner: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    fortschritt: Optional[Callable[[int, int], None]] = None,
+) -> dict:
+    """
+    Importiert alle Tagesdienstpläne (*.xlsx) aus *ordner* (Standard: Einstellung
+    'dienstplan_ordner') inkrementell in die Tabelle 'dienstplan'.
+
+    - Dateien mit unverändertem mtime/Größe werden übersprungen, bei geändertem
+      mtime aber gleichem SHA1 wird nur der Dateistand aktualisiert.
+    - Geänderte Dateien werden parallel in einem ProcessPoolExecutor geparst und
+      gesammelt per executemany in großen Transaktionen geschrieben.
+    - Schichten gehören zu ihrer Quelldatei (eindeutig je Datei + Excel-Zeile);
+      Schichten aus Dateien, die nicht mehr im Ordner liegen, werden entfernt,
+      ohne andere Dateien desselben Datums zu berühren.
+    - fortschritt(erledigt, gesamt) wird nach jeder Datei aufgerufen.
+
+    Returns:
+        {'gesamt', 'uebersprungen', 'unveraendert', 'importiert', 'schichten',
+         'entfernt', 'fehler': list[(datei, meldung)]}
+    """
+    if ordner is None:
+        from functions.settings_functions import get_setting
+        ordner = get_setting('dienstplan_ordner')
+    statistik = {
+        'gesamt': 0, 'uebersprungen': 0, 'unveraendert': 0,
+        'importiert': 0, 'schichten': 0, 'entfernt': 0, 'fehler': [],
+    }
+    if not ordner or not os.path.isdir(ordner):
+        statistik['fehler'].append(('', f'Ordner nicht gefunden: {ordner}'))
+        return statistik
+
+    # Dateien einsammeln (rekursiv, Excel-Sperrdateien ~$ ignorieren)
+    dateien: dict[str, str] = {}
+    dateistand: dict[str, tuple] = {}
+    for wurzel, _dirs, namen in os.walk(ordner):
+        for name in namen:
+            if not name.lower().endswith('.xlsx') or name.startswith('~$'):
+                continue
+            pfad  = os.path.join(wurzel, name)
+            datei = os.path.relpath(pfad, ordner).replace('\\', '/')
+            try:
+                st = os.stat(pfad)
+            except OSError:
+                continue
+            dateien[datei]    = pfad
+            dateistand[datei] = (st.st_mtime_ns, st.st_size)
+    statistik['gesamt'] = len(dateien)
+
+    with db_cursor() as cur:
+        cur.execute("SELECT datei, mtime_ns, groesse, sha1 FROM dienstplan_import_dateien")
+        bekannt = {r['datei']: r for r in cur.fetchall()}
+        cur.execute("SELECT id, lower(vorname || ' ' || nachname) AS vollname FROM mitarbeiter")
+        ma_map = {r['vollname']: r['id'] for r in cur.fetchall()}
+
+    geloescht = [d for d in bekannt if d not in dateien]
+    if geloescht:
+        _entferne_geloeschte(geloescht)
+        statistik['entfernt'] = len(geloescht)
+
+    auftraege = []
+    for datei, pfad in dateien.items():
+        alt = bekannt.get(datei)
+        if alt and (alt['mtime_ns'], alt['groesse']) == dateistand[datei]:
+            statistik['uebersprungen'] += 1
+            continue
+        auftraege.append((pfad, datei, alt['sha1'] if alt else ''))
+
+    gesamt   = len(auftraege)
+    erledigt = 0
+    puffer: list[dict] = []
+    puffer_zeilen = 0
+
+    def _verbuche(erg: dict):
+        nonlocal erledigt, puffer_zeilen, puffer
+        erledigt += 1
+        if erg['fehler']:
+            statistik['fehler'].append((erg['datei'], erg['fehler']))
+        elif erg['schichten'] is None:
+            statistik['unveraendert'] += 1
+        else:
+            statistik['importiert'] += 1
+            puffer_zeilen += len(erg['schichten'])
+        puffer.append(erg)
+        if puffer_zeilen >= _IMPORT_BATCH:
+            statistik['schichten'] += _schreibe_import(puffer, dateistand, ma_map)
+            puffer, puffer_zeilen = [], 0
+        if fortschritt:
+            fortschritt(erledigt, gesamt)
+
+    if gesamt <= 2:
+        # Für wenige Dateien lohnt sich kein Prozess-Pool
+        for auftrag in auftraege:
+            _verbuche(_importiere_datei(*auftrag))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_importiere_datei, *a) for a in auftraege]
+            for fut in as_completed(futures):
+                _verbuche(fut.result())
+
+    if puffer:
+        statistik['schichten'] += _schreibe_import(puffer, dateistand, ma_map)
+    return statistik
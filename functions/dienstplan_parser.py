@@ -9,12 +9,17 @@ import openpyxl
 import re
 from pathlib import Path
 from datetime import datetime, time
-from typing import Optional
+from typing import Optional, Callable
 from collections import Counter
+from types import SimpleNamespace
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+class ParseAbgebrochen(Exception):
+    """Wird ausgelöst, wenn der Aufrufer das Einlesen über abbrechen() beendet."""
+
+
 def _runde_auf_volle_stunde(zeit_str: Optional[str]) -> Optional[str]:
     """
     Rundet eine Zeitangabe auf die volle Stunde ab (Minutenanteil wird 0).
@@ -59,6 +64,26 @@ def _betr_zu_dispo_kuerzel(kuerzel: str) -> str:
     return kuerzel or 'D(?)'
 
 
+def _fill_rgb(fill) -> Optional[str]:
+    """AARRGGBB einer soliden Füllung (sonst None) – genügt für _check_cell_colors()."""
+    try:
+        if fill is not None and fill.patternType in ('solid', 'solidFill'):
+            rgb = getattr(fill.fgColor, 'rgb', None)
+            return str(rgb) if rgb else None
+    except Exception:
+        pass
+    return None
+
+
+def _zelle_mit_fill(rgb: Optional[str]) -> SimpleNamespace:
+    """Minimaler Zell-Ersatz mit solider Füllfarbe (für aktualisiere_zeile())."""
+    if not rgb:
+        return SimpleNamespace(fill=None)
+    return SimpleNamespace(fill=SimpleNamespace(
+        patternType='solid', fgColor=SimpleNamespace(rgb=rgb)
+    ))
+
+
 class DienstplanParser:
     """Parser für Dienstplan-Excel-Dateien.
     Sucht die Header-Zeile (NAME, DIENST, BEGINN, ENDE) automatisch
@@ -74,13 +99,27 @@ class DienstplanParser:
     # Vollständig ausgeschlossene Personen (Vorname Nachname, lowercase, fix)
     AUSGESCHLOSSENE_VOLLNAMEN: frozenset = frozenset({'lars peters'})
 
-    def __init__(self, excel_path: str, alle_anzeigen: bool = False, round_dispo: bool = True):
+    # Header-Zeile muss innerhalb dieser ersten Zeilen liegen
+    HEADER_SUCHBEREICH = 20
+    # Fortschritt / Abbruch werden alle n gelesenen Zeilen geprüft
+    FORTSCHRITT_INTERVALL = 25
+
+    def __init__(self, excel_path: str, alle_anzeigen: bool = False, round_dispo: bool = True,
+                 schnell: bool = True,
+                 fortschritt: Optional[Callable[[int], None]] = None,
+                 abbrechen:   Optional[Callable[[], bool]] = None):
         self.excel_path    = Path(excel_path)
         self.alle_anzeigen = alle_anzeigen  # True = keine Ausschlüsse, für Anzeige
         self.round_dispo   = round_dispo    # False = Zeiten nie runden (für Roh-Anzeige)
+        self.schnell       = schnell        # True = Read-only-Streaming (ein Durchlauf)
+        self.fortschritt   = fortschritt    # fortschritt(gelesene_zeilen)
+        self.abbrechen     = abbrechen      # abbrechen() → True beendet das Einlesen
+        self._zeilen_gelesen = 0
         self.workbook      = None
         self.sheet         = None
         self.column_map    = None
+        self.datum: Optional[str] = None
+        self._abschnitt    = 'betreuer'   # 'betreuer' oder 'dispo' (beim Einlesen)
         self.unbekannte_dienste: set = set()
 
     # ------------------------------------------------------------------
@@ -102,108 +141,348 @@ class DienstplanParser:
             }
         """
         try:
-            self.workbook = openpyxl.load_workbook(self.excel_path, data_only=True)
-            self.sheet    = self.workbook.active
-
-            self.column_map = self._find_columns()
-            if not self.column_map:
-                return {
-                    'success': False,
-                    'betreuer': [], 'dispo': [], 'kranke': [],
-                    'error': 'Header-Zeile nicht gefunden (benötigt: NAME, DIENST).',
-                    'unbekannte_dienste': []
-                }
-
-            betreuer_liste = []
-            dispo_liste    = []
-            kranke_liste   = []
-            alle_nachnamen = []
-
-            # Abschnitt-Tracking: 'betreuer' oder 'dispo'
-            aktueller_abschnitt = 'betreuer'
-
-            for row in self.sheet.iter_rows(min_row=1, values_only=False):
-                row_list = list(row)
-
-                # Abschnitts-Header prüfen BEVOR _parse_row aufgerufen wird
-                neuer_abschnitt = self._detect_abschnitt_header(row_list)
-                if neuer_abschnitt is not None:
-                    aktueller_abschnitt = neuer_abschnitt
-                    continue   # Header-Zeile selbst nicht als Person parsen
-
-                person = self._parse_row(row_list)
-                if person:
-                    # Abschnitts-Kontext auf Person übertragen
-                    if aktueller_abschnitt == 'dispo':
-                        person['ist_dispo']       = True
-                        # Für Kranke: Dispo-Status + abgeleitetes Kürzel anpassen
-                        if person.get('ist_krank'):
-                            person['krank_ist_dispo'] = True
-                            # Betreuer-Kürzel → Dispo-Kürzel umwandeln
-                            d = person.get('krank_abgeleiteter_dienst') or ''
-                            person['krank_abgeleiteter_dienst'] = _betr_zu_dispo_kuerzel(d)
-                            # Anzeigezeiten auf volle Stunde abrunden
-                            if self.round_dispo:
-                                person['start_zeit'] = _runde_auf_volle_stunde(person.get('start_zeit'))
-                                person['end_zeit']   = _runde_auf_volle_stunde(person.get('end_zeit'))
-
-                    alle_nachnamen.append(person['nachname'])
-                    if person['ist_krank']:
-                        kranke_liste.append(person)
-                    elif person['ist_dispo']:
-                        dispo_liste.append(person)
-                    else:
-                        betreuer_liste.append(person)
-
-            # Ausgeschlossene Personen herausfiltern (nur im Export-Modus)
-            if not self.alle_anzeigen:
-                try:
-                    from functions.settings_functions import get_ausgeschlossene_namen
-                    settings_ausgeschlossen = set(get_ausgeschlossene_namen())
-                except Exception:
-                    settings_ausgeschlossen = set()
-
-                alle_ausgeschlossen = self.AUSGESCHLOSSENE_VOLLNAMEN | settings_ausgeschlossen
-
-                def _filter_ausgeschlossen(lst):
-                    return [p for p in lst
-                            if p['vollname'].lower() not in alle_ausgeschlossen]
-
-                betreuer_liste = _filter_ausgeschlossen(betreuer_liste)
-                dispo_liste    = _filter_ausgeschlossen(dispo_liste)
-                kranke_liste   = _filter_ausgeschlossen(kranke_liste)
+            eintraege = self._lade_eintraege()
+            if eintraege is None:
+                return self._fehler_ergebnis(
+                    'Header-Zeile nicht gefunden (benötigt: NAME, DIENST).'
+                )
+            ergebnis = self._baue_ansicht(eintraege, self.alle_anzeigen, self.round_dispo)
+            self.unbekannte_dienste = set(ergebnis['unbekannte_dienste'])
+            return ergebnis
+
+        except ParseAbgebrochen:
+            return dict(self._fehler_ergebnis('Einlesen abgebrochen.'), abgebrochen=True)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return self._fehler_ergebnis(str(e))
+        finally:
+            if self.workbook:
+                self.workbook.close()
 
-            # Doppelte Nachnamen → Initial anhängen
-            nachname_counts  = Counter(alle_nachnamen)
-            doppelte         = {n for n, c in nachname_counts.items() if c > 1}
-            for gruppe in (betreuer_liste, dispo_liste, kranke_liste):
-                self._generate_display_names(gruppe, doppelte)
+    def parse_alle_ansichten(self) -> dict:
+        """
+        Lädt die Excel-Datei nur einmal, dekodiert jede Zeile nur einmal und
+        liefert daraus alle drei Ansichten, die die GUI benötigt.
 
-            return {
-                'success': True,
-                'betreuer': betreuer_liste,
-                'dispo':    dispo_liste,
-                'kranke':   kranke_liste,
-                'error':    None,
-                'unbekannte_dienste': list(self.unbekannte_dienste),
-                'datum':    self._find_datum(),
-                'column_map': dict(self.column_map) if self.column_map else {},
-                'excel_path': str(self.excel_path),
+        Returns:
+            {
+                'success': bool,
+                'error':   str | None,
+                'display': dict,   # wie parse() mit alle_anzeigen=True
+                'export':  dict,   # wie parse() mit alle_anzeigen=False
+                'raw':     dict,   # wie parse() mit alle_anzeigen=True, round_dispo=False
+                'zeilen':  list,   # dekodierte Basis-Zeilen für aktualisiere_zeile()
             }
-
+        Jede Ansicht hat exakt das Format von parse() und eigene Personen-Dicts,
+        sodass Änderungen an einer Ansicht die anderen nicht beeinflussen.
+        """
+        try:
+            eintraege = self._lade_eintraege()
+            if eintraege is None:
+                return self._fehler_ansichten(
+                    'Header-Zeile nicht gefunden (benötigt: NAME, DIENST).'
+                )
+            return self._ansichten_aus_eintraegen(eintraege)
+
+        except ParseAbgebrochen:
+            return dict(self._fehler_ansichten('Einlesen abgebrochen.'), abgebrochen=True)
         except Exception as e:
             import traceback
             traceback.print_exc()
-            return {
-                'success': False,
-                'betreuer': [], 'dispo': [], 'kranke': [],
-                'error': str(e),
-                'unbekannte_dienste': []
-            }
+            return self._fehler_ansichten(str(e))
         finally:
             if self.workbook:
                 self.workbook.close()
 
+    @classmethod
+    def aktualisiere_zeile(cls, ansichten: dict, excel_row: int, dienst: Optional[str],
+                           beginn: Optional[str], ende: Optional[str],
+                           dienst_fill_rgb: Optional[str] = None) -> Optional[dict]:
+        """
+        Aktualisiert ein Ergebnis von parse_alle_ansichten() nach dem Zurückschreiben
+        einer einzelnen Zeile, ohne die Arbeitsmappe erneut zu öffnen.
+
+        Nur die Zeile excel_row wird mit den neuen Werten (Dienst, Beginn/Ende als
+        'HH:MM', Füllfarbe der DIENST-Zelle als AARRGGBB) neu dekodiert; danach
+        werden Einordnung, Anzeigenamen und Ausschlüsse für alle drei Ansichten
+        neu abgeleitet. Gibt ein neues Ansichten-Dict zurück oder None, wenn die
+        Zeile nicht enthalten ist (dann muss neu eingelesen werden).
+        """
+        zeilen = ansichten.get('zeilen')
+        basis  = ansichten.get('display') or {}
+        if not ansichten.get('success') or zeilen is None or not basis.get('column_map'):
+            return None
+
+        parser = cls(basis.get('excel_path', ''))
+        parser.column_map = dict(basis['column_map'])
+        parser.datum      = basis.get('datum')
+
+        eintraege = []
+        gefunden  = False
+        for abschnitt, person, name_info in zeilen:
+            if not gefunden and person.get('excel_row') == excel_row:
+                neu = parser._dekodiere_werte(
+                    excel_row, name_info, dienst, beginn, ende, dienst_fill_rgb
+                )
+                if neu is None:
+                    return None
+                person, gefunden = neu, True
+            eintraege.append((abschnitt, person, name_info))
+        if not gefunden:
+            return None
+        return parser._ansichten_aus_eintraegen(eintraege)
+
+    # ------------------------------------------------------------------
+    # Einlesen und Ansichten aufbauen
+    # ------------------------------------------------------------------
+
+    def _ansichten_aus_eintraegen(self, eintraege: list) -> dict:
+        """Baut Anzeige-, Export- und Roh-Ansicht aus den dekodierten Zeilen."""
+        return {
+            'success': True,
+            'error':   None,
+            'display': self._baue_ansicht(eintraege, alle_anzeigen=True,  round_dispo=True),
+            'export':  self._baue_ansicht(eintraege, alle_anzeigen=False, round_dispo=True),
+            'raw':     self._baue_ansicht(eintraege, alle_anzeigen=True,  round_dispo=False),
+            'zeilen':  [[a, dict(p), dict(info)] for a, p, info in eintraege],
+        }
+
+    def _dekodiere_werte(self, excel_row: int, name_info: dict, dienst: Optional[str],
+                         beginn: Optional[str], ende: Optional[str],
+                         dienst_fill_rgb: Optional[str]) -> Optional[dict]:
+        """Dekodiert eine Zeile aus bekannten Zellwerten (ohne Arbeitsmappe)."""
+        breite = self._benoetigte_breite()
+        werte  = [None] * breite
+        zellen = [None] * breite
+        werte[self.column_map['name']]   = name_info.get('name')
+        werte[self.column_map['dienst']] = dienst or None
+        if self.column_map.get('beginn') is not None:
+            werte[self.column_map['beginn']] = beginn or None
+        if self.column_map.get('ende') is not None:
+            werte[self.column_map['ende']] = ende or None
+        zellen[self.column_map['name']]   = _zelle_mit_fill(name_info.get('name_fill'))
+        zellen[self.column_map['dienst']] = _zelle_mit_fill(dienst_fill_rgb)
+        return self._dekodiere_zeile(excel_row, werte, zellen)
+
+    @staticmethod
+    def _fehler_ergebnis(error: str) -> dict:
+        """Ergebnis-Dict für einen fehlgeschlagenen Parse-Vorgang."""
+        return {
+            'success': False,
+            'betreuer': [], 'dispo': [], 'kranke': [],
+            'error': error,
+            'unbekannte_dienste': []
+        }
+
+    @classmethod
+    def _fehler_ansichten(cls, error: str) -> dict:
+        """Ergebnis von parse_alle_ansichten() für einen Fehlerfall."""
+        return {
+            'success': False,
+            'error':   error,
+            'display': cls._fehler_ergebnis(error),
+            'export':  cls._fehler_ergebnis(error),
+            'raw':     cls._fehler_ergebnis(error),
+        }
+
+    def _lade_eintraege(self) -> Optional[list]:
+        """
+        Öffnet die Arbeitsmappe und dekodiert alle Personen-Zeilen genau einmal.
+
+        Gibt eine Liste von (abschnitt, person, name_info) zurück – person
+        ungerundet und ohne Ausschlüsse, name_info = Text und Füllfarbe der
+        NAME-Zelle – oder None, wenn keine Header-Zeile gefunden wurde.
+        Setzt self.column_map und self.datum.
+        """
+        if self.schnell:
+            return self._lade_eintraege_stream()
+
+        self.workbook = openpyxl.load_workbook(self.excel_path, data_only=True)
+        self.sheet    = self.workbook.active
+
+        self.column_map = self._find_columns()
+        if not self.column_map:
+            return None
+        self.datum = self._find_datum()
+
+        eintraege = []
+        self._abschnitt = 'betreuer'
+
+        for row in self.sheet.iter_rows(min_row=1, values_only=False):
+            self._zeile_einlesen(eintraege, list(row))
+        return eintraege
+
+    def _lade_eintraege_stream(self) -> Optional[list]:
+        """
+        Schneller Pfad: liest das Blatt im Read-only-Modus in einem einzigen
+        Durchlauf. Die ersten Zeilen werden gepuffert, bis die Header-Zeile
+        gefunden ist (Spalten + Datum), danach wird direkt weitergestreamt.
+        Stile werden nur für die NAME- und DIENST-Zelle aufgelöst
+        (ReadOnlyCell.fill → Füllungs-Index im Stylesheet).
+        """
+        self.workbook = openpyxl.load_workbook(
+            self.excel_path, read_only=True, data_only=True
+        )
+        self.sheet = self.workbook.active
+
+        eintraege = []
+        puffer    = []
+        breite    = 0
+        self._abschnitt = 'betreuer'
+
+        for row_idx, row in enumerate(self.sheet.iter_rows(min_row=1), start=1):
+            zellen = list(row)
+            if self.column_map is None:
+                if row_idx >= self.HEADER_SUCHBEREICH:
+                    return None
+                werte = [c.value for c in zellen]
+                puffer.append((row_idx, zellen))
+                self.column_map = self._spalten_aus_zeile(werte, row_idx)
+                if self.column_map is None:
+                    continue
+                self.datum = self._datum_aus_zeilen(
+                    [c.value for c in z] for _, z in puffer[:-1]
+                )
+                breite = self._benoetigte_breite()
+                for gepuffert_idx, gepuffert in puffer:
+                    self._zeile_einlesen(eintraege, gepuffert, gepuffert_idx, breite)
+                puffer = []
+                continue
+            self._zeile_einlesen(eintraege, zellen, row_idx, breite)
+
+        if self.column_map is None:
+            return None
+        return eintraege
+
+    def _benoetigte_breite(self) -> int:
+        """Anzahl Spalten, die eine Zeile mindestens haben muss (NAME/DIENST/BEGINN/ENDE)."""
+        return max(
+            self.column_map['name'],
+            self.column_map['dienst'],
+            self.column_map.get('beginn') or 0,
+            self.column_map.get('ende')   or 0,
+        ) + 1
+
+    def _zeile_einlesen(self, eintraege: list, zellen: list,
+                        excel_row: Optional[int] = None, breite: int = 0):
+        """
+        Verarbeitet eine Blattzeile: Abschnitts-Header erkennen oder Person dekodieren.
+        excel_row/breite werden nur im Streaming-Modus übergeben (dort fehlen bei
+        leeren Zellen die Zeilennummern und kurze Zeilen werden nicht aufgefüllt).
+        """
+        self._zeilen_gelesen += 1
+        if self._zeilen_gelesen % self.FORTSCHRITT_INTERVALL == 0:
+            if self.abbrechen and self.abbrechen():
+                raise ParseAbgebrochen()
+            if self.fortschritt:
+                self.fortschritt(self._zeilen_gelesen)
+
+        werte = [c.value if hasattr(c, 'value') else c for c in zellen]
+        if len(werte) < breite:
+            werte.extend([None] * (breite - len(werte)))
+
+        # Abschnitts-Header prüfen BEVOR die Zeile als Person dekodiert wird
+        neuer_abschnitt = self._detect_abschnitt_header(werte)
+        if neuer_abschnitt is not None:
+            self._abschnitt = neuer_abschnitt
+            return   # Header-Zeile selbst nicht als Person parsen
+
+        if excel_row is None:
+            excel_row = zellen[0].row if zellen and hasattr(zellen[0], 'row') else None
+        person = self._dekodiere_zeile(excel_row, werte, zellen)
+        if person:
+            name_idx  = self.column_map['name']
+            name_info = {
+                'name':      werte[name_idx],
+                'name_fill': _fill_rgb(self._zell_fill(zellen, name_idx)),
+            }
+            eintraege.append((self._abschnitt, person, name_info))
+
+    def _baue_ansicht(self, eintraege: list, alle_anzeigen: bool, round_dispo: bool) -> dict:
+        """
+        Baut aus den dekodierten Zeilen eine Ansicht im Format von parse().
+
+        alle_anzeigen=False blendet stille Dienste und ausgeschlossene Personen aus,
+        round_dispo=True rundet Dispo-Zeiten auf volle Stunden.
+        """
+        betreuer_liste = []
+        dispo_liste    = []
+        kranke_liste   = []
+        alle_nachnamen = []
+        unbekannte     = set()
+
+        for abschnitt, basis, _name_info in eintraege:
+            dienst_kategorie = basis['dienst_kategorie']
+            if not alle_anzeigen and dienst_kategorie in self.STILLE_DIENSTE:
+                continue   # still ignorieren, keine Warnung
+            if dienst_kategorie and dienst_kategorie not in self.BETREUER_KATEGORIEN \
+                    and dienst_kategorie not in self.DISPO_KATEGORIEN:
+                unbekannte.add(dienst_kategorie)
+
+            person = dict(basis)
+            if round_dispo and dienst_kategorie in self.DISPO_KATEGORIEN:
+                person['start_zeit'] = _runde_auf_volle_stunde(person.get('start_zeit'))
+                person['end_zeit']   = _runde_auf_volle_stunde(person.get('end_zeit'))
+
+            # Abschnitts-Kontext auf Person übertragen
+            if abschnitt == 'dispo':
+                person['ist_dispo']       = True
+                # Für Kranke: Dispo-Status + abgeleitetes Kürzel anpassen
+                if person.get('ist_krank'):
+                    person['krank_ist_dispo'] = True
+                    # Betreuer-Kürzel → Dispo-Kürzel umwandeln
+                    d = person.get('krank_abgeleiteter_dienst') or ''
+                    person['krank_abgeleiteter_dienst'] = _betr_zu_dispo_kuerzel(d)
+                    # Anzeigezeiten auf volle Stunde abrunden
+                    if round_dispo:
+                        person['start_zeit'] = _runde_auf_volle_stunde(person.get('start_zeit'))
+                        person['end_zeit']   = _runde_auf_volle_stunde(person.get('end_zeit'))
+
+            alle_nachnamen.append(person['nachname'])
+            if person['ist_krank']:
+                kranke_liste.append(person)
+            elif person['ist_dispo']:
+                dispo_liste.append(person)
+            else:
+                betreuer_liste.append(person)
+
+        # Ausgeschlossene Personen herausfiltern (nur im Export-Modus)
+        if not alle_anzeigen:
+            try:
+                from functions.settings_functions import get_ausgeschlossene_namen
+                settings_ausgeschlossen = set(get_ausgeschlossene_namen())
+            except Exception:
+                settings_ausgeschlossen = set()
+
+            alle_ausgeschlossen = self.AUSGESCHLOSSENE_VOLLNAMEN | settings_ausgeschlossen
+
+            def _filter_ausgeschlossen(lst):
+                return [p for p in lst
+                        if p['vollname'].lower() not in alle_ausgeschlossen]
+
+            betreuer_liste = _filter_ausgeschlossen(betreuer_liste)
+            dispo_liste    = _filter_ausgeschlossen(dispo_liste)
+            kranke_liste   = _filter_ausgeschlossen(kranke_liste)
+
+        # Doppelte Nachnamen → Initial anhängen
+        nachname_counts  = Counter(alle_nachnamen)
+        doppelte         = {n for n, c in nachname_counts.items() if c > 1}
+        for gruppe in (betreuer_liste, dispo_liste, kranke_liste):
+            self._generate_display_names(gruppe, doppelte)
+
+        return {
+            'success': True,
+            'betreuer': betreuer_liste,
+            'dispo':    dispo_liste,
+            'kranke':   kranke_liste,
+            'error':    None,
+            'unbekannte_dienste': list(unbekannte),
+            'datum':    self.datum,
+            'column_map': dict(self.column_map) if self.column_map else {},
+            'excel_path': str(self.excel_path),
+        }
+
     # ------------------------------------------------------------------
     # Interne Hilfsmethoden
     # ------------------------------------------------------------------
@@ -211,10 +490,20 @@ class DienstplanParser:
     def _find_datum(self) -> Optional[str]:
         """Sucht in den ersten Zeilen nach einem Datumswert und gibt ihn als DD.MM.YYYY zurück."""
         try:
-            header_row = (self.column_map or {}).get('header_row', 20)
-            for row_idx in range(1, header_row):
-                for cell in self.sheet[row_idx]:
-                    val = cell.value
+            header_row = (self.column_map or {}).get('header_row', self.HEADER_SUCHBEREICH)
+            return self._datum_aus_zeilen(
+                [cell.value for cell in self.sheet[row_idx]]
+                for row_idx in range(1, header_row)
+            )
+        except Exception:
+            return None
+
+    @staticmethod
+    def _datum_aus_zeilen(zeilen_werte) -> Optional[str]:
+        """Gibt das erste Datum (DD.MM.YYYY) aus einer Folge von Zeilenwert-Listen zurück."""
+        try:
+            for werte in zeilen_werte:
+                for val in werte:
                     if isinstance(val, datetime):
                         return val.strftime('%d.%m.%Y')
                     if isinstance(val, str):
@@ -235,32 +524,38 @@ class DienstplanParser:
 
     def _find_columns(self) -> Optional[dict]:
         """Sucht Header-Zeile und gibt Spalten-Indizes zurück."""
-        for row_idx in range(1, min(20, self.sheet.max_row + 1)):
-            row        = list(self.sheet[row_idx])
-            row_values = [cell.value for cell in row]
-
-            name_idx = dienst_idx = beginn_idx = ende_idx = None
-
-            for col_idx, value in enumerate(row_values):
-                if value and isinstance(value, str):
-                    v = value.strip().upper()
-                    if v == 'NAME':
-                        name_idx = col_idx
-                    elif v == 'DIENST':
-                        dienst_idx = col_idx
-                    elif v == 'BEGINN':
-                        beginn_idx = col_idx
-                    elif v == 'ENDE':
-                        ende_idx = col_idx
-
-            if name_idx is not None and dienst_idx is not None:
-                return {
-                    'name':       name_idx,
-                    'dienst':     dienst_idx,
-                    'beginn':     beginn_idx,
-                    'ende':       ende_idx,
-                    'header_row': row_idx
-                }
+        for row_idx in range(1, min(self.HEADER_SUCHBEREICH, self.sheet.max_row + 1)):
+            row_values = [cell.value for cell in self.sheet[row_idx]]
+            column_map = self._spalten_aus_zeile(row_values, row_idx)
+            if column_map:
+                return column_map
+        return None
+
+    @staticmethod
+    def _spalten_aus_zeile(row_values: list, row_idx: int) -> Optional[dict]:
+        """Gibt die Spalten-Indizes zurück, falls row_values die Header-Zeile ist."""
+        name_idx = dienst_idx = beginn_idx = ende_idx = None
+
+        for col_idx, value in enumerate(row_values):
+            if value and isinstance(value, str):
+                v = value.strip().upper()
+                if v == 'NAME':
+                    name_idx = col_idx
+                elif v == 'DIENST':
+                    dienst_idx = col_idx
+                elif v == 'BEGINN':
+                    beginn_idx = col_idx
+                elif v == 'ENDE':
+                    ende_idx = col_idx
+
+        if name_idx is not None and dienst_idx is not None:
+            return {
+                'name':       name_idx,
+                'dienst':     dienst_idx,
+                'beginn':     beginn_idx,
+                'ende':       ende_idx,
+                'header_row': row_idx
+            }
         return None
 
     def _detect_abschnitt_header(self, row_list: list) -> Optional[str]:
@@ -297,11 +592,12 @@ class DienstplanParser:
                 return 'betreuer'
         return None
 
-    def _parse_row(self, row) -> Optional[dict]:
-        """Parst eine Zeile und gibt Person-Dict oder None zurück."""
-        row_list    = list(row)
-        excel_row   = row_list[0].row if row_list and hasattr(row_list[0], 'row') else None
-        cells       = [cell.value if hasattr(cell, 'value') else cell for cell in row_list]
+    def _dekodiere_zeile(self, excel_row: Optional[int], cells: list, zellen: list) -> Optional[dict]:
+        """
+        Dekodiert eine Zeile und gibt Person-Dict oder None zurück.
+        cells = Zellwerte, zellen = Zellobjekte (nur für die Füllfarben benötigt).
+        Das Ergebnis ist ansichtsneutral (ungerundete Zeiten, keine Ausschlüsse).
+        """
 
         max_col = max(
             self.column_map['name'],
@@ -323,39 +619,36 @@ class DienstplanParser:
 
         full_name = f"{parsed_name['vorname']} {parsed_name['nachname']}"
 
-        # Zellfarbe prüfen (Bulmorfahrer = gelb)
-        name_cell_obj   = row_list[self.column_map['name']]
-        dienst_cell_obj = row_list[self.column_map['dienst']]
+        # Zellfarbe prüfen (Bulmorfahrer = gelb) – Stile nur für diese zwei Zellen
         ist_bulmorfahrer, zeilen_farbe, dienst_farbe, dienst_farbe_hex = \
-            self._check_cell_colors(name_cell_obj, dienst_cell_obj)
+            self._check_cell_colors(
+                self._zell_fill(zellen, self.column_map['name']),
+                self._zell_fill(zellen, self.column_map['dienst']),
+            )
 
         # Dienst-Kürzel
         dienst_text     = None
         dienst_kategorie = None
         ist_krank        = False
 
+        # Stille Dienste und unbekannte Kürzel werden erst in _baue_ansicht()
+        # je nach Ansicht behandelt.
         raw_dienst = cells[self.column_map['dienst']]
         if raw_dienst:
             dienst_text = str(raw_dienst).strip().upper()
-            if not self.alle_anzeigen and dienst_text in self.STILLE_DIENSTE:
-                return None   # still ignorieren, keine Warnung
             if dienst_text in ('KRANK', 'K'):
                 ist_krank = True
-            elif dienst_text in self.BETREUER_KATEGORIEN or dienst_text in self.DISPO_KATEGORIEN:
-                dienst_kategorie = dienst_text
             elif dienst_text:
                 dienst_kategorie = dienst_text
-                self.unbekannte_dienste.add(dienst_text)
 
-        # Zeiten
-        round_times = (dienst_kategorie in self.DISPO_KATEGORIEN if dienst_kategorie else False) and self.round_dispo
+        # Zeiten (ungerundet – Dispo-Rundung erfolgt je Ansicht)
         start_zeit  = None
         end_zeit    = None
 
         if self.column_map.get('beginn') is not None and len(cells) > self.column_map['beginn']:
-            start_zeit = self._parse_time(cells[self.column_map['beginn']], round_to_hour=round_times)
+            start_zeit = self._parse_time(cells[self.column_map['beginn']])
         if self.column_map.get('ende') is not None and len(cells) > self.column_map['ende']:
-            end_zeit = self._parse_time(cells[self.column_map['ende']], round_to_hour=round_times)
+            end_zeit = self._parse_time(cells[self.column_map['ende']])
 
         schicht_typ = self._ermittle_schichttyp(start_zeit, end_zeit)
 
@@ -388,24 +681,30 @@ class DienstplanParser:
             'excel_row':                excel_row,
         }
 
-    def _check_cell_colors(self, name_cell_obj, dienst_cell_obj):
+    @staticmethod
+    def _zell_fill(zellen: list, idx: int):
+        """Füllung der Zelle idx (None bei fehlender/leerer Zelle)."""
+        if idx >= len(zellen):
+            return None
+        return getattr(zellen[idx], 'fill', None)
+
+    def _check_cell_colors(self, name_fill, dienst_fill):
         """Liest Zellfarben aus und erkennt Bulmorfahrer (gelb) und Zebra-Zeilen (grau)."""
         ist_bulmorfahrer = False
         zeilen_farbe     = None
         dienst_farbe     = None
         dienst_farbe_hex = None
 
-        for cell_obj in (name_cell_obj, dienst_cell_obj):
-            if not hasattr(cell_obj, 'fill') or not cell_obj.fill:
+        for fill, ist_dienst_zelle in ((name_fill, False), (dienst_fill, True)):
+            if not fill:
                 continue
             try:
-                fill = cell_obj.fill
                 if fill.patternType in ('solid', 'solidFill'):
                     fg = fill.fgColor
                     if hasattr(fg, 'rgb') and fg.rgb:
                         color_hex = str(fg.rgb).upper()
 
-                        if cell_obj == dienst_cell_obj and color_hex not in ('00000000', 'FFFFFFFF'):
+                        if ist_dienst_zelle and color_hex not in ('00000000', 'FFFFFFFF'):
                             dienst_farbe_hex = color_hex
 
                         if color_hex == 'FFF5F5F5':
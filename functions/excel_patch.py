@@ -0,0 +1,385 @@
+"""
+excel_patch.py
+
+Schreibt einzelne Zellen direkt in eine .xlsx-Datei, ohne die Arbeitsmappe
+über openpyxl komplett zu laden und neu zu serialisieren.
+
+Eine .xlsx-Datei ist ein ZIP-Archiv. Geändert werden nur
+  - die betroffenen <c>-Elemente im Arbeitsblatt des aktiven Tabs
+    (xl/worksheets/sheetN.xml),
+  - xl/styles.xml, falls für eine Zelle eine neue Formatierung
+    (Füllfarbe / Zeitformat) benötigt wird.
+Alle anderen Archiv-Einträge werden inhaltlich unverändert blockweise kopiert.
+Texte werden als Inline-Strings geschrieben, sharedStrings.xml bleibt daher
+unberührt.
+
+Fälle, die sich so nicht sicher patchen lassen (Formelzellen, fehlende
+Zeilen, Zellen ohne r-Attribut …), lösen PatchNichtMoeglich aus – der
+Aufrufer fällt dann auf openpyxl zurück.
+
+Verwendung:
+    from functions.excel_patch import patche_zellen, PatchNichtMoeglich
+    patche_zellen(quelle, ziel, {(5, 3): {'wert': 'KRANK', 'fill': 'FFFF0000'}})
+"""
+
+from __future__ import annotations
+
+import re
+import posixpath
+import zipfile
+from datetime import time
+from typing import Optional
+from xml.sax.saxutils import escape
+
+_BLOCK = 1 << 20
+
+# Eingebautes Zahlenformat 'h:mm:ss' (setzt openpyxl ebenfalls für time-Werte)
+_ZEITFORMAT_ID = 21
+# Eingebaute Datums-/Zeitformate (werden beibehalten)
+_DATUMSFORMAT_IDS = frozenset(range(14, 23)) | frozenset(range(45, 48))
+
+
+class PatchNichtMoeglich(Exception):
+    """Die Datei kann nicht direkt gepatcht werden (Fallback auf openpyxl)."""
+
+
+# --------------------------------------------------------------------------- #
+#  Öffentliche API                                                             #
+# --------------------------------------------------------------------------- #
+
+def patche_zellen(quelle: str, ziel: str, zellen: dict) -> None:
+    """
+    Schreibt die Zellen des aktiven Arbeitsblatts von *quelle* nach *ziel*.
+
+    zellen: {(zeile, spalte): {'wert': str | time | None, 'fill': ...}}
+        zeile/spalte 1-basiert (wie openpyxl).
+        'wert'  – neuer Zellwert (None = Zelle leeren).
+        'fill'  – optional: 'AARRGGBB' = solide Füllung, None = keine Füllung;
+                  fehlt der Schlüssel, bleibt die Füllung unverändert.
+    """
+    if not zellen:
+        raise PatchNichtMoeglich('Keine Zellen angegeben.')
+    try:
+        zin = zipfile.ZipFile(quelle)
+    except zipfile.BadZipFile as e:
+        raise PatchNichtMoeglich(f'Keine xlsx-Datei: {e}') from e
+
+    with zin:
+        namen      = set(zin.namelist())
+        blatt_pfad = _aktives_blatt(zin)
+        if blatt_pfad not in namen or 'xl/styles.xml' not in namen:
+            raise PatchNichtMoeglich('Arbeitsblatt oder styles.xml nicht gefunden.')
+
+        try:
+            styles = _Styles(zin.read('xl/styles.xml').decode('utf-8'))
+            blatt  = _patche_blatt(zin.read(blatt_pfad).decode('utf-8'), zellen, styles)
+        except UnicodeDecodeError as e:
+            raise PatchNichtMoeglich(f'Unerwartete Kodierung: {e}') from e
+
+        ersetzt = {blatt_pfad: blatt.encode('utf-8')}
+        if styles.geaendert:
+            ersetzt['xl/styles.xml'] = styles.xml().encode('utf-8')
+
+        with zipfile.ZipFile(ziel, 'w') as zout:
+            for info in zin.infolist():
+                if info.filename in ersetzt:
+                    zout.writestr(_kopf_kopie(info), ersetzt[info.filename])
+                    continue
+                with zin.open(info) as src, zout.open(_kopf_kopie(info), 'w') as dst:
+                    for block in iter(lambda: src.read(_BLOCK), b''):
+                        dst.write(block)
+
+
+def _kopf_kopie(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """Neuer Archiv-Eintrag mit Name, Zeitstempel, Kompression und Attributen von *info*."""
+    neu = zipfile.ZipInfo(info.filename, info.date_time)
+    neu.compress_type = info.compress_type
+    neu.external_attr = info.external_attr
+    neu.create_system = info.create_system
+    neu.comment       = info.comment
+    neu.file_size     = info.file_size   # für die ZIP64-Entscheidung beim Schreiben
+    return neu
+
+
+# --------------------------------------------------------------------------- #
+#  Arbeitsmappe                                                                #
+# --------------------------------------------------------------------------- #
+
+def _aktives_blatt(zin: zipfile.ZipFile) -> str:
+    """Pfad des aktiven Arbeitsblatts (wie openpyxl: workbookView/@activeTab)."""
+    try:
+        wb   = zin.read('xl/workbook.xml').decode('utf-8')
+        rels = zin.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+    except KeyError as e:
+        raise PatchNichtMoeglich(f'Arbeitsmappe unvollständig: {e}') from e
+
+    m = re.search(r'<(?:\w+:)?workbookView\b[^>]*\bactiveTab="(\d+)"', wb)
+    aktiv = int(m.group(1)) if m else 0
+
+    blaetter = re.findall(r'<(?:\w+:)?sheet\b([^>]*)/?>', wb)
+    if aktiv >= len(blaetter):
+        raise PatchNichtMoeglich('Aktives Blatt nicht gefunden.')
+    m = re.search(r'\b(?:\w+:)?id="([^"]+)"', blaetter[aktiv])
+    if not m:
+        raise PatchNichtMoeglich('Blatt-Beziehung nicht gefunden.')
+    rid = m.group(1)
+
+    for attrs in re.findall(r'<(?:\w+:)?Relationship\b([^>]*)/?>', rels):
+        if _attr(attrs, 'Id') == rid:
+            ziel = _attr(attrs, 'Target') or ''
+            if 'worksheet' not in (_attr(attrs, 'Type') or ''):
+                raise PatchNichtMoeglich('Aktives Blatt ist kein Arbeitsblatt.')
+            if ziel.startswith('/'):
+                return ziel.lstrip('/')
+            return posixpath.normpath(posixpath.join('xl', ziel))
+    raise PatchNichtMoeglich('Blatt-Beziehung nicht gefunden.')
+
+
+# --------------------------------------------------------------------------- #
+#  Arbeitsblatt                                                                #
+# --------------------------------------------------------------------------- #
+
+def _patche_blatt(xml: str, zellen: dict, styles: '_Styles') -> str:
+    m = re.search(r'<(\w+:)?worksheet\b', xml)
+    if not m:
+        raise PatchNichtMoeglich('Kein Arbeitsblatt-XML.')
+    p = m.group(1) or ''
+
+    nach_zeile: dict[int, dict[int, dict]] = {}
+    for (zeile, spalte), angabe in zellen.items():
+        nach_zeile.setdefault(zeile, {})[spalte] = angabe
+
+    # Zeilen in Dokumentreihenfolge zusammensetzen – der Rest des Blatts wird nur kopiert
+    treffer = sorted(_finde_zeile(xml, p, zeile) + (zeile,) for zeile in nach_zeile)
+    teile, pos = [], 0
+    for start, ende, inhalt_start, inhalt_ende, zeile in treffer:
+        if start < pos:
+            raise PatchNichtMoeglich(f'Zeile {zeile} überlappt.')
+        if inhalt_start is None:
+            # Selbstschließende <row .../> → öffnen
+            kopf   = xml[start:ende].rstrip('/>').rstrip()
+            inhalt = _patche_zeile('', p, zeile, nach_zeile[zeile], styles)
+            teile += [xml[pos:start], kopf, '>', inhalt, f'</{p}row>']
+            pos = ende
+        else:
+            inhalt = _patche_zeile(
+                xml[inhalt_start:inhalt_ende], p, zeile, nach_zeile[zeile], styles
+            )
+            teile += [xml[pos:inhalt_start], inhalt]
+            pos = inhalt_ende
+    teile.append(xml[pos:])
+    return ''.join(teile)
+
+
+def _finde_zeile(xml: str, p: str, zeile: int):
+    """(start, ende, inhalt_start, inhalt_ende) des <row>-Elements (inhalt_* None bei <row/>)."""
+    m = re.search(rf'<{p}row\b[^>]*?\sr="{zeile}"[^>]*?(/?)>', xml)
+    if not m:
+        raise PatchNichtMoeglich(f'Zeile {zeile} nicht im Arbeitsblatt.')
+    if m.group(1):
+        return m.start(), m.end(), None, None
+    ende = xml.find(f'</{p}row>', m.end())
+    if ende < 0:
+        raise PatchNichtMoeglich(f'Zeile {zeile} nicht abgeschlossen.')
+    return m.start(), ende + len(f'</{p}row>'), m.end(), ende
+
+
+_ZELLE_RE = r'<{p}c\b([^>]*?)(?:/>|>(.*?)</{p}c>)'
+
+
+def _patche_zeile(inhalt: str, p: str, zeile: int, aenderungen: dict, styles: '_Styles') -> str:
+    """Ersetzt/ergänzt die <c>-Elemente einer Zeile (Spaltenreihenfolge bleibt erhalten)."""
+    zellen = []   # (spalte, xml)
+    pos = 0
+    for m in re.finditer(_ZELLE_RE.format(p=p), inhalt, re.DOTALL):
+        if inhalt[pos:m.start()].strip():
+            raise PatchNichtMoeglich(f'Unerwarteter Inhalt in Zeile {zeile}.')
+        ref = _attr(m.group(1), 'r')
+        if not ref:
+            raise PatchNichtMoeglich(f'Zelle ohne Adresse in Zeile {zeile}.')
+        zellen.append([_spalte_aus_ref(ref), m.group(0)])
+        pos = m.end()
+    rest = inhalt[pos:]   # z. B. <extLst> – bleibt am Ende stehen
+
+    vorhanden = {spalte: i for i, (spalte, _) in enumerate(zellen)}
+    for spalte, angabe in aenderungen.items():
+        if spalte in vorhanden:
+            alt = zellen[vorhanden[spalte]][1]
+            zellen[vorhanden[spalte]][1] = _neue_zelle(p, zeile, spalte, alt, angabe, styles)
+        else:
+            zellen.append([spalte, _neue_zelle(p, zeile, spalte, None, angabe, styles)])
+    zellen.sort(key=lambda z: z[0])
+    return ''.join(x for _, x in zellen) + rest
+
+
+def _neue_zelle(p: str, zeile: int, spalte: int, alt: Optional[str],
+                angabe: dict, styles: '_Styles') -> str:
+    attrs = ''
+    if alt is not None:
+        m = re.match(_ZELLE_RE.format(p=p), alt, re.DOTALL)
+        attrs, kinder = m.group(1), m.group(2) or ''
+        if re.search(rf'<{p}f\b', kinder):
+            raise PatchNichtMoeglich(f'Formelzelle in Zeile {zeile} wird nicht überschrieben.')
+    stil = int(_attr(attrs, 's') or 0)
+
+    wert = angabe.get('wert')
+    if 'fill' in angabe:
+        stil = styles.mit_fill(stil, angabe['fill'])
+    if isinstance(wert, time):
+        stil = styles.mit_zeitformat(stil)
+
+    ref  = f'{_spalten_buchstaben(spalte)}{zeile}'
+    kopf = f'<{p}c r="{ref}"' + (f' s="{stil}"' if stil else '')
+    if wert is None or wert == '':
+        return kopf + '/>'
+    if isinstance(wert, time):
+        bruch = (wert.hour * 3600 + wert.minute * 60 + wert.second) / 86400
+        return f'{kopf}><{p}v>{repr(bruch)}</{p}v></{p}c>'
+    text = escape(str(wert))
+    raum = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'{kopf} t="inlineStr"><{p}is><{p}t{raum}>{text}</{p}t></{p}is></{p}c>'
+
+
+# --------------------------------------------------------------------------- #
+#  styles.xml                                                                  #
+# --------------------------------------------------------------------------- #
+
+class _Styles:
+    """Minimaler Editor für cellXfs/fills in styles.xml (nur Anhängen, nie Umnummerieren)."""
+
+    def __init__(self, xml: str):
+        m = re.search(r'<(\w+:)?styleSheet\b', xml)
+        if not m:
+            raise PatchNichtMoeglich('Kein styles.xml.')
+        self._p        = m.group(1) or ''
+        self._xml      = xml
+        self.geaendert = False
+        self._xfs      = self._elemente('cellXfs', 'xf')
+        self._fills    = self._elemente('fills', 'fill')
+        self._numfmts  = {
+            int(_attr(a, 'numFmtId')): _attr(a, 'formatCode') or ''
+            for a in re.findall(rf'<{self._p}numFmt\b([^>]*)/?>', xml)
+        }
+        self._neu_xfs:   list[str] = []
+        self._neu_fills: list[str] = []
+
+    def _elemente(self, container: str, tag: str) -> list[str]:
+        p = self._p
+        m = re.search(rf'<{p}{container}\b[^>]*>(.*?)</{p}{container}>', self._xml, re.DOTALL)
+        if not m:
+            raise PatchNichtMoeglich(f'{container} fehlt in styles.xml.')
+        return re.findall(rf'<{p}{tag}\b[^>]*?(?:/>|>.*?</{p}{tag}>)', m.group(1), re.DOTALL)
+
+    # ---------- Abfragen ----------
+
+    def _xf(self, index: int) -> str:
+        alle = self._xfs + self._neu_xfs
+        if index >= len(alle):
+            raise PatchNichtMoeglich(f'Zellformat {index} fehlt.')
+        return alle[index]
+
+    def _xf_index(self, xf: str) -> int:
+        """Index eines identischen Formats – sonst wird es angehängt."""
+        alle = self._xfs + self._neu_xfs
+        if xf in alle:
+            return alle.index(xf)
+        self._neu_xfs.append(xf)
+        self.geaendert = True
+        return len(alle)
+
+    def _fill_index(self, rgb: Optional[str]) -> int:
+        if not rgb:
+            return 0   # fills[0] ist per Konvention die leere Füllung
+        p = self._p
+        fill = (
+            f'<{p}fill><{p}patternFill patternType="solid">'
+            f'<{p}fgColor rgb="{rgb}"/><{p}bgColor indexed="64"/>'
+            f'</{p}patternFill></{p}fill>'
+        )
+        for i, vorhanden in enumerate(self._fills + self._neu_fills):
+            if vorhanden == fill or (
+                'patternType="solid"' in vorhanden and f'<{p}fgColor rgb="{rgb}"' in vorhanden
+            ):
+                return i
+        self._neu_fills.append(fill)
+        self.geaendert = True
+        return len(self._fills) + len(self._neu_fills) - 1
+
+    def _ist_datumsformat(self, fmt_id: int) -> bool:
+        if fmt_id in _DATUMSFORMAT_IDS:
+            return True
+        code = self._numfmts.get(fmt_id)
+        if not code:
+            return False
+        code = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.', '', code)
+        return bool(re.search(r'[dmyhs]', code, re.IGNORECASE))
+
+    # ---------- Abgeleitete Formate ----------
+
+    def mit_fill(self, stil: int, rgb: Optional[str]) -> int:
+        xf = _setze_attr(self._xf(stil), 'fillId', str(self._fill_index(rgb)))
+        xf = _setze_attr(xf, 'applyFill', '1')
+        return self._xf_index(xf)
+
+    def mit_zeitformat(self, stil: int) -> int:
+        xf = self._xf(stil)
+        if self._ist_datumsformat(int(_attr(xf, 'numFmtId') or 0)):
+            return stil
+        xf = _setze_attr(xf, 'numFmtId', str(_ZEITFORMAT_ID))
+        xf = _setze_attr(xf, 'applyNumberFormat', '1')
+        return self._xf_index(xf)
+
+    # ---------- Ausgabe ----------
+
+    def xml(self) -> str:
+        xml = self._xml
+        for container, tag, neu, gesamt in (
+            ('fills',   'fill', self._neu_fills, len(self._fills) + len(self._neu_fills)),
+            ('cellXfs', 'xf',   self._neu_xfs,   len(self._xfs) + len(self._neu_xfs)),
+        ):
+            if not neu:
+                continue
+            p = self._p
+            m = re.search(rf'(<{p}{container}\b[^>]*>)(.*?)(</{p}{container}>)', xml, re.DOTALL)
+            kopf = _setze_attr(m.group(1), 'count', str(gesamt))
+            xml = xml[:m.start()] + kopf + m.group(2) + ''.join(neu) + m.group(3) + xml[m.end():]
+        return xml
+
+
+# --------------------------------------------------------------------------- #
+#  Kleine Helper                                                               #
+# --------------------------------------------------------------------------- #
+
+def _attr(text: str, name: str) -> Optional[str]:
+    """Attributwert aus einem Tag-Ausschnitt (nur das erste/öffnende Tag)."""
+    kopf = text.split('>', 1)[0] if text.lstrip().startswith('<') else text
+    m = re.search(rf'(?:^|\s){re.escape(name)}="([^"]*)"', kopf)
+    return m.group(1) if m else None
+
+
+def _setze_attr(tag: str, name: str, wert: str) -> str:
+    """Setzt/ersetzt ein Attribut im öffnenden Tag von *tag*."""
+    kopf_ende = tag.find('>')
+    kopf, rest = tag[:kopf_ende], tag[kopf_ende:]
+    muster = rf'(\s){re.escape(name)}="[^"]*"'
+    if re.search(muster, kopf):
+        kopf = re.sub(muster, rf'\g<1>{name}="{wert}"', kopf, count=1)
+    else:
+        selbst = kopf.endswith('/')
+        kopf = (kopf[:-1].rstrip() if selbst else kopf) + f' {name}="{wert}"' + (' /' if selbst else '')
+    return kopf + rest
+
+
+def _spalte_aus_ref(ref: str) -> int:
+    spalte = 0
+    for ch in re.match(r'[A-Z]+', ref.upper()).group(0):
+        spalte = spalte * 26 + (ord(ch) - 64)
+    return spalte
+
+
+def _spalten_buchstaben(spalte: int) -> str:
+    buchstaben = ''
+    while spalte:
+        spalte, rest = divmod(spalte - 1, 26)
+        buchstaben = chr(65 + rest) + buchstaben
+    return buchstaben
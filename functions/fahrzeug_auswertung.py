@@ -0,0 +1,259 @@
+"""
+Fahrzeug-Auswertung – Ausfallzeiten / Verfügbarkeit
+Die Status-Historie (fahrzeug_status) wird per Fensterfunktion in
+lückenlose Intervalle je Fahrzeug zerlegt: ein Status gilt ab `von` bis zum
+`von` des nächsten Eintrags (LEAD) bzw. bis einschließlich `bis`, falls
+früher gesetzt. Zuschneiden auf den Berichtszeitraum und Aufteilen auf
+Kalendermonate passieren in derselben Abfrage, Python summiert nur noch
+das gruppierte Ergebnis (Fahrzeug × Monat × Status).
+"""
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db_cursor
+
+# Status, die als Ausfall zählen ('sonstiges' ist ein Hinweis, kein Ausfall)
+AUSFALL_STATUS = ("defekt", "werkstatt", "ausser_dienst")
+ALLE_STATUS    = ("fahrbereit", "defekt", "werkstatt", "ausser_dienst", "sonstiges")
+
+_INTERVALL_SQL = """
+WITH RECURSIVE
+intervalle AS (
+    SELECT s.fahrzeug_id, s.status, s.von AS beginn, NULLIF(s.bis, '') AS bis,
+           LEAD(s.von) OVER (
+               PARTITION BY s.fahrzeug_id
+               ORDER BY s.von, s.erstellt_am, s.id
+           ) AS naechster
+    FROM fahrzeug_status s
+    -- Spätere Einträge beeinflussen kein Intervall im Zeitraum
+    -- (das letzte endet dann offen und wird auf :bis gekürzt)
+    WHERE s.von < :bis
+),
+geclippt AS (
+    SELECT fahrzeug_id, status,
+           MAX(beginn, :von) AS beginn,
+           MIN(COALESCE(naechster, :bis),
+               COALESCE(date(bis, '+1 day'), :bis),
+               :bis) AS ende
+    FROM intervalle
+),
+teile(fahrzeug_id, status, beginn, ende, monatsende) AS (
+    -- Intervalle an Monatsgrenzen teilen: je Intervall so viele Zeilen,
+    -- wie es Monate berührt (linear, kein Kreuzprodukt mit Monatsliste)
+    SELECT fahrzeug_id, status, beginn, ende,
+           date(beginn, 'start of month', '+1 month')
+    FROM geclippt WHERE ende > beginn
+    UNION ALL
+    SELECT fahrzeug_id, status, monatsende, ende, date(monatsende, '+1 month')
+    FROM teile
+    WHERE monatsende < ende
+)
+SELECT fahrzeug_id, substr(beginn, 1, 7) AS monat, status,
+       SUM(julianday(MIN(ende, monatsende)) - julianday(beginn)) AS tage
+FROM teile
+GROUP BY fahrzeug_id, monat, status
+"""
+
+
+def _monate(von: date, bis: date) -> list[tuple[str, date, date]]:
+    """Kalendermonate (yyyy-MM, Beginn, Ende exkl.), die [von, bis) schneiden."""
+    ergebnis = []
+    m = von.replace(day=1)
+    while m < bis:
+        naechster = (m.replace(day=28) + timedelta(days=4)).replace(day=1)
+        ergebnis.append((m.strftime("%Y-%m"), m, naechster))
+        m = naechster
+    return ergebnis
+
+
+def _leer_je_status() -> dict[str, float]:
+    return {s: 0.0 for s in ALLE_STATUS}
+
+
+def ausfall_bericht(von: str, bis: str, nur_aktive: bool = False) -> dict:
+    """
+    Ausfallzeiten im halboffenen Zeitraum [von, bis) (ISO yyyy-MM-dd).
+    Der Zeitraum endet spätestens heute (inklusive).
+    Ein Fahrzeug zählt ab seinem ersten Status-Eintrag.
+
+    Returns:
+        {
+          'von', 'bis',
+          'fahrzeuge': [{fahrzeug_id, kennzeichen, typ, aktiv, tage,
+                         ausfall_tage, verfuegbarkeit, je_status}],
+          'monate':    [{monat, fahrzeug_tage, ausfall_tage,
+                         verfuegbarkeit, je_status}],
+          'je_status': {status: tage},
+        }
+        tage = betrachtete Fahrzeugtage, verfuegbarkeit = Anteil 0..1
+    """
+    bis_d = min(date.fromisoformat(bis), date.today() + timedelta(days=1))
+    von_d = date.fromisoformat(von)
+    bis = bis_d.isoformat()
+    leer = {"von": von, "bis": bis, "fahrzeuge": [], "monate": [],
+            "je_status": _leer_je_status()}
+    if bis_d <= von_d:
+        return leer
+
+    with db_cursor() as cur:
+        cur.execute(_INTERVALL_SQL, {"von": von, "bis": bis})
+        zeilen = cur.fetchall() or []
+        # Beginn der Betrachtung je Fahrzeug: erster Status-Eintrag
+        # (auch wenn kein Intervall in den Zeitraum fällt)
+        cur.execute("""
+            SELECT fahrzeug_id, MAX(:von, MIN(von)) AS beginn
+            FROM fahrzeug_status
+            GROUP BY fahrzeug_id
+            HAVING MIN(von) < :bis
+        """, {"von": von, "bis": bis})
+        beginne = {r["fahrzeug_id"]: r["beginn"] for r in cur.fetchall() or []}
+        cur.execute(
+            "SELECT id, kennzeichen, typ, aktiv FROM fahrzeuge"
+            + (" WHERE aktiv = 1" if nur_aktive else "")
+            + " ORDER BY kennzeichen"
+        )
+        stammdaten = cur.fetchall() or []
+
+    fahrzeuge = {
+        f["id"]: {
+            "fahrzeug_id": f["id"], "kennzeichen": f["kennzeichen"],
+            "typ": f.get("typ") or "", "aktiv": bool(f.get("aktiv")),
+            "tage": 0.0, "ausfall_tage": 0.0, "verfuegbarkeit": None,
+            "je_status": _leer_je_status(),
+        }
+        for f in stammdaten
+    }
+    monate = {
+        name: {"monat": name, "fahrzeug_tage": 0.0, "ausfall_tage": 0.0,
+               "verfuegbarkeit": None, "je_status": _leer_je_status(),
+               "_beginn": m_von, "_ende": m_bis}
+        for name, m_von, m_bis in _monate(von_d, bis_d)
+    }
+    je_status = _leer_je_status()
+
+    for z in zeilen:
+        fz = fahrzeuge.get(z["fahrzeug_id"])
+        if fz is None:
+            continue
+        tage, status = z["tage"] or 0.0, z["status"]
+        fz["je_status"][status] = fz["je_status"].get(status, 0.0) + tage
+        mo = monate[z["monat"]]
+        mo["je_status"][status] = mo["je_status"].get(status, 0.0) + tage
+        je_status[status] = je_status.get(status, 0.0) + tage
+        if status in AUSFALL_STATUS:
+            fz["ausfall_tage"] += tage
+            mo["ausfall_tage"] += tage
+
+    # Betrachtete Tage: ab erstem Status-Eintrag bis Zeitraumende
+    # (Lücken nach einem gesetzten 'bis' gelten als fahrbereit)
+    for fid, beginn in beginne.items():
+        fz = fahrzeuge.get(fid)
+        if fz is None:
+            continue
+        beginn = date.fromisoformat(beginn)
+        fz["tage"] = float((bis_d - beginn).days)
+        for mo in monate.values():
+            ueberlappung = (min(bis_d, mo["_ende"]) - max(beginn, mo["_beginn"])).days
+            if ueberlappung > 0:
+                mo["fahrzeug_tage"] += ueberlappung
+
+    ergebnis_fz = []
+    for fz in fahrzeuge.values():
+        if fz["tage"]:
+            fz["verfuegbarkeit"] = 1 - fz["ausfall_tage"] / fz["tage"]
+            ergebnis_fz.append(fz)
+    ergebnis_mo = []
+    for mo in monate.values():
+        del mo["_beginn"], mo["_ende"]
+        if mo["fahrzeug_tage"]:
+            mo["verfuegbarkeit"] = 1 - mo["ausfall_tage"] / mo["fahrzeug_tage"]
+        ergebnis_mo.append(mo)
+
+    return {"von": von, "bis": bis, "fahrzeuge": ergebnis_fz,
+            "monate": ergebnis_mo, "je_status": je_status}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Excel-Export
+# ──────────────────────────────────────────────────────────────────────────────
+
+_STATUS_LABELS = {
+    "fahrbereit":    "Fahrbereit",
+    "defekt":        "Defekt",
+    "werkstatt":     "Werkstatt",
+    "ausser_dienst": "Außer Dienst",
+    "sonstiges":     "Sonstiges",
+}
+
+
+def export_ausfall_excel(bericht: dict, ziel_pfad: str) -> str:
+    """
+    Schreibt einen ausfall_bericht() als Excel-Datei (Blätter 'Fahrzeuge'
+    und 'Monate'). Gibt den Speicherpfad zurück.
+    """
+    try:
+        import openpyxl
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+    except ImportError as e:
+        raise ImportError(
+            "openpyxl ist nicht installiert. Bitte 'pip install openpyxl' ausführen."
+        ) from e
+
+    hdr_font = Font(bold=True, color="FFFFFF")
+    hdr_fill = PatternFill("solid", fgColor="354A5F")
+    von = datetime.strptime(bericht["von"], "%Y-%m-%d").strftime("%d.%m.%Y")
+    bis = (datetime.strptime(bericht["bis"], "%Y-%m-%d") - timedelta(days=1)).strftime("%d.%m.%Y")
+    status_spalten = [_STATUS_LABELS[s] + " (Tage)" for s in ALLE_STATUS]
+
+    def _blatt(ws, titel: str, kopf: list[str], zeilen: list[list]):
+        ws.append([f"{titel}  |  {von} – {bis}"])
+        ws["A1"].font = Font(bold=True, size=13)
+        ws.append([])
+        ws.append(kopf)
+        for zelle in ws[3]:
+            zelle.font = hdr_font
+            zelle.fill = hdr_fill
+            zelle.alignment = Alignment(horizontal="center", wrap_text=True)
+        for z in zeilen:
+            ws.append(z)
+        for i, k in enumerate(kopf, 1):
+            ws.column_dimensions[get_column_letter(i)].width = max(12, len(k) + 2)
+        ws.freeze_panes = "A4"
+
+    def _prozent(wert):
+        return round(wert * 100, 1) if wert is not None else None
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Fahrzeuge"
+    _blatt(
+        ws, "Ausfallzeiten je Fahrzeug",
+        ["Kennzeichen", "Typ", "Aktiv", "Betrachtete Tage", "Ausfalltage",
+         "Verfügbarkeit %"] + status_spalten,
+        [
+            [fz["kennzeichen"], fz["typ"], "Ja" if fz["aktiv"] else "Nein",
+             fz["tage"], round(fz["ausfall_tage"], 1), _prozent(fz["verfuegbarkeit"])]
+            + [round(fz["je_status"].get(s, 0.0), 1) for s in ALLE_STATUS]
+            for fz in bericht["fahrzeuge"]
+        ],
+    )
+
+    ws = wb.create_sheet("Monate")
+    _blatt(
+        ws, "Ausfallzeiten je Monat (alle Fahrzeuge)",
+        ["Monat", "Fahrzeugtage", "Ausfalltage", "Verfügbarkeit %"] + status_spalten,
+        [
+            [mo["monat"], mo["fahrzeug_tage"], round(mo["ausfall_tage"], 1),
+             _prozent(mo["verfuegbarkeit"])]
+            + [round(mo["je_status"].get(s, 0.0), 1) for s in ALLE_STATUS]
+            for mo in bericht["monate"]
+        ],
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(ziel_pfad)), exist_ok=True)
+    wb.save(ziel_pfad)
+    return ziel_pfad
@@ -7,6 +7,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.connection import db_cursor
+from database.lesecache import gecacht
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -70,29 +71,37 @@ def loesche_fahrzeug(fahrzeug_id: int) -> bool:
         return cur.rowcount > 0
 
 
+_FAHRZEUGE_MIT_STATUS = """
+    SELECT f.*,
+           a.status AS aktueller_status,
+           a.grund  AS status_grund,
+           a.von    AS status_von,
+           a.bis    AS status_bis
+    FROM fahrzeuge f
+    LEFT JOIN fahrzeug_status_aktuell a ON a.fahrzeug_id = f.id
+"""
+
+
+@gecacht("fahrzeuge", "fahrzeug_status_aktuell")
 def lade_alle_fahrzeuge(nur_aktive: bool = False) -> list[dict]:
+    """
+    Alle Fahrzeuge mit aktuellem Status (aktueller_status, status_grund,
+    status_von, status_bis) aus fahrzeug_status_aktuell.
+    """
     with db_cursor() as cur:
         if nur_aktive:
-            cur.execute("""
-                SELECT f.*,
-                       (SELECT status FROM fahrzeug_status
-                        WHERE fahrzeug_id = f.id
-                        ORDER BY erstellt_am DESC LIMIT 1) AS aktueller_status
-                FROM fahrzeuge f WHERE f.aktiv = 1
+            cur.execute(_FAHRZEUGE_MIT_STATUS + """
+                WHERE f.aktiv = 1
                 ORDER BY f.kennzeichen
             """)
         else:
-            cur.execute("""
-                SELECT f.*,
-                       (SELECT status FROM fahrzeug_status
-                        WHERE fahrzeug_id = f.id
-                        ORDER BY erstellt_am DESC LIMIT 1) AS aktueller_status
-                FROM fahrzeuge f
+            cur.execute(_FAHRZEUGE_MIT_STATUS + """
                 ORDER BY f.aktiv DESC, f.kennzeichen
             """)
         return cur.fetchall() or []
 
 
+@gecacht("fahrzeuge")
 def lade_fahrzeug(fahrzeug_id: int) -> dict | None:
     with db_cursor() as cur:
         cur.execute("SELECT * FROM fahrzeuge WHERE id = ?", (fahrzeug_id,))
@@ -119,6 +128,7 @@ def setze_fahrzeug_status(
         return cur.lastrowid
 
 
+@gecacht("fahrzeug_status")
 def lade_status_historie(fahrzeug_id: int) -> list[dict]:
     with db_cursor() as cur:
         cur.execute("""
@@ -129,13 +139,14 @@ def lade_status_historie(fahrzeug_id: int) -> list[dict]:
         return cur.fetchall() or []
 
 
+@gecacht("fahrzeug_status", "fahrzeug_status_aktuell")
 def aktueller_status(fahrzeug_id: int) -> dict | None:
     """Gibt den neuesten Status-Eintrag zurück."""
     with db_cursor() as cur:
         cur.execute("""
-            SELECT * FROM fahrzeug_status
-            WHERE fahrzeug_id = ?
-            ORDER BY erstellt_am DESC LIMIT 1
+            SELECT s.* FROM fahrzeug_status_aktuell a
+            JOIN fahrzeug_status s ON s.id = a.status_id
+            WHERE a.fahrzeug_id = ?
         """, (fahrzeug_id,))
         return cur.fetchone()
 
@@ -201,6 +212,7 @@ def aktualisiere_schaden(
         return cur.rowcount > 0
 
 
+@gecacht("fahrzeug_schaeden")
 def lade_schaeden(fahrzeug_id: int) -> list[dict]:
     with db_cursor() as cur:
         cur.execute("""
@@ -300,6 +312,7 @@ def aktualisiere_termin(
         return cur.rowcount > 0
 
 
+@gecacht("fahrzeug_termine")
 def lade_termine(fahrzeug_id: int) -> list[dict]:
     with db_cursor() as cur:
         cur.execute("""
@@ -327,52 +340,238 @@ def loesche_termin(termin_id: int) -> bool:
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-#  HISTORIE – kombiniert alle Einträge eines Fahrzeugs
+#  FLOTTEN-ÜBERBLICK – für Übergabe-Formular und Übergabe-E-Mail
 # ══════════════════════════════════════════════════════════════════════════════
 
-def lade_komplette_historie(fahrzeug_id: int) -> list[dict]:
+def fleet_snapshot(protokoll_id: int | None = None, schaden_tage: int = 7) -> dict:
     """
-    Gibt alle Ereignisse (Status, Schäden, Termine) eines Fahrzeugs
-    als einheitliche Liste zurück, neueste zuerst.
+    Alle aktiven Fahrzeuge mit aktuellem Status, offenen Terminen, Schäden der
+    letzten `schaden_tage` Tage und den Fahrzeug-Notizen des Protokolls –
+    mit vier Abfragen unabhängig von der Anzahl der Fahrzeuge.
+
+    Returns:
+        {
+          'fahrzeuge': [Fahrzeug-Zeile wie lade_alle_fahrzeuge(nur_aktive=True)
+                        + 'offene_termine' (datum/uhrzeit absteigend),
+                          'schaeden' (neueste zuerst), 'notiz'],
+          'schaeden':  Schäden der letzten Tage über ALLE Fahrzeuge
+                       (wie lade_schaeden_letzte_tage),
+        }
     """
-    eintraege: list[dict] = []
-
     with db_cursor() as cur:
-        # Status
+        cur.execute(_FAHRZEUGE_MIT_STATUS + """
+            WHERE f.aktiv = 1
+            ORDER BY f.kennzeichen
+        """)
+        fahrzeuge = cur.fetchall() or []
+        je_fz = {f["id"]: f for f in fahrzeuge}
+        for f in fahrzeuge:
+            f["offene_termine"] = []
+            f["schaeden"] = []
+            f["notiz"] = ""
+
         cur.execute("""
-            SELECT 'status' AS art, von AS datum,
-                   status AS titel,
-                   grund AS beschreibung,
-                   bis, '' AS kommentar,
-                   erstellt_am
-            FROM fahrzeug_status WHERE fahrzeug_id = ?
-        """, (fahrzeug_id,))
-        eintraege.extend(cur.fetchall() or [])
+            SELECT t.* FROM fahrzeug_termine t
+            JOIN fahrzeuge f ON f.id = t.fahrzeug_id
+            WHERE f.aktiv = 1 AND COALESCE(t.erledigt, 0) = 0
+            ORDER BY t.fahrzeug_id, t.datum DESC, t.uhrzeit DESC
+        """)
+        for t in cur.fetchall() or []:
+            je_fz[t["fahrzeug_id"]]["offene_termine"].append(t)
 
-        # Schäden
         cur.execute("""
-            SELECT 'schaden' AS art, datum,
-                   beschreibung AS titel,
-                   schwere AS beschreibung,
-                   CASE behoben WHEN 1 THEN behoben_am ELSE '' END AS bis,
-                   kommentar,
-                   erstellt_am
-            FROM fahrzeug_schaeden WHERE fahrzeug_id = ?
-        """, (fahrzeug_id,))
-        eintraege.extend(cur.fetchall() or [])
+            SELECT fs.id, fs.fahrzeug_id, f.kennzeichen, f.typ AS fahrzeug_typ,
+                   fs.datum, fs.beschreibung, fs.schwere, fs.kommentar,
+                   fs.behoben, fs.behoben_am,
+                   COALESCE(fs.gesendet, 0) AS gesendet
+            FROM fahrzeug_schaeden fs
+            JOIN fahrzeuge f ON f.id = fs.fahrzeug_id
+            WHERE fs.datum >= date('now','localtime', ?)
+            ORDER BY fs.datum DESC, fs.erstellt_am DESC
+        """, (f"-{schaden_tage} days",))
+        schaeden = cur.fetchall() or []
+        for s in schaeden:
+            if s["fahrzeug_id"] in je_fz:
+                je_fz[s["fahrzeug_id"]]["schaeden"].append(s)
+
+        if protokoll_id:
+            cur.execute("""
+                SELECT fahrzeug_id, notiz
+                FROM uebergabe_fahrzeug_notizen
+                WHERE protokoll_id = ?
+            """, (protokoll_id,))
+            for row in cur.fetchall() or []:
+                if row["fahrzeug_id"] in je_fz:
+                    je_fz[row["fahrzeug_id"]]["notiz"] = row["notiz"] or ""
 
-        # Termine
+    return {"fahrzeuge": fahrzeuge, "schaeden": schaeden}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SUCHTEXTE – für den Filter der Fahrzeugliste
+# ══════════════════════════════════════════════════════════════════════════════
+
+@gecacht("fahrzeug_status", "fahrzeug_schaeden", "fahrzeug_termine")
+def lade_fahrzeug_suchtexte() -> dict[int, dict[str, str]]:
+    """
+    Durchsuchbare Texte aller Fahrzeuge, je eine gruppierte Abfrage:
+    {fahrzeug_id: {'schaeden': ..., 'termine': ..., 'historie': ...}}
+    (Kleinbuchstaben, Einträge durch Zeilenumbruch getrennt)
+    """
+    texte: dict[int, dict[str, str]] = {}
+    abfragen = {
+        "schaeden": """
+            SELECT fahrzeug_id,
+                   group_concat(COALESCE(beschreibung,'') || ' ' || COALESCE(kommentar,'')
+                                || ' ' || COALESCE(schwere,''), char(10)) AS text
+            FROM fahrzeug_schaeden GROUP BY fahrzeug_id
+        """,
+        "termine": """
+            SELECT fahrzeug_id,
+                   group_concat(COALESCE(typ,'') || ' ' || COALESCE(titel,'')
+                                || ' ' || COALESCE(beschreibung,''), char(10)) AS text
+            FROM fahrzeug_termine GROUP BY fahrzeug_id
+        """,
+        "historie": """
+            SELECT fahrzeug_id, group_concat(text, char(10)) AS text FROM (
+                SELECT fahrzeug_id, COALESCE(status,'') || ' ' || COALESCE(grund,'')
+                                    || ' ' || COALESCE(von,'') AS text
+                FROM fahrzeug_status
+                UNION ALL
+                SELECT fahrzeug_id, COALESCE(beschreibung,'') || ' ' || COALESCE(schwere,'')
+                                    || ' ' || COALESCE(datum,'')
+                FROM fahrzeug_schaeden
+                UNION ALL
+                SELECT fahrzeug_id, COALESCE(titel,'') || ' ' || COALESCE(typ,'')
+                                    || ' ' || COALESCE(datum,'')
+                FROM fahrzeug_termine
+            ) GROUP BY fahrzeug_id
+        """,
+    }
+    with db_cursor() as cur:
+        for bereich, sql in abfragen.items():
+            cur.execute(sql)
+            for row in cur.fetchall():
+                texte.setdefault(row["fahrzeug_id"], {})[bereich] = (row["text"] or "").lower()
+    return texte
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  HISTORIE – kombiniert alle Einträge eines Fahrzeugs
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Einheitliche Spalten je Ereignisart; die Filter auf fahrzeug_id/datum
+# stehen in jedem Teil, damit die Indizes (fahrzeug_id, datum/von) greifen.
+_HISTORIE_TEILE = {
+    "status": """
+        SELECT 'status' AS art, id, von AS datum,
+               status AS titel,
+               grund AS beschreibung,
+               bis, '' AS kommentar,
+               COALESCE(erstellt_am, '') AS erstellt_am
+        FROM fahrzeug_status WHERE fahrzeug_id = :fid {filter}
+    """,
+    "schaden": """
+        SELECT 'schaden' AS art, id, datum,
+               beschreibung AS titel,
+               schwere AS beschreibung,
+               CASE behoben WHEN 1 THEN behoben_am ELSE '' END AS bis,
+               kommentar,
+               COALESCE(erstellt_am, '') AS erstellt_am
+        FROM fahrzeug_schaeden WHERE fahrzeug_id = :fid {filter}
+    """,
+    "termin": """
+        SELECT 'termin' AS art, id, datum,
+               titel,
+               typ AS beschreibung,
+               CASE erledigt WHEN 1 THEN datum ELSE '' END AS bis,
+               kommentar,
+               COALESCE(erstellt_am, '') AS erstellt_am
+        FROM fahrzeug_termine WHERE fahrzeug_id = :fid {filter}
+    """,
+}
+HISTORIE_ARTEN = tuple(_HISTORIE_TEILE)
+
+
+@gecacht("fahrzeug_status", "fahrzeug_schaeden", "fahrzeug_termine")
+def lade_historie_seite(
+    fahrzeug_id: int,
+    nach:   tuple | None = None,
+    limit:  int | None = 100,
+    von:    str | None = None,
+    bis:    str | None = None,
+    monat:  int | None = None,
+    arten:  tuple | None = None,
+) -> list[dict]:
+    """
+    Eine Seite der Fahrzeug-Historie (Status, Schäden, Termine), neueste zuerst.
+    Sortierung: datum, erstellt_am, art, id – jeweils absteigend.
+
+    nach   – Cursor der letzten Zeile der vorigen Seite (historie_cursor()),
+             None = erste Seite
+    limit  – Seitengröße, None = alle
+    von/bis – halboffener ISO-Bereich [von, bis) auf datum
+    monat  – nur Einträge dieses Monats (jahresübergreifend)
+    arten  – Tupel aus HISTORIE_ARTEN, None = alle
+    """
+    filter_teile: list[str] = []
+    params: dict = {"fid": fahrzeug_id}
+    if von:
+        filter_teile.append("AND {datum} >= :von")
+        params["von"] = von
+    if bis:
+        filter_teile.append("AND {datum} < :bis")
+        params["bis"] = bis
+    if monat:
+        filter_teile.append("AND substr({datum}, 6, 2) = :monat")
+        params["monat"] = f"{monat:02d}"
+
+    teile = []
+    for art, sql in _HISTORIE_TEILE.items():
+        if arten is not None and art not in arten:
+            continue
+        datum = "von" if art == "status" else "datum"
+        teile.append(sql.format(filter=" ".join(filter_teile).format(datum=datum)))
+    if not teile:
+        return []
+
+    sql = "SELECT * FROM (" + " UNION ALL ".join(teile) + ")"
+    if nach is not None:
+        sql += " WHERE (datum, erstellt_am, art, id) < (:c_datum, :c_erstellt, :c_art, :c_id)"
+        params.update(zip(("c_datum", "c_erstellt", "c_art", "c_id"), nach))
+    sql += " ORDER BY datum DESC, erstellt_am DESC, art DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+
+    with db_cursor() as cur:
+        cur.execute(sql, params)
+        return cur.fetchall() or []
+
+
+def historie_cursor(eintrag: dict) -> tuple:
+    """Cursor für lade_historie_seite(nach=…) hinter `eintrag`."""
+    return (eintrag["datum"], eintrag["erstellt_am"], eintrag["art"], eintrag["id"])
+
+
+@gecacht("fahrzeug_status", "fahrzeug_schaeden", "fahrzeug_termine")
+def lade_historie_jahre(fahrzeug_id: int) -> list[str]:
+    """Alle Jahre (absteigend), in denen das Fahrzeug Historien-Einträge hat."""
+    with db_cursor() as cur:
         cur.execute("""
-            SELECT 'termin' AS art, datum,
-                   titel,
-                   typ AS beschreibung,
-                   CASE erledigt WHEN 1 THEN datum ELSE '' END AS bis,
-                   kommentar,
-                   erstellt_am
-            FROM fahrzeug_termine WHERE fahrzeug_id = ?
-        """, (fahrzeug_id,))
-        eintraege.extend(cur.fetchall() or [])
+            SELECT substr(von, 1, 4) AS jahr FROM fahrzeug_status WHERE fahrzeug_id = :fid
+            UNION
+            SELECT substr(datum, 1, 4) FROM fahrzeug_schaeden WHERE fahrzeug_id = :fid
+            UNION
+            SELECT substr(datum, 1, 4) FROM fahrzeug_termine WHERE fahrzeug_id = :fid
+            ORDER BY jahr DESC
+        """, {"fid": fahrzeug_id})
+        return [r["jahr"] for r in cur.fetchall() if r["jahr"] and len(r["jahr"]) == 4]
+
 
-    # Sortierung nach Datum absteigend
-    eintraege.sort(key=lambda x: (x.get("datum") or "", x.get("erstellt_am") or ""), reverse=True)
-    return eintraege
+def lade_komplette_historie(fahrzeug_id: int) -> list[dict]:
+    """
+    Gibt alle Ereignisse (Status, Schäden, Termine) eines Fahrzeugs
+    als einheitliche Liste zurück, neueste zuerst.
+    """
+    return lade_historie_seite(fahrzeug_id, limit=None)
@@ -7,6 +7,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.connection import db_cursor
+from database.lesecache import gecacht
 
 # ─── Portables Pfad-System ────────────────────────────────────────────────────
 # Pfade, die im gemeinsamen OneDrive-Ordner liegen, werden mit {SHARED}
@@ -60,16 +61,22 @@ def get_setting(key: str, default: str = '') -> str:
     Löst portable {SHARED}-Platzhalter auf.
     """
     try:
-        with db_cursor() as cur:
-            cur.execute("SELECT wert FROM settings WHERE schluessel = ?", (key,))
-            row = cur.fetchone()
-            if row:
-                return _from_stored(row['wert'])
+        wert = _gespeicherter_wert(key)
+        if wert is not None:
+            return _from_stored(wert)
     except Exception:
         pass
     return _get_defaults().get(key, default)
 
 
+@gecacht("settings")
+def _gespeicherter_wert(key: str) -> str | None:
+    with db_cursor() as cur:
+        cur.execute("SELECT wert FROM settings WHERE schluessel = ?", (key,))
+        row = cur.fetchone()
+        return row['wert'] if row else None
+
+
 def set_setting(key: str, value: str) -> bool:
     """
     Speichert *value* unter *key* (portabel: {SHARED}-Platzhalter).
@@ -90,13 +97,18 @@ def set_setting(key: str, value: str) -> bool:
 def get_alle_settings() -> dict[str, str]:
     """Gibt alle gespeicherten Einstellungen als dict zurück (Platzhalter aufgelöst)."""
     try:
-        with db_cursor() as cur:
-            cur.execute("SELECT schluessel, wert FROM settings")
-            return {row['schluessel']: _from_stored(row['wert']) for row in cur.fetchall()}
+        return {k: _from_stored(w) for k, w in _gespeicherte_werte().items()}
     except Exception:
         return {}
 
 
+@gecacht("settings")
+def _gespeicherte_werte() -> dict[str, str]:
+    with db_cursor() as cur:
+        cur.execute("SELECT schluessel, wert FROM settings")
+        return {row['schluessel']: row['wert'] for row in cur.fetchall()}
+
+
 # ---------------------------------------------------------------------------
 # Ausschluss-Liste für Word-Export
 # ---------------------------------------------------------------------------
@@ -116,9 +128,17 @@ def set_ausgeschlossene_namen(namen: list[str]) -> bool:
     """Setzt die Ausschlussliste komplett neu."""
     try:
         bereinigt = list({n.lower().strip() for n in namen if n.strip()})
-        return set_setting('export_ausgeschlossen', _json.dumps(bereinigt))
+        ok = set_setting('export_ausgeschlossen', _json.dumps(bereinigt))
     except Exception:
         return False
+    if ok:
+        # Gecachte Dienstplan-Exportansichten hängen von dieser Liste ab
+        try:
+            from functions.dienstplan_cache import ausschluss_geaendert
+            ausschluss_geaendert()
+        except Exception:
+            pass
+    return ok
 
 
 def toggle_ausgeschlossener_name(vollname: str) -> bool:
@@ -4,12 +4,17 @@ Speichert Metadaten zu erstellten Stellungnahmen – keine Word-Inhalte,
 nur Verweise auf die Dateien und durchsuchbare Felder.
 """
 import os
+import sys
 import sqlite3
 from datetime import datetime
-from contextlib import contextmanager
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+sys.path.insert(0, BASE_DIR)
+from database.registry import registriere, verbindung
+from database.datum_sql import iso_datum_spalte, zeitraum, zeitraum_filter
+from database.fts_sql import fts_schema, such_filter
+
 DB_ORDNER = os.path.join(BASE_DIR, "database SQL")
 DB_PFAD   = os.path.join(DB_ORDNER, "stellungnahmen.db")
 
@@ -47,33 +52,24 @@ _ART_LABEL = {
 #  Internes Datenbankmanagement
 # ──────────────────────────────────────────────────────────────────────────────
 
-def _ensured_db() -> str:
-    """Stellt sicher, dass der DB-Ordner existiert und das Schema angelegt ist."""
-    os.makedirs(DB_ORDNER, exist_ok=True)
-    con = sqlite3.connect(DB_PFAD, timeout=5)
-    con.execute("PRAGMA journal_mode = WAL")
-    con.execute("PRAGMA synchronous  = NORMAL")
-    con.execute("PRAGMA busy_timeout  = 5000")
-    con.execute(_CREATE_SQL)
-    con.commit()
-    con.close()
-    return DB_PFAD
+# v2: sortierbares ISO-Datum des Vorfalls + Indizes für Zeitraum-/Art-Filter
+_V2_ISO_DATUM = iso_datum_spalte("stellungnahmen", "datum_vorfall") + """
+CREATE INDEX IF NOT EXISTS idx_stellungnahmen_iso     ON stellungnahmen(iso_datum);
+CREATE INDEX IF NOT EXISTS idx_stellungnahmen_art_iso ON stellungnahmen(art, iso_datum);
+"""
+
+# v3: Volltextsuche für das Suchfeld
+_V3_FTS = fts_schema(
+    "stellungnahmen", ["mitarbeiter", "flugnummer", "sachverhalt", "beschwerde_text"]
+)
+
+registriere("stellungnahmen", DB_PFAD, [_CREATE_SQL, _V2_ISO_DATUM, _V3_FTS],
+            row_factory=sqlite3.Row)
 
 
-@contextmanager
 def _db():
-    """Context-Manager: liefert eine Row-Factory-Connection."""
-    _ensured_db()
-    con = sqlite3.connect(DB_PFAD, timeout=5)
-    con.execute("PRAGMA journal_mode = WAL")
-    con.execute("PRAGMA synchronous  = NORMAL")
-    con.execute("PRAGMA busy_timeout  = 5000")
-    con.row_factory = sqlite3.Row
-    try:
-        yield con
-        con.commit()
-    finally:
-        con.close()
+    """Context-Manager: liefert die Row-Factory-Connection aus dem DB-Register."""
+    return verbindung("stellungnahmen", commit=True)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -155,34 +151,32 @@ def lade_alle(
     """
     Gibt Stellungnahmen gefiltert zurück (alle Parameter optional).
     Ergebnis: Liste von dicts mit allen Spalten + 'art_label'.
-    Sortierung: neueste zuerst (datum_vorfall DESC, id DESC).
+    Sortierung: neueste zuerst (datum_vorfall DESC, id DESC),
+    mit Suchtext zuerst nach Relevanz (Volltextsuche, Wort-Präfixe).
     """
     where_parts: list[str] = []
     params: list = []
 
-    # Monat/Jahr-Filter auf datum_vorfall (Format dd.MM.yyyy)
-    if monat is not None:
-        where_parts.append("substr(datum_vorfall, 4, 2) = ?")
-        params.append(f"{monat:02d}")
-    if jahr is not None:
-        where_parts.append("substr(datum_vorfall, 7, 4) = ?")
-        params.append(str(jahr))
+    # Monat/Jahr-Filter als Bereich auf iso_datum (indexfähig)
+    zeitraum_filter(where_parts, params, jahr, monat)
     if art:
         where_parts.append("art = ?")
         params.append(art)
-    if suchtext:
-        term = f"%{suchtext}%"
-        where_parts.append(
-            "(mitarbeiter LIKE ? OR flugnummer LIKE ? OR sachverhalt LIKE ?"
-            " OR beschwerde_text LIKE ?)"
-        )
-        params.extend([term, term, term, term])
-
-    sql = "SELECT * FROM stellungnahmen"
+    # Flugnummern-Teile ("123" → "LH123") zusätzlich per LIKE
+    match, such_teile, such_params = such_filter(
+        suchtext, "stellungnahmen_fts", "s.id", ("s.flugnummer",)
+    )
+
+    sql = "SELECT s.* FROM stellungnahmen s"
+    if match:
+        sql += " JOIN stellungnahmen_fts f ON f.rowid = s.id"
+        where_parts.append("stellungnahmen_fts MATCH ?")
+        params.append(match)
+    where_parts += such_teile
+    params += such_params
     if where_parts:
         sql += " WHERE " + " AND ".join(where_parts)
-    sql += " ORDER BY substr(datum_vorfall,7,4)||substr(datum_vorfall,4,2)"
-    sql += "||substr(datum_vorfall,1,2) DESC, id DESC"
+    sql += " ORDER BY " + ("f.rank, " if match else "") + "s.iso_datum DESC, s.id DESC"
 
     with _db() as con:
         rows = con.execute(sql, params).fetchall()
@@ -199,8 +193,8 @@ def verfuegbare_jahre() -> list[int]:
     """Gibt alle Jahre zurück, für die Einträge existieren (absteigend)."""
     with _db() as con:
         rows = con.execute(
-            "SELECT DISTINCT substr(datum_vorfall,7,4) AS j FROM stellungnahmen"
-            " WHERE length(datum_vorfall)=10 ORDER BY j DESC"
+            "SELECT DISTINCT substr(iso_datum,1,4) AS j FROM stellungnahmen"
+            " WHERE iso_datum IS NOT NULL ORDER BY j DESC"
         ).fetchall()
     jahre = []
     for r in rows:
@@ -215,9 +209,9 @@ def verfuegbare_monate(jahr: int) -> list[int]:
     """Gibt alle Monate zurück, in denen im gegebenen Jahr Einträge existieren."""
     with _db() as con:
         rows = con.execute(
-            "SELECT DISTINCT substr(datum_vorfall,4,2) AS m FROM stellungnahmen"
-            " WHERE substr(datum_vorfall,7,4)=? ORDER BY m",
-            (str(jahr),),
+            "SELECT DISTINCT substr(iso_datum,6,2) AS m FROM stellungnahmen"
+            " WHERE iso_datum >= ? AND iso_datum < ? ORDER BY m",
+            zeitraum(jahr),
         ).fetchall()
     monate = []
     for r in rows:
@@ -0,0 +1,414 @@
+"""
+Globaler Suchindex (Schnellsuche Strg+K)
+Ein gemeinsamer FTS5-Index in einer eigenen SQLite-Datei (suchindex.db)
+über Datensätze aller Module (Übergabeprotokolle, Fahrzeugschäden,
+Stellungnahmen, Einsätze, Verspätungen) und über Dokumente in den
+Ablageordnern (Text aus .docx / .txt / .xlsx, sonst nur der Dateiname).
+
+Der Index wird inkrementell aktualisiert: Dateien anhand von mtime/Größe,
+Datensätze anhand eines Inhalts-Hashes – unveränderte Einträge werden
+nicht neu geschrieben. starte_hintergrund() aktualisiert ihn periodisch
+in einem Hintergrund-Thread.
+"""
+import hashlib
+import html
+import os
+import re
+import sys
+import threading
+import unicodedata
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BASE_DIR, SUCHINDEX_DB_PATH
+from database.connection import _row_factory, schliesse_thread_verbindung
+from database.registry import registriere, verbindung
+from database.fts_sql import match_ausdruck
+
+
+_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS eintraege (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    schluessel  TEXT    NOT NULL UNIQUE,       -- bereich:id bzw. bereich:dateipfad
+    bereich     TEXT    NOT NULL,
+    titel       TEXT    NOT NULL,
+    untertitel  TEXT    DEFAULT '',
+    ziel        TEXT    DEFAULT '',            -- Dateipfad bzw. Datensatz-ID
+    seite       INTEGER,                       -- Seite im Hauptfenster (NAV_ITEMS)
+    stand       TEXT    NOT NULL               -- mtime_ns:groesse bzw. Inhalts-Hash
+);
+CREATE INDEX IF NOT EXISTS idx_eintraege_bereich ON eintraege(bereich);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS eintraege_fts USING fts5(
+    titel, inhalt,
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+"""
+
+registriere('suchindex', SUCHINDEX_DB_PATH, [_CREATE_SQL], row_factory=_row_factory)
+
+# Anzeigenamen der Bereiche (für die Trefferliste)
+BEREICH_LABEL = {
+    "uebergabe":           "📋 Übergabe",
+    "schaden":             "🚗 Fahrzeugschaden",
+    "stellungnahme":       "📝 Stellungnahme",
+    "verspaetung":         "⏰ Verspätung",
+    "einsatz":             "🚑 Einsatz",
+    "mitarbeiterdokument": "👥 Mitarbeiterdokument",
+    "vordruck":            "🖨️ Vordruck",
+    "krankmeldung":        "🤒 Krankmeldung",
+    "drucksache":          "📄 Drucksache",
+    "dienstplan":          "📅 Dienstplan",
+}
+
+# Datensatz-Quellen: (bereich, datenbank, seite, sql)
+# SQL liefert id, titel, untertitel und beliebig viele Textspalten (→ Inhalt).
+_DB_QUELLEN = [
+    ("uebergabe", "nesk3", 6, """
+        SELECT id, 'Übergabe ' || datum || ' – ' || schicht_typ, ersteller,
+               personal, ereignisse, massnahmen, uebergabe_notiz, abzeichner
+        FROM uebergabe_protokolle
+    """),
+    ("schaden", "nesk3", 7, """
+        SELECT s.id, 'Schaden ' || COALESCE(f.kennzeichen, '') || ' – ' || s.datum,
+               s.schwere, s.beschreibung, s.kommentar
+        FROM fahrzeug_schaeden s
+        LEFT JOIN fahrzeuge f ON f.id = s.fahrzeug_id
+    """),
+    ("stellungnahme", "stellungnahmen", 1, """
+        SELECT id, 'Stellungnahme ' || mitarbeiter || ' – ' || datum_vorfall, art,
+               mitarbeiter, flugnummer, sachverhalt, beschwerde_text
+        FROM stellungnahmen
+    """),
+    ("verspaetung", "verspaetungen", 1, """
+        SELECT id, 'Verspätung ' || mitarbeiter || ' – ' || datum, dienst,
+               mitarbeiter, begruendung, aufgenommen_von
+        FROM verspaetungen
+    """),
+    ("einsatz", "einsaetze", 2, """
+        SELECT id, 'Einsatz ' || einsatzstichwort || ' – ' || datum, einsatzort,
+               einsatzstichwort, einsatzort, drk_ma1, drk_ma2, einsatznr_drk, bemerkung
+        FROM einsaetze
+    """),
+]
+
+_DATEI_ENDUNGEN = {".docx", ".doc", ".txt", ".xlsx", ".xlsm", ".pdf"}
+_MAX_TEXT = 100_000          # Zeichen Dokumenttext je Datei
+_INTERVALL = 300             # Sekunden zwischen zwei Hintergrund-Läufen
+
+
+def _ordner_quellen() -> list[tuple[str, str, int | None, bool]]:
+    """Ablageordner: (bereich, pfad, seite, mit Unterordnern)."""
+    from functions.mitarbeiter_dokumente_functions import DOKUMENTE_BASIS
+    from functions.settings_functions import get_setting
+    quellen = [
+        ("mitarbeiterdokument", DOKUMENTE_BASIS, 1, True),
+        ("vordruck", os.path.join(BASE_DIR, "Daten", "Vordrucke"), 9, False),
+        ("krankmeldung", os.path.join(
+            os.path.dirname(os.path.dirname(BASE_DIR)), "03_Krankmeldungen"), 10, True),
+        ("drucksache", os.path.join(BASE_DIR, "Daten", "Drucksachen"), None, True),
+    ]
+    dienstplan_ordner = get_setting('dienstplan_ordner')
+    if dienstplan_ordner:
+        quellen.append(("dienstplan", dienstplan_ordner, 5, True))
+    return quellen
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Suche
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Kürzere Eingaben treffen fast jeden Eintrag – erst ab dieser Länge suchen
+MIN_ZEICHEN = 3
+# Höchstens so viele (die neuesten) Treffer werden nach Relevanz sortiert
+_MAX_KANDIDATEN = 2000
+
+
+def suche(suchtext: str, limit: int = 30) -> list[dict]:
+    """
+    Durchsucht den Index (Wort-Präfixe, alle Wörter müssen vorkommen).
+    Treffer im Titel zählen stärker als im Inhalt. Eingaben mit weniger als
+    MIN_ZEICHEN Buchstaben/Ziffern liefern keine Treffer; bei sehr vielen
+    Treffern werden nur die neuesten _MAX_KANDIDATEN bewertet.
+    Ergebnis: dicts mit bereich, titel, untertitel, ziel, seite, auszug.
+    """
+    woerter = re.findall(r"\w+", suchtext or "")
+    match = match_ausdruck(suchtext)
+    if not match or sum(len(w) for w in woerter) < MIN_ZEICHEN:
+        return []
+    with verbindung('suchindex') as conn:
+        treffer = conn.execute(
+            """
+            SELECT e.bereich, e.titel, e.untertitel, e.ziel, e.seite,
+                   f.inhalt AS auszug
+            FROM (
+                SELECT id, rang FROM (
+                    SELECT rowid AS id, bm25(eintraege_fts, 8.0, 1.0) AS rang
+                    FROM eintraege_fts
+                    WHERE eintraege_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                )
+                ORDER BY rang
+                LIMIT ?
+            ) k
+            JOIN eintraege e ON e.id = k.id
+            JOIN eintraege_fts f ON f.rowid = k.id
+            ORDER BY k.rang
+            """,
+            (match, _MAX_KANDIDATEN, limit),
+        ).fetchall()
+    # Auszug nur für die angezeigten Treffer (snippet() bräuchte einen
+    # zweiten MATCH über alle Präfix-Treffer)
+    for t in treffer:
+        t["auszug"] = _auszug(t["auszug"] or "", woerter)
+    return treffer
+
+
+def _ohne_akzente(text: str) -> str:
+    return "".join(
+        z for z in unicodedata.normalize("NFKD", text.lower())
+        if not unicodedata.combining(z)
+    )
+
+
+def _auszug(inhalt: str, woerter: list[str], umfang: int = 10) -> str:
+    """Bis zu `umfang` Wörter um das erste Wort, das mit einem Suchwort beginnt."""
+    token = inhalt.split()
+    if not token:
+        return ""
+    praefixe = tuple(_ohne_akzente(w) for w in woerter)
+    start = 0
+    for i, t in enumerate(token):
+        if _ohne_akzente(t).lstrip("\"'([{„").startswith(praefixe):
+            start = max(0, i - umfang // 2)
+            break
+    ende = start + umfang
+    return (
+        ("… " if start else "")
+        + " ".join(token[start:ende])
+        + (" …" if ende < len(token) else "")
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Indexierung
+# ──────────────────────────────────────────────────────────────────────────────
+
+def aktualisiere() -> dict:
+    """
+    Gleicht den Index mit allen Quellen ab (nur Änderungen werden geschrieben).
+    Gibt je Bereich die Anzahl neuer/geänderter/entfernter Einträge zurück.
+    """
+    statistik = {}
+    for bereich, datenbank, seite, sql in _DB_QUELLEN:
+        try:
+            statistik[bereich] = _abgleichen(bereich, _datensaetze(bereich, datenbank, seite, sql))
+        except Exception as e:
+            print(f"[Suchindex] {bereich}: {e}")
+    for bereich, pfad, seite, rekursiv in _ordner_quellen():
+        try:
+            statistik[bereich] = _abgleichen(bereich, _dateien(bereich, pfad, seite, rekursiv))
+        except Exception as e:
+            print(f"[Suchindex] {bereich}: {e}")
+    return statistik
+
+
+def _datensaetze(bereich: str, datenbank: str, seite: int, sql: str) -> dict:
+    """Liefert {schluessel: (stand, eintrag_fn)} für alle Zeilen einer DB-Quelle."""
+    with verbindung(datenbank) as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        zeilen = cur.execute(sql).fetchall()
+
+    ergebnis = {}
+    for zeile in zeilen:
+        rid, titel, untertitel = zeile[0], zeile[1] or "", zeile[2] or ""
+        inhalt = "\n".join(str(t) for t in zeile[3:] if t)
+        stand = hashlib.sha1(f"{titel}\x00{untertitel}\x00{inhalt}".encode("utf-8")).hexdigest()
+        eintrag = {
+            "titel": titel, "untertitel": untertitel, "inhalt": inhalt,
+            "ziel": str(rid), "seite": seite,
+        }
+        ergebnis[f"{bereich}:{rid}"] = (stand, lambda e=eintrag: e)
+    return ergebnis
+
+
+def _dateien(bereich: str, ordner: str, seite: int | None, rekursiv: bool) -> dict:
+    """Liefert {schluessel: (stand, eintrag_fn)} für alle Dokumente eines Ordners."""
+    ergebnis = {}
+    if not ordner or not os.path.isdir(ordner):
+        return ergebnis
+    for wurzel, unterordner, namen in os.walk(ordner):
+        if not rekursiv:
+            unterordner.clear()
+        for name in namen:
+            endung = os.path.splitext(name)[1].lower()
+            if endung not in _DATEI_ENDUNGEN or name.startswith("~$"):
+                continue
+            pfad = os.path.join(wurzel, name)
+            try:
+                st = os.stat(pfad)
+            except OSError:
+                continue
+            stand = f"{st.st_mtime_ns}:{st.st_size}"
+            rel = os.path.relpath(wurzel, ordner)
+            eintrag_fn = lambda p=pfad, n=name, r=rel: {
+                "titel": os.path.splitext(n)[0],
+                "untertitel": "" if r == "." else r,
+                "inhalt": _dokument_text(p),
+                "ziel": p, "seite": seite,
+            }
+            ergebnis[f"{bereich}:{os.path.normcase(pfad)}"] = (stand, eintrag_fn)
+    return ergebnis
+
+
+def _abgleichen(bereich: str, aktuell: dict) -> dict:
+    """Schreibt neue/geänderte Einträge eines Bereichs und entfernt verschwundene."""
+    with verbindung('suchindex') as conn:
+        bekannt = {
+            r["schluessel"]: (r["id"], r["stand"])
+            for r in conn.execute(
+                "SELECT id, schluessel, stand FROM eintraege WHERE bereich = ?", (bereich,)
+            ).fetchall()
+        }
+
+    # Texte außerhalb der Schreibtransaktion erzeugen (Dokumente lesen dauert)
+    geaendert = [
+        (schluessel, stand, eintrag_fn())
+        for schluessel, (stand, eintrag_fn) in aktuell.items()
+        if bekannt.get(schluessel, (None, None))[1] != stand
+    ]
+    entfernt = [bekannt[s][0] for s in bekannt.keys() - aktuell.keys()]
+    if not geaendert and not entfernt:
+        return {"geaendert": 0, "entfernt": 0}
+
+    with verbindung('suchindex', commit=True) as conn:
+        for eid in entfernt:
+            conn.execute("DELETE FROM eintraege WHERE id = ?", (eid,))
+            conn.execute("DELETE FROM eintraege_fts WHERE rowid = ?", (eid,))
+        for schluessel, stand, e in geaendert:
+            alt = bekannt.get(schluessel)
+            if alt:
+                eid = alt[0]
+                conn.execute(
+                    "UPDATE eintraege SET titel=?, untertitel=?, ziel=?, seite=?, stand=?"
+                    " WHERE id=?",
+                    (e["titel"], e["untertitel"], e["ziel"], e["seite"], stand, eid),
+                )
+                conn.execute("DELETE FROM eintraege_fts WHERE rowid = ?", (eid,))
+            else:
+                eid = conn.execute(
+                    "INSERT INTO eintraege (schluessel, bereich, titel, untertitel, ziel, seite, stand)"
+                    " VALUES (?,?,?,?,?,?,?)",
+                    (schluessel, bereich, e["titel"], e["untertitel"], e["ziel"], e["seite"], stand),
+                ).lastrowid
+            conn.execute(
+                "INSERT INTO eintraege_fts (rowid, titel, inhalt) VALUES (?,?,?)",
+                (eid, f"{e['titel']} {e['untertitel']}", e["inhalt"]),
+            )
+    return {"geaendert": len(geaendert), "entfernt": len(entfernt)}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Dokumenttext
+# ──────────────────────────────────────────────────────────────────────────────
+
+_RE_DOCX_TEXT = re.compile(r"<w:t(?:\s[^>]*)?>([^<]*)</w:t>|</w:p>")
+_RE_XLSX_TEXT = re.compile(r"<t(?:\s[^>]*)?>([^<]*)</t>")
+
+
+def _dokument_text(pfad: str) -> str:
+    """Text eines Dokuments (docx/txt/xlsx), sonst ''. Fehler → ''."""
+    endung = os.path.splitext(pfad)[1].lower()
+    try:
+        if endung == ".docx":
+            text = _text_docx(pfad)
+        elif endung in (".xlsx", ".xlsm"):
+            text = _text_xlsx(pfad)
+        elif endung == ".txt":
+            text = _text_txt(pfad)
+        else:
+            return ""
+    except Exception:
+        return ""
+    return text[:_MAX_TEXT]
+
+
+def _text_docx(pfad: str) -> str:
+    """Absatztexte aus word/document.xml (ohne python-docx, nur zipfile)."""
+    with zipfile.ZipFile(pfad) as z:
+        xml = z.read("word/document.xml").decode("utf-8", "replace")
+    teile = []
+    for m in _RE_DOCX_TEXT.finditer(xml):
+        teile.append(m.group(1) if m.group(1) is not None else "\n")
+    return html.unescape("".join(teile))
+
+
+def _text_xlsx(pfad: str) -> str:
+    """Zelltexte aus sharedStrings.xml und Inline-Strings der Blätter."""
+    teile = []
+    with zipfile.ZipFile(pfad) as z:
+        for name in z.namelist():
+            if name == "xl/sharedStrings.xml" or (
+                name.startswith("xl/worksheets/sheet") and name.endswith(".xml")
+            ):
+                xml = z.read(name).decode("utf-8", "replace")
+                teile.extend(_RE_XLSX_TEXT.findall(xml))
+                if sum(map(len, teile)) > _MAX_TEXT:
+                    break
+    return html.unescape("\n".join(teile))
+
+
+def _text_txt(pfad: str) -> str:
+    with open(pfad, "rb") as f:
+        daten = f.read(_MAX_TEXT * 2)
+    try:
+        return daten.decode("utf-8")
+    except UnicodeDecodeError:
+        return daten.decode("cp1252", "replace")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Hintergrund-Indexer
+# ──────────────────────────────────────────────────────────────────────────────
+
+_thread: threading.Thread | None = None
+_anstoss = threading.Event()
+_stopp   = threading.Event()
+
+
+def starte_hintergrund(intervall: float = _INTERVALL) -> None:
+    """Startet den Hintergrund-Indexer (einmal je Prozess; sofortiger erster Lauf)."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stopp.clear()
+    _thread = threading.Thread(
+        target=_hintergrund_schleife, args=(intervall,),
+        name="Suchindex", daemon=True,
+    )
+    _thread.start()
+
+
+def jetzt_aktualisieren() -> None:
+    """Stößt einen sofortigen Lauf des Hintergrund-Indexers an."""
+    _anstoss.set()
+
+
+def stoppe_hintergrund() -> None:
+    _stopp.set()
+    _anstoss.set()
+
+
+def _hintergrund_schleife(intervall: float) -> None:
+    while not _stopp.is_set():
+        try:
+            aktualisiere()
+        except Exception as e:
+            print(f"[Suchindex] Aktualisierung fehlgeschlagen: {e}")
+        finally:
+            # Keine Datei-Handles auf OneDrive offen halten, bis zum nächsten Lauf
+            schliesse_thread_verbindung()
+        _anstoss.wait(intervall)
+        _anstoss.clear()
@@ -4,9 +4,11 @@ CRUD-Operationen für Übergabeprotokolle (Tagdienst / Nachtdienst)
 """
 import os
 import sys
+from contextlib import contextmanager
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.connection import db_cursor
+from database.lesecache import gecacht
 
 
 # ── Erstellen ──────────────────────────────────────────────────────────────────
@@ -30,16 +32,28 @@ def erstelle_protokoll(
     Gibt die neue ID zurück.
     """
     with db_cursor(commit=True) as cur:
-        cur.execute("""
-            INSERT INTO uebergabe_protokolle
-                (datum, schicht_typ, beginn_zeit, ende_zeit,
-                 patienten_anzahl, personal, ereignisse, massnahmen,
-                 uebergabe_notiz, ersteller, handys_anzahl, handys_notiz)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (datum, schicht_typ, beginn_zeit, ende_zeit,
-              patienten_anzahl, personal, ereignisse, massnahmen,
-              uebergabe_notiz, ersteller, handys_anzahl, handys_notiz))
-        return cur.lastrowid
+        return _protokoll_einfuegen(
+            cur, datum, schicht_typ, beginn_zeit, ende_zeit,
+            patienten_anzahl, personal, ereignisse, massnahmen,
+            uebergabe_notiz, ersteller, handys_anzahl, handys_notiz,
+        )
+
+
+def _protokoll_einfuegen(
+    cur, datum, schicht_typ, beginn_zeit="", ende_zeit="",
+    patienten_anzahl=0, personal="", ereignisse="", massnahmen="",
+    uebergabe_notiz="", ersteller="", handys_anzahl=0, handys_notiz="",
+) -> int:
+    cur.execute("""
+        INSERT INTO uebergabe_protokolle
+            (datum, schicht_typ, beginn_zeit, ende_zeit,
+             patienten_anzahl, personal, ereignisse, massnahmen,
+             uebergabe_notiz, ersteller, handys_anzahl, handys_notiz)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (datum, schicht_typ, beginn_zeit, ende_zeit,
+          patienten_anzahl, personal, ereignisse, massnahmen,
+          uebergabe_notiz, ersteller, handys_anzahl, handys_notiz))
+    return cur.lastrowid
 
 
 # ── Aktualisieren ──────────────────────────────────────────────────────────────
@@ -61,30 +75,43 @@ def aktualisiere_protokoll(
 ) -> bool:
     """Aktualisiert ein vorhandenes Protokoll. Gibt True bei Erfolg zurück."""
     with db_cursor(commit=True) as cur:
-        cur.execute("""
-            UPDATE uebergabe_protokolle
-            SET beginn_zeit      = ?,
-                ende_zeit        = ?,
-                patienten_anzahl = ?,
-                personal         = ?,
-                ereignisse       = ?,
-                massnahmen       = ?,
-                uebergabe_notiz  = ?,
-                ersteller        = ?,
-                abzeichner       = ?,
-                status           = ?,
-                handys_anzahl    = ?,
-                handys_notiz     = ?
-            WHERE id = ?
-        """, (beginn_zeit, ende_zeit, patienten_anzahl, personal,
-              ereignisse, massnahmen, uebergabe_notiz,
-              ersteller, abzeichner, status,
-              handys_anzahl, handys_notiz, protokoll_id))
-        return cur.rowcount > 0
+        return _protokoll_aktualisieren(
+            cur, protokoll_id, beginn_zeit, ende_zeit, patienten_anzahl,
+            personal, ereignisse, massnahmen, uebergabe_notiz,
+            ersteller, abzeichner, status, handys_anzahl, handys_notiz,
+        )
+
+
+def _protokoll_aktualisieren(
+    cur, protokoll_id, beginn_zeit="", ende_zeit="", patienten_anzahl=0,
+    personal="", ereignisse="", massnahmen="", uebergabe_notiz="",
+    ersteller="", abzeichner="", status="offen", handys_anzahl=0, handys_notiz="",
+) -> bool:
+    cur.execute("""
+        UPDATE uebergabe_protokolle
+        SET beginn_zeit      = ?,
+            ende_zeit        = ?,
+            patienten_anzahl = ?,
+            personal         = ?,
+            ereignisse       = ?,
+            massnahmen       = ?,
+            uebergabe_notiz  = ?,
+            ersteller        = ?,
+            abzeichner       = ?,
+            status           = ?,
+            handys_anzahl    = ?,
+            handys_notiz     = ?
+        WHERE id = ?
+    """, (beginn_zeit, ende_zeit, patienten_anzahl, personal,
+          ereignisse, massnahmen, uebergabe_notiz,
+          ersteller, abzeichner, status,
+          handys_anzahl, handys_notiz, protokoll_id))
+    return cur.rowcount > 0
 
 
 # ── Laden ──────────────────────────────────────────────────────────────────────
 
+@gecacht("uebergabe_protokolle")
 def lade_protokolle(
     schicht_typ: str | None = None,
     limit:       int        = 60,
@@ -114,6 +141,7 @@ def lade_protokolle(
         return cur.fetchall() or []
 
 
+@gecacht("uebergabe_protokolle")
 def lade_protokoll_by_id(protokoll_id: int) -> dict | None:
     """Gibt ein einzelnes Protokoll anhand der ID zurück."""
     with db_cursor() as cur:
@@ -151,6 +179,7 @@ def schliesse_protokoll_ab(protokoll_id: int, abzeichner: str) -> bool:
 
 # ── Statistik ─────────────────────────────────────────────────────────────────
 
+@gecacht("uebergabe_protokolle")
 def protokoll_statistik() -> dict:
     """Gibt eine Übersicht über alle gespeicherten Protokolle zurück."""
     with db_cursor() as cur:
@@ -176,19 +205,26 @@ def speichere_fahrzeug_notizen(protokoll_id: int, notizen: dict) -> None:
     Leere Notizen werden nicht gespeichert.
     """
     with db_cursor(commit=True) as cur:
-        cur.execute(
-            "DELETE FROM uebergabe_fahrzeug_notizen WHERE protokoll_id = ?",
-            (protokoll_id,)
-        )
-        for fid, notiz in notizen.items():
-            if notiz and notiz.strip():
-                cur.execute("""
-                    INSERT INTO uebergabe_fahrzeug_notizen
-                        (protokoll_id, fahrzeug_id, notiz)
-                    VALUES (?, ?, ?)
-                """, (protokoll_id, fid, notiz.strip()))
-
-
+        _fahrzeug_notizen_schreiben(cur, protokoll_id, notizen)
+
+
+def _fahrzeug_notizen_schreiben(cur, protokoll_id: int, notizen: dict) -> None:
+    cur.execute(
+        "DELETE FROM uebergabe_fahrzeug_notizen WHERE protokoll_id = ?",
+        (protokoll_id,)
+    )
+    cur.executemany("""
+        INSERT INTO uebergabe_fahrzeug_notizen
+            (protokoll_id, fahrzeug_id, notiz)
+        VALUES (?, ?, ?)
+    """, [
+        (protokoll_id, fid, notiz.strip())
+        for fid, notiz in notizen.items()
+        if notiz and notiz.strip()
+    ])
+
+
+@gecacht("uebergabe_fahrzeug_notizen")
 def lade_fahrzeug_notizen(protokoll_id: int) -> dict:
     """
     Gibt Fahrzeug-Notizen für ein Protokoll zurück.
@@ -212,19 +248,26 @@ def speichere_handy_eintraege(protokoll_id: int, eintraege: list) -> None:
     eintraege: list of (geraet_nr: str, notiz: str)
     """
     with db_cursor(commit=True) as cur:
-        cur.execute(
-            "DELETE FROM uebergabe_handy_eintraege WHERE protokoll_id = ?",
-            (protokoll_id,)
-        )
-        for geraet_nr, notiz in eintraege:
-            if geraet_nr and geraet_nr.strip():
-                cur.execute("""
-                    INSERT INTO uebergabe_handy_eintraege
-                        (protokoll_id, geraet_nr, notiz)
-                    VALUES (?, ?, ?)
-                """, (protokoll_id, geraet_nr.strip(), notiz.strip() if notiz else ""))
-
-
+        _handy_eintraege_schreiben(cur, protokoll_id, eintraege)
+
+
+def _handy_eintraege_schreiben(cur, protokoll_id: int, eintraege: list) -> None:
+    cur.execute(
+        "DELETE FROM uebergabe_handy_eintraege WHERE protokoll_id = ?",
+        (protokoll_id,)
+    )
+    cur.executemany("""
+        INSERT INTO uebergabe_handy_eintraege
+            (protokoll_id, geraet_nr, notiz)
+        VALUES (?, ?, ?)
+    """, [
+        (protokoll_id, geraet_nr.strip(), notiz.strip() if notiz else "")
+        for geraet_nr, notiz in eintraege
+        if geraet_nr and geraet_nr.strip()
+    ])
+
+
+@gecacht("uebergabe_handy_eintraege")
 def lade_handy_eintraege(protokoll_id: int) -> list:
     """
     Gibt Handy-Einträge für ein Protokoll zurück.
@@ -240,6 +283,50 @@ def lade_handy_eintraege(protokoll_id: int) -> list:
         return cur.fetchall() or []
 
 
+# ── Gesamtes Protokoll speichern (eine Transaktion) ─────────────────────────────
+
+@contextmanager
+def uebergabe_transaktion():
+    """
+    Unit of Work für Übergabe-Speichervorgänge: liefert einen Cursor in einer
+    einzigen Schreib-Transaktion (BEGIN IMMEDIATE – die Schreibsperre wird vor
+    dem ersten Schreibzugriff geholt). Commit am Ende, bei Fehlern (z. B. von
+    OneDrive gesperrte Datei) Rollback – es bleibt kein halb gespeichertes
+    Protokoll zurück.
+
+    Verwendung:
+        with uebergabe_transaktion() as cur:
+            _protokoll_aktualisieren(cur, ...)
+            _fahrzeug_notizen_schreiben(cur, ...)
+    """
+    with db_cursor(commit=True) as cur:
+        cur.execute("BEGIN IMMEDIATE")
+        yield cur
+
+
+def speichere_uebergabe(
+    protokoll_id:     int | None,
+    felder:           dict,
+    fahrzeug_notizen: dict,
+    handy_eintraege:  list,
+) -> int:
+    """
+    Speichert Protokoll, Fahrzeug-Notizen und Handy-Einträge atomar.
+    protokoll_id=None legt ein neues Protokoll an (felder braucht dann
+    datum und schicht_typ), sonst wird das vorhandene aktualisiert.
+    felder: Schlüsselwörter wie bei erstelle_protokoll / aktualisiere_protokoll
+    Gibt die Protokoll-ID zurück.
+    """
+    with uebergabe_transaktion() as cur:
+        if protokoll_id is None:
+            protokoll_id = _protokoll_einfuegen(cur, **felder)
+        elif not _protokoll_aktualisieren(cur, protokoll_id, **felder):
+            raise ValueError(f"Protokoll #{protokoll_id} existiert nicht mehr.")
+        _fahrzeug_notizen_schreiben(cur, protokoll_id, fahrzeug_notizen)
+        _handy_eintraege_schreiben(cur, protokoll_id, handy_eintraege)
+    return protokoll_id
+
+
 # ── Bulk-Aktionen (Verwaltung) ────────────────────────────────────────────────────
 
 def lade_alle_protokolle_verwaltung(schicht_typ: str | None = None) -> list:
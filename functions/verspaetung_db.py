@@ -3,46 +3,54 @@ Verspätungs-Datenbank
 Protokollierung von Meldungen über unpünktlichen Dienstantritt.
 """
 import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(BASE_DIR))
+from database.registry import registriere, verbindung
+from database.datum_sql import iso_datum_spalte, zeitraum_filter
+from database.fts_sql import fts_schema, match_ausdruck
+
 _DB_PFAD = BASE_DIR / "database SQL" / "verspaetungen.db"
 
+_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS verspaetungen (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    erstellt_am      TEXT NOT NULL,
+    mitarbeiter      TEXT NOT NULL,
+    datum            TEXT NOT NULL,          -- dd.MM.yyyy
+    dienst           TEXT NOT NULL,          -- T | T10 | N | N10
+    dienstbeginn     TEXT NOT NULL,          -- HH:MM
+    dienstantritt    TEXT NOT NULL,          -- HH:MM
+    verspaetung_min  INTEGER,
+    begruendung      TEXT,
+    aufgenommen_von  TEXT,
+    dokument_pfad    TEXT
+)
+"""
 
-def _connect() -> sqlite3.Connection:
-    """Gibt eine Verbindung mit WAL-Modus und busy_timeout zurück."""
-    conn = sqlite3.connect(_DB_PFAD, timeout=5)
-    conn.execute("PRAGMA journal_mode = WAL")
-    conn.execute("PRAGMA synchronous  = NORMAL")
-    conn.execute("PRAGMA busy_timeout  = 5000")
-    return conn
+# v2: sortierbares ISO-Datum + Index für Zeitraum-Filter und Sortierung
+_V2_ISO_DATUM = iso_datum_spalte("verspaetungen") + """
+CREATE INDEX IF NOT EXISTS idx_verspaetungen_iso ON verspaetungen(iso_datum, erstellt_am);
+"""
 
+# v3: Volltextsuche für das Suchfeld
+_V3_FTS = fts_schema("verspaetungen", ["mitarbeiter", "begruendung", "aufgenommen_von"])
 
-def _init_db():
-    _DB_PFAD.parent.mkdir(parents=True, exist_ok=True)
-    with _connect() as conn:
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS verspaetungen (
-            id               INTEGER PRIMARY KEY AUTOINCREMENT,
-            erstellt_am      TEXT NOT NULL,
-            mitarbeiter      TEXT NOT NULL,
-            datum            TEXT NOT NULL,          -- dd.MM.yyyy
-            dienst           TEXT NOT NULL,          -- T | T10 | N | N10
-            dienstbeginn     TEXT NOT NULL,          -- HH:MM
-            dienstantritt    TEXT NOT NULL,          -- HH:MM
-            verspaetung_min  INTEGER,
-            begruendung      TEXT,
-            aufgenommen_von  TEXT,
-            dokument_pfad    TEXT
-        )
-        """)
-        conn.commit()
+registriere("verspaetungen", str(_DB_PFAD), [_CREATE_SQL, _V2_ISO_DATUM, _V3_FTS],
+            row_factory=sqlite3.Row)
+
+
+def _connect():
+    """Warme Verbindung aus dem DB-Register (WAL-Modus, Schema einmal je Prozess)."""
+    return verbindung("verspaetungen")
 
 
 def verspaetung_speichern(daten: dict) -> int:
     """Neuen Eintrag speichern, gibt die neue ID zurück."""
-    _init_db()
     now = datetime.now().isoformat(timespec="seconds")
     with _connect() as conn:
         cur = conn.execute(
@@ -71,7 +79,6 @@ def verspaetung_speichern(daten: dict) -> int:
 
 def verspaetung_aktualisieren(entry_id: int, daten: dict):
     """Bestehenden Eintrag aktualisieren."""
-    _init_db()
     with _connect() as conn:
         conn.execute(
             """
@@ -98,7 +105,6 @@ def verspaetung_aktualisieren(entry_id: int, daten: dict):
 
 def verspaetung_loeschen(entry_id: int):
     """Eintrag aus der Datenbank löschen."""
-    _init_db()
     with _connect() as conn:
         conn.execute("DELETE FROM verspaetungen WHERE id=?", (entry_id,))
         conn.commit()
@@ -109,32 +115,34 @@ def lade_verspaetungen(
     jahr: int | None = None,
     suchtext: str | None = None,
 ) -> list[dict]:
-    """Einträge laden; optionale Filterung nach Monat/Jahr/Suchtext."""
-    _init_db()
+    """
+    Einträge laden; optionale Filterung nach Monat/Jahr/Suchtext
+    (Volltextsuche mit Wort-Präfixen, Treffer nach Relevanz sortiert).
+    """
+    match = match_ausdruck(suchtext)
     with _connect() as conn:
-        conn.row_factory = sqlite3.Row
-        q = "SELECT * FROM verspaetungen WHERE 1=1"
+        q = "SELECT v.* FROM verspaetungen v"
+        if match:
+            q += " JOIN verspaetungen_fts f ON f.rowid = v.id"
+        q += " WHERE 1=1"
         params: list = []
-        if monat:
-            q += " AND substr(datum, 4, 2) = ?"
-            params.append(f"{monat:02d}")
-        if jahr:
-            q += " AND substr(datum, 7, 4) = ?"
-            params.append(str(jahr))
-        if suchtext:
-            q += " AND (mitarbeiter LIKE ? OR begruendung LIKE ? OR aufgenommen_von LIKE ?)"
-            params += [f"%{suchtext}%"] * 3
-        q += " ORDER BY datum DESC, erstellt_am DESC"
+        bedingungen: list[str] = []
+        zeitraum_filter(bedingungen, params, jahr, monat)
+        for b in bedingungen:
+            q += f" AND {b}"
+        if match:
+            q += " AND verspaetungen_fts MATCH ?"
+            params.append(match)
+        q += " ORDER BY " + ("f.rank, " if match else "") + "v.iso_datum DESC, v.erstellt_am DESC"
         rows = conn.execute(q, params).fetchall()
         return [dict(r) for r in rows]
 
 
 def verfuegbare_jahre() -> list[int]:
     """Liste aller Jahre mit Einträgen zurückgeben."""
-    _init_db()
     with _connect() as conn:
         rows = conn.execute(
-            "SELECT DISTINCT CAST(substr(datum, 7, 4) AS INTEGER) AS j "
-            "FROM verspaetungen WHERE length(datum) = 10 ORDER BY j DESC"
+            "SELECT DISTINCT CAST(substr(iso_datum, 1, 4) AS INTEGER) AS j "
+            "FROM verspaetungen WHERE iso_datum IS NOT NULL ORDER BY j DESC"
         ).fetchall()
         return [r[0] for r in rows if r[0]]
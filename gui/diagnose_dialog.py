@@ -0,0 +1,201 @@
+"""
+Diagnose-Dialog
+Zeigt die Abfrage-Messung (database/messung.py): Kennzahlen je
+SQL-Anweisung, langsame Abfragen, Query-Pläne und den Verbindungs-Pool,
+sowie Treffer/Fehlgriffe des Lese-Caches (database/lesecache.py).
+"""
+from __future__ import annotations
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QTextEdit, QSplitter, QDoubleSpinBox, QTabWidget, QWidget,
+)
+from PySide6.QtCore import Qt
+
+from config import FIORI_TEXT
+
+
+_SPALTEN = ["Anweisung", "Aufrufer", "Anzahl", "p50 ms", "p95 ms", "max ms", "Ø Zeilen", "Scan"]
+_CACHE_SPALTEN = ["Funktion", "Treffer", "Fehlgriffe", "Trefferquote %"]
+
+
+class DiagnoseDialog(QDialog):
+    """Gemessene Abfragen (mit Details zur gewählten Anweisung) und Lese-Cache."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🩺 Datenbank-Diagnose")
+        self.resize(1100, 640)
+        self._statistik: list[dict] = []
+
+        layout = QVBoxLayout(self)
+        tabs = QTabWidget()
+        layout.addWidget(tabs)
+
+        # ══ Tab 1: Abfragen ═══════════════════════════════════════════════
+        seite = QWidget()
+        tabs.addTab(seite, "⏱ Abfragen")
+        layout = QVBoxLayout(seite)
+
+        self._kopf = QLabel("")
+        self._kopf.setStyleSheet(f"color: {FIORI_TEXT}; font-size: 11px;")
+        self._kopf.setWordWrap(True)
+        layout.addWidget(self._kopf)
+
+        # ── Optionen ───────────────────────────────────────────────────────
+        opt_row = QHBoxLayout()
+        from database.messung import optionen
+        opt = optionen()
+        self._chk_plan = QCheckBox("EXPLAIN QUERY PLAN erfassen (Tabellen-Scans markieren)")
+        self._chk_plan.setChecked(opt['query_plan'])
+        self._chk_plan.toggled.connect(self._optionen_setzen)
+        opt_row.addWidget(self._chk_plan)
+        opt_row.addSpacing(20)
+        opt_row.addWidget(QLabel("Langsam ab:"))
+        self._spin_langsam = QDoubleSpinBox()
+        self._spin_langsam.setRange(1, 60000)
+        self._spin_langsam.setDecimals(0)
+        self._spin_langsam.setSuffix(" ms")
+        self._spin_langsam.setValue(opt['langsam_ms'])
+        self._spin_langsam.valueChanged.connect(self._optionen_setzen)
+        opt_row.addWidget(self._spin_langsam)
+        opt_row.addStretch()
+        btn_reset = QPushButton("🗑 Zurücksetzen")
+        btn_reset.clicked.connect(self._zuruecksetzen)
+        btn_neu = QPushButton("🔄 Aktualisieren")
+        btn_neu.clicked.connect(self._laden)
+        opt_row.addWidget(btn_reset)
+        opt_row.addWidget(btn_neu)
+        layout.addLayout(opt_row)
+
+        # ── Tabelle + Details ─────────────────────────────────────────────
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self._tabelle = QTableWidget(0, len(_SPALTEN))
+        self._tabelle.setHorizontalHeaderLabels(_SPALTEN)
+        self._tabelle.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._tabelle.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._tabelle.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self._tabelle.setSortingEnabled(True)
+        self._tabelle.verticalHeader().setVisible(False)
+        kopf = self._tabelle.horizontalHeader()
+        kopf.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for i in range(1, len(_SPALTEN)):
+            kopf.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+        self._tabelle.itemSelectionChanged.connect(self._details_zeigen)
+        splitter.addWidget(self._tabelle)
+
+        self._details = QTextEdit()
+        self._details.setReadOnly(True)
+        self._details.setStyleSheet("font-family: Consolas, monospace; font-size: 11px;")
+        splitter.addWidget(self._details)
+        splitter.setSizes([440, 160])
+        layout.addWidget(splitter, 1)
+
+        # ══ Tab 2: Lese-Cache ═════════════════════════════════════════════
+        seite = QWidget()
+        tabs.addTab(seite, "🗃 Lese-Cache")
+        layout = QVBoxLayout(seite)
+        cache_row = QHBoxLayout()
+        self._cache_kopf = QLabel("")
+        self._cache_kopf.setStyleSheet(f"color: {FIORI_TEXT}; font-size: 11px;")
+        cache_row.addWidget(self._cache_kopf, 1)
+        btn_cache_leeren = QPushButton("🗑 Cache leeren")
+        btn_cache_leeren.clicked.connect(self._cache_leeren)
+        btn_cache_neu = QPushButton("🔄 Aktualisieren")
+        btn_cache_neu.clicked.connect(self._cache_laden)
+        cache_row.addWidget(btn_cache_leeren)
+        cache_row.addWidget(btn_cache_neu)
+        layout.addLayout(cache_row)
+
+        self._cache_tabelle = QTableWidget(0, len(_CACHE_SPALTEN))
+        self._cache_tabelle.setHorizontalHeaderLabels(_CACHE_SPALTEN)
+        self._cache_tabelle.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._cache_tabelle.setSortingEnabled(True)
+        self._cache_tabelle.verticalHeader().setVisible(False)
+        kopf = self._cache_tabelle.horizontalHeader()
+        kopf.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for i in range(1, len(_CACHE_SPALTEN)):
+            kopf.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self._cache_tabelle, 1)
+
+        self._laden()
+        self._cache_laden()
+
+    def _laden(self):
+        from database.messung import statistik, log_pfad
+        from database.connection import pool_statistik
+        self._statistik = statistik()
+
+        self._tabelle.setSortingEnabled(False)
+        self._tabelle.setRowCount(len(self._statistik))
+        for zeile, e in enumerate(self._statistik):
+            werte = [
+                e["sql"], e["aufrufer"], e["anzahl"],
+                round(e["p50_ms"], 2), round(e["p95_ms"], 2), round(e["max_ms"], 2),
+                round(e["zeilen_schnitt"], 1), "⚠" if e["plan"] else "",
+            ]
+            for spalte, wert in enumerate(werte):
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, wert)
+                if spalte == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, zeile)
+                    item.setToolTip(e["sql"])
+                self._tabelle.setItem(zeile, spalte, item)
+        self._tabelle.setSortingEnabled(True)
+
+        pool = pool_statistik()
+        gesamt = sum(e["anzahl"] for e in self._statistik)
+        self._kopf.setText(
+            f"{len(self._statistik)} Anweisungen · {gesamt} Ausführungen  |  "
+            f"Pool: {pool['geoeffnet']} geöffnet, {pool['wiederverwendet']} wiederverwendet, "
+            f"{pool['verworfen']} verworfen  |  Log langsamer Abfragen: {log_pfad()}"
+        )
+        self._details.clear()
+
+    def _details_zeigen(self):
+        zeilen = self._tabelle.selectionModel().selectedRows(0)
+        if not zeilen:
+            return
+        idx = self._tabelle.item(zeilen[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+        e = self._statistik[idx]
+        text = [e["sql"], "", f"Aufrufer: {e['aufrufer']}"]
+        if e["plan"]:
+            text += ["", "Query-Plan:", e["plan"]]
+        self._details.setPlainText("\n".join(text))
+
+    def _optionen_setzen(self, *_):
+        from database.messung import setze_optionen
+        setze_optionen(langsam_ms=self._spin_langsam.value(),
+                       query_plan=self._chk_plan.isChecked())
+
+    def _zuruecksetzen(self):
+        from database.messung import zuruecksetzen
+        zuruecksetzen()
+        self._laden()
+
+    def _cache_laden(self):
+        from database.lesecache import statistik
+        st = statistik()
+        self._cache_tabelle.setSortingEnabled(False)
+        self._cache_tabelle.setRowCount(len(st["funktionen"]))
+        for zeile, e in enumerate(st["funktionen"]):
+            werte = [e["funktion"], e["treffer"], e["fehlgriffe"], round(e["quote"] * 100, 1)]
+            for spalte, wert in enumerate(werte):
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, wert)
+                self._cache_tabelle.setItem(zeile, spalte, item)
+        self._cache_tabelle.setSortingEnabled(True)
+        gesamt = st["treffer"] + st["fehlgriffe"]
+        quote = f"{st['treffer'] / gesamt * 100:.1f} %" if gesamt else "–"
+        self._cache_kopf.setText(
+            f"{st['treffer']} Treffer · {st['fehlgriffe']} Fehlgriffe · Quote {quote}  |  "
+            f"{st['eintraege']} Einträge · {st['globale_leerungen']}× vollständig geleert "
+            f"(Änderungen anderer PCs / Verbindungen)"
+        )
+
+    def _cache_leeren(self):
+        from database.lesecache import leeren, zaehler_zuruecksetzen
+        leeren()
+        zaehler_zuruecksetzen()
+        self._cache_laden()
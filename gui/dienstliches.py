@@ -5,7 +5,6 @@ Dienstliche Protokolle: Einsätze nach Einsatzstatistik-Vorlage FKB
 import os
 import sys
 import sqlite3
-from contextlib import contextmanager
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +21,9 @@ from PySide6.QtCore import Qt, QDate, QTime
 from PySide6.QtGui import QFont, QColor
 
 from config import FIORI_BLUE, FIORI_TEXT, BASE_DIR, FIORI_BORDER
+from database.registry import registriere, verbindung
+from database.datum_sql import iso_datum_spalte, zeitraum_filter
+from database.fts_sql import fts_schema, such_filter
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -51,31 +53,22 @@ CREATE TABLE IF NOT EXISTS einsaetze (
 """
 
 
-def _ensured_db() -> str:
-    os.makedirs(_EINSATZ_DB_DIR, exist_ok=True)
-    con = sqlite3.connect(_EINSATZ_DB_PFAD, timeout=5)
-    con.execute("PRAGMA journal_mode = WAL")
-    con.execute("PRAGMA synchronous  = NORMAL")
-    con.execute("PRAGMA busy_timeout  = 5000")
-    con.execute(_CREATE_SQL)
-    con.commit()
-    con.close()
-    return _EINSATZ_DB_PFAD
+# v2: sortierbares ISO-Datum + Index für Zeitraum-Filter und Sortierung
+_V2_ISO_DATUM = iso_datum_spalte("einsaetze") + """
+CREATE INDEX IF NOT EXISTS idx_einsaetze_iso ON einsaetze(iso_datum);
+"""
+
+# v3: Volltextsuche für das Suchfeld
+_V3_FTS = fts_schema(
+    "einsaetze", ["einsatzstichwort", "einsatzort", "drk_ma1", "drk_ma2", "einsatznr_drk"]
+)
+
+registriere("einsaetze", _EINSATZ_DB_PFAD, [_CREATE_SQL, _V2_ISO_DATUM, _V3_FTS],
+            row_factory=sqlite3.Row)
 
 
-@contextmanager
 def _db():
-    _ensured_db()
-    con = sqlite3.connect(_EINSATZ_DB_PFAD, timeout=5)
-    con.execute("PRAGMA journal_mode = WAL")
-    con.execute("PRAGMA synchronous  = NORMAL")
-    con.execute("PRAGMA busy_timeout  = 5000")
-    con.row_factory = sqlite3.Row
-    try:
-        yield con
-        con.commit()
-    finally:
-        con.close()
+    return verbindung("einsaetze", commit=True)
 
 
 def einsatz_speichern(daten: dict) -> int:
@@ -151,24 +144,23 @@ def lade_einsaetze(
 ) -> list[dict]:
     where_parts: list[str] = []
     params: list = []
-    if monat is not None:
-        where_parts.append("substr(datum,4,2)=?")
-        params.append(f"{monat:02d}")
-    if jahr is not None:
-        where_parts.append("substr(datum,7,4)=?")
-        params.append(str(jahr))
-    if suchtext:
-        t = f"%{suchtext}%"
-        where_parts.append(
-            "(einsatzstichwort LIKE ? OR einsatzort LIKE ? OR drk_ma1 LIKE ?"
-            " OR drk_ma2 LIKE ? OR einsatznr_drk LIKE ?)"
-        )
-        params.extend([t, t, t, t, t])
+    zeitraum_filter(where_parts, params, jahr, monat)
+    # Suchtext: Volltextsuche (Wort-Präfixe), Treffer nach Relevanz;
+    # Einsatznummern zusätzlich als Teilstring
+    match, such_teile, such_params = such_filter(
+        suchtext, "einsaetze_fts", "e.id", ("e.einsatznr_drk",)
+    )
 
-    sql = "SELECT * FROM einsaetze"
+    sql = "SELECT e.* FROM einsaetze e"
+    if match:
+        sql += " JOIN einsaetze_fts f ON f.rowid = e.id"
+        where_parts.append("einsaetze_fts MATCH ?")
+        params.append(match)
+    where_parts += such_teile
+    params += such_params
     if where_parts:
         sql += " WHERE " + " AND ".join(where_parts)
-    sql += " ORDER BY substr(datum,7,4)||substr(datum,4,2)||substr(datum,1,2) DESC, id DESC"
+    sql += " ORDER BY " + ("f.rank, " if match else "") + "e.iso_datum DESC, e.id DESC"
 
     with _db() as con:
         rows = con.execute(sql, params).fetchall()
@@ -178,8 +170,8 @@ def lade_einsaetze(
 def verfuegbare_jahre_einsaetze() -> list[int]:
     with _db() as con:
         rows = con.execute(
-            "SELECT DISTINCT substr(datum,7,4) AS j FROM einsaetze"
-            " WHERE length(datum)=10 ORDER BY j DESC"
+            "SELECT DISTINCT substr(iso_datum,1,4) AS j FROM einsaetze"
+            " WHERE iso_datum IS NOT NULL ORDER BY j DESC"
         ).fetchall()
     result = []
     for r in rows:
@@ -1523,6 +1515,9 @@ class _UebersichtTab(QWidget):
 class DienstlichesWidget(QWidget):
     """Haupt-Widget 'Dienstliches' mit Tabs für Einsätze und weitere Protokolle."""
 
+    # Änderungs-Monitor (database/aenderungen.py): refresh() nur bei Änderungen
+    ABO_DATENBANKEN = ("einsaetze",)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._build_ui()
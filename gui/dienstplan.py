@@ -5,19 +5,23 @@ Excel-Import und Word-Export (Stärkemeldung)
 """
 import os
 import sys
+import threading
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QDialog,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QDialog,
     QFormLayout, QComboBox, QDateEdit, QTimeEdit, QTextEdit,
     QMessageBox, QFileDialog, QSpinBox, QFrame,
     QTreeView, QSplitter, QFileSystemModel,
-    QScrollArea, QCheckBox
+    QScrollArea, QCheckBox, QProgressDialog
+)
+from PySide6.QtCore import (
+    Qt, QDate, QTime, QTimer, Signal, Slot, QFileSystemWatcher,
+    QObject, QRunnable, QThreadPool, QAbstractTableModel, QModelIndex,
 )
-from PySide6.QtCore import Qt, QDate, QTime, Signal, QFileSystemWatcher
 from PySide6.QtGui import QFont, QColor
 
 from config import FIORI_BLUE, FIORI_TEXT, FIORI_ERROR
@@ -141,6 +145,9 @@ _STANDARD_DIENSTE = frozenset({'N', 'N10', 'T', 'T10', 'DT', 'DT3', 'DN', 'DN3'}
 _TAG_DIENSTE   = frozenset({'T', 'T10', 'T8', 'DT', 'DT3'})
 _NACHT_DIENSTE = frozenset({'N', 'N10', 'NF', 'DN', 'DN3'})
 
+# Füllfarbe (AARRGGBB), mit der KRANK-Einträge in die Excel-Datei geschrieben werden
+_KRANK_FILL_RGB = 'FFFF0000'
+
 
 class ExportDialog(QDialog):
     """Dialog für Word-Export: Zeitraum, PAX-Zahl, Ausgabepfad, Sonderdienst-Filter."""
@@ -628,20 +635,427 @@ class _DispoZeitenVorschauDialog(QDialog):
         return self._data
 
 
+class _ParseSignale(QObject):
+    """Signale eines einzelnen Parse-Auftrags (werden aus dem Worker-Thread emittiert)."""
+    fortschritt = Signal(int, int)      # auftrag_id, gelesene Zeilen
+    fertig      = Signal(int, object)   # auftrag_id, Ergebnis-Dict
+    fehler      = Signal(int, str)      # auftrag_id, Fehlermeldung
+
+
+class _ParseAuftrag(QRunnable):
+    """Liest einen Dienstplan im Thread-Pool ein (über den Parse-Cache)."""
+
+    def __init__(self, auftrag_id: int, pfad: str, modus: str, signale: _ParseSignale):
+        super().__init__()
+        self._id      = auftrag_id
+        self._pfad    = pfad
+        self._modus   = modus          # 'alle' = alle Ansichten | 'display' = nur Anzeige
+        self._signale = signale
+        self._abbruch = threading.Event()
+
+    def abbrechen(self):
+        self._abbruch.set()
+
+    def run(self):
+        try:
+            from functions import dienstplan_cache
+            fortschritt = lambda n: self._signale.fortschritt.emit(self._id, n)
+            if self._modus == 'alle':
+                ergebnis = dienstplan_cache.parse_alle_ansichten(
+                    self._pfad, fortschritt=fortschritt, abbrechen=self._abbruch.is_set
+                )
+            else:
+                ergebnis = dienstplan_cache.parse(
+                    self._pfad, alle_anzeigen=True,
+                    fortschritt=fortschritt, abbrechen=self._abbruch.is_set
+                )
+        except Exception as e:
+            if not self._abbruch.is_set():
+                self._signale.fehler.emit(self._id, str(e))
+            return
+        # Abgebrochene Aufträge liefern kein Ergebnis mehr aus
+        if not self._abbruch.is_set():
+            self._signale.fertig.emit(self._id, ergebnis)
+
+
+class DienstplanParseService(QObject):
+    """
+    Liest Dienstpläne im Hintergrund (QThreadPool) ein, damit die GUI nicht einfriert.
+
+    Pro Schlüssel (z. B. Pane-Index) läuft höchstens ein Auftrag – ein neuer
+    Auftrag bricht den vorherigen ab. Ergebnisse, Fortschritt und Fehler
+    werden über Signale im GUI-Thread ausgeliefert.
+    """
+    fortschritt = Signal(object, int)      # schluessel, gelesene Zeilen
+    fertig      = Signal(object, str, object)  # schluessel, pfad, Ergebnis-Dict
+    fehler      = Signal(object, str, str)     # schluessel, pfad, Fehlermeldung
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool      = QThreadPool.globalInstance()
+        self._naechste  = 0
+        # auftrag_id → (schluessel, pfad, auftrag, signale)
+        self._auftraege: dict[int, tuple] = {}
+
+    def starte(self, schluessel, pfad: str, modus: str = 'alle') -> int:
+        """Startet einen Parse-Auftrag; ein laufender Auftrag mit gleichem Schlüssel wird abgebrochen."""
+        self.abbrechen(schluessel)
+        self._naechste += 1
+        auftrag_id = self._naechste
+        signale = _ParseSignale()
+        signale.fortschritt.connect(self._on_fortschritt)
+        signale.fertig.connect(self._on_fertig)
+        signale.fehler.connect(self._on_fehler)
+        auftrag = _ParseAuftrag(auftrag_id, pfad, modus, signale)
+        self._auftraege[auftrag_id] = (schluessel, pfad, auftrag, signale)
+        self._pool.start(auftrag)
+        return auftrag_id
+
+    def abbrechen(self, schluessel) -> None:
+        """Bricht den laufenden Auftrag für *schluessel* ab (falls vorhanden)."""
+        for auftrag_id, (s, _pfad, auftrag, _sig) in list(self._auftraege.items()):
+            if s == schluessel:
+                auftrag.abbrechen()
+                del self._auftraege[auftrag_id]
+
+    def laeuft(self, schluessel) -> bool:
+        return any(s == schluessel for s, *_ in self._auftraege.values())
+
+    @Slot(int, int)
+    def _on_fortschritt(self, auftrag_id: int, zeilen: int):
+        eintrag = self._auftraege.get(auftrag_id)
+        if eintrag:
+            self.fortschritt.emit(eintrag[0], zeilen)
+
+    @Slot(int, object)
+    def _on_fertig(self, auftrag_id: int, ergebnis):
+        eintrag = self._auftraege.pop(auftrag_id, None)
+        if eintrag:
+            self.fertig.emit(eintrag[0], eintrag[1], ergebnis)
+
+    @Slot(int, str)
+    def _on_fehler(self, auftrag_id: int, meldung: str):
+        eintrag = self._auftraege.pop(auftrag_id, None)
+        if eintrag:
+            self.fehler.emit(eintrag[0], eintrag[1], meldung)
+
+
+class _ImportSignale(QObject):
+    """Signale des Ordner-Imports (werden aus dem Worker-Thread emittiert)."""
+    fortschritt = Signal(int, int)   # erledigte Dateien, Dateien gesamt
+    fertig      = Signal(object)     # Import-Statistik
+    fehler      = Signal(str)        # Fehlermeldung
+
+
+class _OrdnerImportAuftrag(QRunnable):
+    """Importiert den Dienstplan-Ordner im Thread-Pool in die Tabelle 'dienstplan'."""
+
+    def __init__(self, signale: _ImportSignale):
+        super().__init__()
+        self._signale = signale
+
+    def run(self):
+        from database.connection import schliesse_thread_verbindung
+        try:
+            from functions.dienstplan_functions import importiere_dienstplan_ordner
+            stat = importiere_dienstplan_ordner(fortschritt=self._signale.fortschritt.emit)
+        except Exception as e:
+            self._signale.fehler.emit(str(e))
+            return
+        finally:
+            # Pool-Thread lebt weiter – DB-Verbindung nicht offen halten
+            schliesse_thread_verbindung()
+        self._signale.fertig.emit(stat)
+
+
+class DateiWaechter(QObject):
+    """
+    Entprellter Datei-Watcher für Excel-Dateien.
+
+    Excel/OneDrive lösen pro Speichervorgang mehrere fileChanged-Signale aus.
+    Pro Pfad läuft genau ein Timer, der bei jedem weiteren Signal neu startet;
+    erst danach wird geprüft, ob sich der Datei-Inhalt (SHA-1) tatsächlich
+    geändert hat. Pfade, die Qt nach einem atomaren Ersetzen (os.replace)
+    aus der Überwachung entfernt, werden wieder aufgenommen.
+    """
+    geaendert = Signal(str)   # Pfad, Inhalt hat sich geändert
+
+    VERZOEGERUNG_MS = 1500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timer:  dict[str, QTimer] = {}
+        self._hashes: dict[str, str]    = {}
+
+    def beobachte(self, path: str) -> None:
+        """Nimmt *path* in die Überwachung auf (Inhalts-Stand = aktueller Inhalt)."""
+        if not path:
+            return
+        if path not in self._hashes:
+            self._hashes[path] = self._hash(path)
+        self._wieder_aufnehmen(path)
+
+    def entferne(self, path: str) -> None:
+        timer = self._timer.pop(path, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        self._hashes.pop(path, None)
+        if path in self._watcher.files():
+            self._watcher.removePath(path)
+
+    def setze_stand(self, path: str) -> None:
+        """Aktuellen Inhalt als bekannt übernehmen (z. B. nach eigenem Speichern)."""
+        if path in self._hashes:
+            self._hashes[path] = self._hash(path)
+
+    def _on_file_changed(self, path: str) -> None:
+        self._wieder_aufnehmen(path)
+        timer = self._timer.get(path)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(self.VERZOEGERUNG_MS)
+            timer.timeout.connect(lambda p=path: self._pruefen(p))
+            self._timer[path] = timer
+        timer.start()   # erneutes Signal → Timer neu starten
+
+    def _pruefen(self, path: str) -> None:
+        self._wieder_aufnehmen(path)
+        if path not in self._hashes:
+            return
+        neu = self._hash(path)
+        if not neu or neu == self._hashes[path]:
+            return
+        self._hashes[path] = neu
+        self.geaendert.emit(path)
+
+    def _wieder_aufnehmen(self, path: str) -> None:
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        import hashlib
+        try:
+            h = hashlib.sha1()
+            with open(path, 'rb') as fh:
+                for block in iter(lambda: fh.read(1 << 20), b''):
+                    h.update(block)
+            return h.hexdigest()
+        except OSError:
+            return ''
+
+
+class _DienstplanTabellenModel(QAbstractTableModel):
+    """
+    Tabellen-Modell für die geparste Dienstplan-Ansicht.
+
+    Die Zeilen verweisen direkt auf die Personen-Dicts des Parse-Ergebnisses;
+    Farben, Schrift und Texte werden erst beim Zeichnen (data()) ermittelt.
+    Zeilen sind entweder ('abschnitt', text, hintergrund, vordergrund)
+    oder ('person', kategorie, person_dict).
+    """
+
+    SPALTEN = ['Kategorie', 'Name', 'Dienst', 'Von', 'Bis']
+
+    _FARBEN = {
+        'Dispo':           QColor('#dce8f5'),
+        'Betreuer':        QColor('#ffffff'),
+        'Stationsleitung': QColor('#fff8e1'),
+        'Krank':           QColor('#fce8e8'),
+        'KrankDispo':      QColor('#f0d0d0'),   # Dispo-Krank: etwas dunkler
+    }
+    _TEXT_FARBEN = {
+        'Dispo':           QColor('#0a5ba4'),
+        'Betreuer':        QColor('#1a1a1a'),
+        'Stationsleitung': QColor('#7a5000'),
+        'Krank':           QColor('#bb0000'),
+        'KrankDispo':      QColor('#7a0000'),   # dunkler Rotton für Dispo-Krank
+    }
+    _BULMOR_FARBE     = QColor('#fff3b0')
+    _AUSSTEHEND_FARBE = QColor('#ffe0b2')   # noch nicht in Excel gespeichert
+    _WEISS            = QColor('#ffffff')
+    _SCHWARZ          = QColor('#1a1a1a')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._zeilen: list[tuple] = []
+        self._ausstehend: set[int] = set()   # excel_row der ungespeicherten Zeilen
+        self._sep_font = QFont('Arial', 11, QFont.Weight.Bold)
+        self._ausstehend_font = QFont()
+        self._ausstehend_font.setItalic(True)
+
+    # ---------- Qt-Schnittstelle ----------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._zeilen)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.SPALTEN)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.SPALTEN[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._zeilen[index.row()][0] == 'abschnitt':
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        art, a, b, *rest = self._zeilen[index.row()]
+        col = index.column()
+
+        if art == 'abschnitt':
+            if role == Qt.ItemDataRole.DisplayRole:
+                return a if col == 0 else None
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return QColor(b)
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor(rest[0])
+            if role == Qt.ItemDataRole.FontRole:
+                return self._sep_font
+            return None
+
+        kategorie, p = a, b
+        ausstehend = p.get('excel_row') in self._ausstehend
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._werte(kategorie, p)[col]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if ausstehend:
+                return self._AUSSTEHEND_FARBE
+            if p.get('ist_bulmorfahrer'):
+                return self._BULMOR_FARBE
+            return self._FARBEN.get(kategorie, self._WEISS)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._TEXT_FARBEN.get(kategorie, self._SCHWARZ)
+        if ausstehend:
+            if role == Qt.ItemDataRole.FontRole:
+                return self._ausstehend_font
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return 'Änderung noch nicht in der Excel-Datei gespeichert'
+        return None
+
+    # ---------- Zugriff ----------
+
+    @staticmethod
+    def _werte(kategorie: str, p: dict) -> list[str]:
+        # Spalte 0: Kategorie-Anzeige (für Krank: Dispo/Betreuer)
+        if kategorie == 'KrankDispo':
+            kat_anzeige = 'Dispo'
+        elif kategorie == 'Krank':
+            kat_anzeige = 'Betreuer'
+        else:
+            kat_anzeige = kategorie
+
+        # Spalte 2: Dienst-Kürzel – bei Kranken den abgeleiteten Wert zeigen
+        if p.get('ist_krank'):
+            dienst_anzeige = p.get('krank_abgeleiteter_dienst') or ''
+        else:
+            dienst_anzeige = p.get('dienst_kategorie') or ''
+
+        return [
+            kat_anzeige,
+            p.get('anzeigename', ''),
+            dienst_anzeige,
+            p.get('start_zeit', '') or '',
+            p.get('end_zeit',   '') or '',
+        ]
+
+    def person(self, row: int) -> dict | None:
+        """Personen-Dict der Zeile oder None (Abschnitts-Kopfzeile / ungültig)."""
+        if 0 <= row < len(self._zeilen) and self._zeilen[row][0] == 'person':
+            return self._zeilen[row][2]
+        return None
+
+    def abschnitt_zeilen(self) -> list[int]:
+        """Zeilennummern aller Abschnitts-Kopfzeilen (für Spans/Zeilenhöhen)."""
+        return [i for i, z in enumerate(self._zeilen) if z[0] == 'abschnitt']
+
+    @staticmethod
+    def _struktur(zeilen: list[tuple]) -> list:
+        return [z[:2] if z[0] == 'abschnitt' else (z[0],) for z in zeilen]
+
+    def setze_zeilen(self, zeilen: list[tuple]) -> bool:
+        """
+        Übernimmt neue Zeilen. Bleibt die Abschnitts-Struktur gleich, werden
+        nur geänderte Zeilen per dataChanged gemeldet; sonst wird das Modell
+        zurückgesetzt. Gibt True zurück, wenn ein Reset stattfand.
+        """
+        if self._zeilen and self._struktur(zeilen) == self._struktur(self._zeilen):
+            alt = self._zeilen
+            self._zeilen = zeilen
+            for row, (z_alt, z_neu) in enumerate(zip(alt, zeilen)):
+                if z_alt[0] == 'person' and (
+                    z_alt[1] != z_neu[1] or z_alt[2] != z_neu[2]
+                ):
+                    self._zeile_geaendert(row)
+            return False
+        self.beginResetModel()
+        self._zeilen = zeilen
+        self.endResetModel()
+        return True
+
+    def setze_ausstehend(self, excel_rows: set[int]) -> None:
+        """Markiert die Zeilen mit ungespeicherten Änderungen (nur betroffene Zeilen neu zeichnen)."""
+        geaendert = self._ausstehend ^ set(excel_rows)
+        self._ausstehend = set(excel_rows)
+        if not geaendert:
+            return
+        for row, z in enumerate(self._zeilen):
+            if z[0] == 'person' and z[2].get('excel_row') in geaendert:
+                self._zeile_geaendert(row)
+
+    def _zeile_geaendert(self, row: int) -> None:
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.SPALTEN) - 1)
+        )
+
+
 class _DienstplanPane(QWidget):
     """Einzelne Tabellen-Ansicht fuer einen geoeffneten Dienstplan."""
 
+    # Leerlaufzeit, nach der vorgemerkte Änderungen gesammelt geschrieben werden
+    SCHREIB_VERZOEGERUNG_MS = 4000
+
     # Signal: dieser Pane wurde als Export-Quelle aktiviert (sendet eigenen Index)
     export_selected = Signal(int)
+    # Signal: Hintergrund-Ladevorgang erfolgreich abgeschlossen (sendet eigenen Index)
+    geladen = Signal(int)
+    # Signal: vorgemerkte Änderungen wurden in die Excel-Datei geschrieben
+    gespeichert = Signal(int)
 
     def __init__(self, pane_index: int = 0, parent=None):
         super().__init__(parent)
         self._pane_index: int           = pane_index
         self._parsed_data: dict | None  = None
         self._display_data: dict | None = None
-        self._table_row_data: list      = []
+        self._raw_data: dict | None     = None
+        self._zeilen_basis: list | None = None   # dekodierte Basis-Zeilen (für Einzel-Updates)
         self._excel_path: str           = ''
+        self._lade_pfad: str            = ''   # Datei, die gerade im Hintergrund gelesen wird
+        self._lade_stand: tuple | None  = None  # (mtime_ns, Größe) beim Start des Einlesens
+        self._geladener_stand: tuple | None = None  # Dateistand der angezeigten Ansichten
+        self._status_nach_laden: str    = ''
+        # Vorgemerkte Änderungen: excel_row → {'dienst', 'von', 'bis', 'anzeigename'}
+        self._ausstehend: dict[int, dict] = {}
+        self._schreib_timer = QTimer(self)
+        self._schreib_timer.setSingleShot(True)
+        self._schreib_timer.setInterval(self.SCHREIB_VERZOEGERUNG_MS)
+        self._schreib_timer.timeout.connect(self.speichere_ausstehende)
         self._is_export_active: bool    = False
+        self._parse_service = DienstplanParseService(self)
+        self._parse_service.fortschritt.connect(self._on_parse_fortschritt)
+        self._parse_service.fertig.connect(self._on_parse_fertig)
+        self._parse_service.fehler.connect(self._on_parse_fehler)
         self._build_ui()
 
     # ---------- Eigenschaften ----------
@@ -654,10 +1068,20 @@ class _DienstplanPane(QWidget):
     def parsed_data(self) -> dict | None:
         return self._parsed_data
 
+    @property
+    def raw_data(self) -> dict | None:
+        """Ungerundete Ansicht (alle_anzeigen=True, round_dispo=False) für den Word-Export."""
+        return self._raw_data
+
     @property
     def is_empty(self) -> bool:
         return not bool(self._excel_path)
 
+    @property
+    def laedt(self) -> bool:
+        """True solange eine Datei im Hintergrund eingelesen wird."""
+        return bool(self._lade_pfad)
+
     def set_export_active(self, active: bool):
         """Markiert diese Pane visuell als Export-Quelle."""
         self._is_export_active = active
@@ -682,12 +1106,19 @@ class _DienstplanPane(QWidget):
             self._title_lbl.setStyleSheet(f'color: {FIORI_TEXT}; font-size: 11px;')
 
     def clear(self):
+        self.speichere_ausstehende()
+        self._ausstehend.clear()
+        self._parse_service.abbrechen(self._pane_index)
+        self._lade_pfad      = ''
+        self._geladener_stand = None
         self._parsed_data    = None
         self._display_data   = None
-        self._table_row_data = []
+        self._raw_data       = None
+        self._zeilen_basis   = None
         self._excel_path     = ''
-        self._table.clearContents()
-        self._table.setRowCount(0)
+        self._table.clearSpans()
+        self._model.setze_zeilen([])
+        self._aktualisiere_ausstehend_anzeige()
         self._datum_lbl.setVisible(False)
         self._status_lbl.setText('Doppelklick auf eine Datei im Baum, um sie zu laden.')
         self._status_lbl.setStyleSheet('color: #888; padding: 2px 0;')
@@ -722,6 +1153,17 @@ class _DienstplanPane(QWidget):
         self._export_btn.clicked.connect(lambda: self.export_selected.emit(self._pane_index))
         header_layout.addWidget(self._export_btn)
 
+        self._speichern_btn = QPushButton('')
+        self._speichern_btn.setFixedHeight(22)
+        self._speichern_btn.setToolTip('Vorgemerkte Änderungen jetzt in die Excel-Datei schreiben')
+        self._speichern_btn.setStyleSheet(
+            'font-size: 10px; padding: 0 6px; border-radius: 3px; '
+            'background: #b85c00; color: white; border: none;'
+        )
+        self._speichern_btn.clicked.connect(self.speichere_ausstehende)
+        self._speichern_btn.setVisible(False)
+        header_layout.addWidget(self._speichern_btn)
+
         self._close_btn = QPushButton('X')
         self._close_btn.setFixedSize(22, 22)
         self._close_btn.setStyleSheet(
@@ -757,29 +1199,27 @@ class _DienstplanPane(QWidget):
         self._status_lbl.setStyleSheet('color: #888; padding: 1px 0;')
         layout.addWidget(self._status_lbl)
 
-        self._table = QTableWidget()
-        self._table.setColumnCount(5)
-        self._table.setHorizontalHeaderLabels([
-            'Kategorie', 'Name', 'Dienst', 'Von', 'Bis'
-        ])
+        self._model = _DienstplanTabellenModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
         self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self._table.horizontalHeader().setStretchLastSection(False)
         self._table.horizontalHeader().setMinimumSectionSize(40)
         self._table.verticalHeader().setVisible(False)
         self._table.verticalHeader().setDefaultSectionSize(18)
-        self._table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self._table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self._table.setAlternatingRowColors(True)
-        self._table.itemDoubleClicked.connect(self._on_table_double_click)
+        self._table.doubleClicked.connect(self._on_table_double_click)
         self._table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border-radius: 6px;
                 font-size: 14px;
                 font-weight: bold;
                 gridline-color: #e8ecf0;
             }
-            QTableWidget::item { padding: 0px 4px; }
+            QTableView::item { padding: 0px 4px; }
             QHeaderView::section {
                 background-color: #f0f4f8;
                 border: none;
@@ -799,23 +1239,48 @@ class _DienstplanPane(QWidget):
 
     def _on_close_clicked(self):
         """Pane leeren und ausblenden (ausser Pane 0 - wird nur geleert)."""
+        if not self.speichere_ausstehende():
+            return
         self.clear()
         if self._pane_index > 0:
             self.setVisible(False)
 
     # ---------- Laden ----------
 
-    def load(self, path: str) -> bool:
-        """Excel-Datei einlesen und Tabelle befüllen. Gibt True bei Erfolg zurück."""
+    def load(self, path: str, status_nach_laden: str = ''):
+        """
+        Excel-Datei im Hintergrund einlesen; die Tabelle wird befüllt, sobald
+        das Ergebnis vorliegt. Ein noch laufender Ladevorgang dieser Pane wird
+        abgebrochen. Vorgemerkte Änderungen werden vorher geschrieben.
+        """
+        if not self.speichere_ausstehende():
+            return
+        self._lade_pfad         = path
+        self._lade_stand        = self._datei_stand(path)
+        self._status_nach_laden = status_nach_laden
         self._status_lbl.setText(' Datei wird eingelesen ...')
         self._status_lbl.setStyleSheet('color: #555; padding: 2px 0;')
-        self._status_lbl.repaint()
+        # Ein einziger Lesevorgang liefert Anzeige-, Export- und Roh-Ansicht
+        # (bei unveränderter Datei direkt aus dem Parse-Cache)
+        self._parse_service.starte(self._pane_index, path, 'alle')
 
-        try:
-            from functions.dienstplan_parser import DienstplanParser
+    def _on_parse_fortschritt(self, _schluessel, zeilen: int):
+        self._status_lbl.setText(f' Datei wird eingelesen ... {zeilen} Zeilen gelesen')
 
-            display_result = DienstplanParser(path, alle_anzeigen=True).parse()
-            export_result  = DienstplanParser(path, alle_anzeigen=False).parse()
+    def _on_parse_fehler(self, _schluessel, path: str, meldung: str):
+        if path != self._lade_pfad:
+            return
+        self._lade_pfad = ''
+        QMessageBox.critical(self, 'Fehler', f'Unerwarteter Fehler:\n{meldung}')
+        self._status_lbl.setText(f'Fehler: {meldung}')
+        self._status_lbl.setStyleSheet('color: #bb0000; padding: 2px 0;')
+
+    def _on_parse_fertig(self, _schluessel, path: str, ansichten: dict):
+        if path != self._lade_pfad:
+            return
+        self._lade_pfad = ''
+        try:
+            display_result = ansichten['display']
 
             if not display_result['success']:
                 QMessageBox.critical(
@@ -824,24 +1289,19 @@ class _DienstplanPane(QWidget):
                 )
                 self._status_lbl.setText('Fehler: Fehler beim Einlesen.')
                 self._status_lbl.setStyleSheet('color: #bb0000; padding: 2px 0;')
-                return False
-
-            self._excel_path   = path
-            self._display_data = display_result
-            self._parsed_data  = export_result
+                return
 
-            # Dateiname im Header anzeigen
+            self._uebernehme_ansichten(path, ansichten)
+            # Dateistand vor dem Einlesen – Grundlage für speichere_ausstehende()
+            self._geladener_stand = self._lade_stand
             dateiname = os.path.basename(path)
-            self._title_lbl.setText(dateiname)
-
-            datum = display_result.get('datum')
-            if datum:
-                self._datum_lbl.setText(f'Datum: {datum}')
-                self._datum_lbl.setVisible(True)
-            else:
-                self._datum_lbl.setVisible(False)
 
-            self._render_table_parsed(display_result)
+            if self._status_nach_laden:
+                # Neu-Laden nach dem Speichern einer Änderung
+                self._status_lbl.setText(self._status_nach_laden)
+                self._status_lbl.setStyleSheet('color: #b85c00; font-weight: bold; padding: 2px 0;')
+                self.geladen.emit(self._pane_index)
+                return
 
             unbekannte = display_result.get('unbekannte_dienste', [])
             if unbekannte:
@@ -854,13 +1314,33 @@ class _DienstplanPane(QWidget):
 
             self._status_lbl.setText(f'Geladen: {dateiname}')
             self._status_lbl.setStyleSheet('color: #107e3e; padding: 2px 0;')
-            return True
+            self.geladen.emit(self._pane_index)
 
         except Exception as e:
             QMessageBox.critical(self, 'Fehler', f'Unerwarteter Fehler:\n{e}')
             self._status_lbl.setText(f'Fehler: {e}')
             self._status_lbl.setStyleSheet('color: #bb0000; padding: 2px 0;')
-            return False
+
+    def _uebernehme_ansichten(self, path: str, ansichten: dict):
+        """Übernimmt ein Ergebnis von parse_alle_ansichten() in die Pane."""
+        display_result     = ansichten['display']
+        self._excel_path   = path
+        self._display_data = display_result
+        self._parsed_data  = ansichten['export']
+        self._raw_data     = ansichten['raw']
+        self._zeilen_basis = ansichten.get('zeilen')
+
+        # Dateiname im Header anzeigen
+        self._title_lbl.setText(os.path.basename(path))
+
+        datum = display_result.get('datum')
+        if datum:
+            self._datum_lbl.setText(f'Datum: {datum}')
+            self._datum_lbl.setVisible(True)
+        else:
+            self._datum_lbl.setVisible(False)
+
+        self._render_table_parsed(display_result)
 
     # ---------- Tabelle rendern ----------
 
@@ -930,76 +1410,18 @@ class _DienstplanPane(QWidget):
         if krank_sonder_personen:
             abschnitte.append(('Krank – Sonderdienst','#6b3300', '#fdebd0', krank_sonder_personen))
 
-        total_rows = sum(1 + len(personen) for _, _, _, personen in abschnitte)
-        self._table.clearSpans()
-        self._table.setRowCount(total_rows)
-
-        farben = {
-            'Dispo':           QColor('#dce8f5'),
-            'Betreuer':        QColor('#ffffff'),
-            'Stationsleitung': QColor('#fff8e1'),
-            'Krank':           QColor('#fce8e8'),
-            'KrankDispo':      QColor('#f0d0d0'),   # Dispo-Krank: etwas dunkler
-        }
-        text_farben = {
-            'Dispo':           QColor('#0a5ba4'),
-            'Betreuer':        QColor('#1a1a1a'),
-            'Stationsleitung': QColor('#7a5000'),
-            'Krank':           QColor('#bb0000'),
-            'KrankDispo':      QColor('#7a0000'),   # dunkler Rotton für Dispo-Krank
-        }
-
-        self._table_row_data = []
-        row = 0
-        sep_font = QFont('Arial', 11, QFont.Weight.Bold)
+        zeilen = []
         for label_text, hdr_bg, hdr_fg, personen in abschnitte:
-            self._table_row_data.append(None)
-            self._table.setSpan(row, 0, 1, 5)
-            sep_item = QTableWidgetItem(label_text)
-            sep_item.setBackground(QColor(hdr_bg))
-            sep_item.setForeground(QColor(hdr_fg))
-            sep_item.setFont(sep_font)
-            sep_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-            self._table.setItem(row, 0, sep_item)
-            self._table.verticalHeader().resizeSection(row, 24)
-            row += 1
-
-            for kategorie, p in personen:
-                self._table_row_data.append(p)
-                bg = farben.get(kategorie, QColor('#ffffff'))
-                fg = text_farben.get(kategorie, QColor('#1a1a1a'))
-
-                # Spalte 0: Kategorie-Anzeige (für Krank: Dispo/Betreuer)
-                if kategorie == 'KrankDispo':
-                    kat_anzeige = 'Dispo'
-                elif kategorie == 'Krank':
-                    kat_anzeige = 'Betreuer'
-                else:
-                    kat_anzeige = kategorie
+            zeilen.append(('abschnitt', label_text, hdr_bg, hdr_fg))
+            zeilen.extend(('person', kategorie, p) for kategorie, p in personen)
 
-                # Spalte 2: Dienst-Kürzel – bei Kranken den abgeleiteten Wert zeigen
-                if p.get('ist_krank'):
-                    dienst_anzeige = p.get('krank_abgeleiteter_dienst') or ''
-                else:
-                    dienst_anzeige = p.get('dienst_kategorie') or ''
-
-                vals = [
-                    kat_anzeige,
-                    p.get('anzeigename', ''),
-                    dienst_anzeige,
-                    p.get('start_zeit', '') or '',
-                    p.get('end_zeit',   '') or '',
-                ]
-                for col, val in enumerate(vals):
-                    item = QTableWidgetItem(val)
-                    item.setBackground(bg)
-                    item.setForeground(fg)
-                    self._table.setItem(row, col, item)
-
-                if p.get('ist_bulmorfahrer'):
-                    for col in range(5):
-                        self._table.item(row, col).setBackground(QColor('#fff3b0'))
-                row += 1
+        # Bei gleicher Abschnitts-Struktur meldet das Modell nur geänderte Zeilen;
+        # Spans und Kopfzeilen-Höhen müssen nur nach einem Reset neu gesetzt werden
+        if self._model.setze_zeilen(zeilen):
+            self._table.clearSpans()
+            for row in self._model.abschnitt_zeilen():
+                self._table.setSpan(row, 0, 1, 5)
+                self._table.verticalHeader().resizeSection(row, 24)
 
         # ── Statuszeile ───────────────────────────────────────────────────
         tag_n   = len(tag_personen)
@@ -1065,12 +1487,10 @@ class _DienstplanPane(QWidget):
 
     # ---------- Doppelklick Tabellenzeile ----------
 
-    def _on_table_double_click(self, item):
-        """Ã–ffnet Edit-Dialog, speichert Ã„nderungen in Excel und lädt neu."""
-        row = item.row()
-        if row < 0 or row >= len(self._table_row_data):
-            return
-        person = self._table_row_data[row]
+    def _on_table_double_click(self, index):
+        """Öffnet den Edit-Dialog und merkt die Änderung zum Speichern in Excel vor."""
+        row = index.row()
+        person = self._model.person(row)
         if person is None:
             return
         if not self._display_data:
@@ -1081,38 +1501,145 @@ class _DienstplanPane(QWidget):
             return
 
         res = dlg.result_data
-        try:
-            self._save_to_excel(person, res['dienst'], res['von'], res['bis'])
-        except Exception as e:
+        excel_path = self._display_data.get('excel_path', '')
+        if not excel_path or not person.get('excel_row'):
             QMessageBox.critical(
                 self, 'Fehler beim Speichern',
-                f'Die Excel-Datei konnte nicht gespeichert werden:\n{e}'
+                'Excel-Pfad oder Zeilennummer nicht gefunden.'
             )
             return
 
-        excel_path = self._display_data.get('excel_path', '')
-        if not excel_path:
+        # Änderung vormerken; geschrieben wird gesammelt nach kurzer Pause
+        # (oder über "Speichern" in der Kopfzeile)
+        self._ausstehend[person['excel_row']] = {
+            'dienst':      res['dienst'],
+            'von':         res['von'],
+            'bis':         res['bis'],
+            'anzeigename': person.get('anzeigename', ''),
+        }
+
+        # Nur die geänderte Zeile neu ableiten – die Arbeitsmappe wird nicht erneut gelesen
+        ansichten = self._aktualisiere_ansichten(person, res['dienst'], res['von'], res['bis'])
+        if ansichten is None:
+            # Fallback: sofort schreiben und Datei im Hintergrund neu einlesen
+            if self.speichere_ausstehende():
+                self.load(excel_path, status_nach_laden=self._status_lbl.text())
             return
+
+        self._uebernehme_ansichten(excel_path, ansichten)
+        self._aktualisiere_ausstehend_anzeige()
+        self._schreib_timer.start()
+
+    # ---------- Vorgemerkte Änderungen ----------
+
+    def _aktualisiere_ausstehend_anzeige(self):
+        """Markiert ungespeicherte Zeilen und zeigt/versteckt den Speichern-Knopf."""
+        n = len(self._ausstehend)
+        self._model.setze_ausstehend(set(self._ausstehend))
+        self._speichern_btn.setVisible(n > 0)
+        if n:
+            self._speichern_btn.setText(f'Speichern ({n})')
+            self._status_lbl.setText(
+                f'{n} Änderung(en) vorgemerkt – werden in Kürze in die Excel-Datei geschrieben.'
+            )
+            self._status_lbl.setStyleSheet('color: #b85c00; padding: 2px 0;')
+
+    def speichere_ausstehende(self) -> bool:
+        """
+        Schreibt alle vorgemerkten Änderungen in einem einzigen Lade-/Speicher-
+        Vorgang in die Excel-Datei. Gibt False zurück, wenn das Schreiben
+        fehlschlug (die Änderungen bleiben dann vorgemerkt).
+        """
+        self._schreib_timer.stop()
+        if not self._ausstehend:
+            return True
+
+        excel_path = (self._display_data or {}).get('excel_path', '')
+        # Hat ein anderer PC die Datei seit dem Einlesen geändert, enthalten
+        # die Pane-Ansichten dessen Änderungen nicht
+        fremd_geaendert = (
+            self._geladener_stand is None
+            or self._datei_stand(excel_path) != self._geladener_stand
+        )
         try:
-            from functions.dienstplan_parser import DienstplanParser
-            display_result = DienstplanParser(excel_path, alle_anzeigen=True).parse()
-            export_result  = DienstplanParser(excel_path, alle_anzeigen=False).parse()
-            if display_result['success']:
-                self._display_data = display_result
-                self._parsed_data  = export_result
-                datum = display_result.get('datum')
-                if datum:
-                    self._datum_lbl.setText(f'\U0001f4c5 Datum: {datum}')
-                    self._datum_lbl.setVisible(True)
-                self._render_table_parsed(display_result)
-                self._status_lbl.setText(
-                    f'\u2705 Gespeichert: {person.get("anzeigename", "")} -> {res["dienst"]}'
-                    f'  \u26a0\ufe0f Andere Nutzer m\u00fcssen die Datei neu \u00f6ffnen, '
-                    f'sonst werden die \u00c4nderungen \u00fcberschrieben!'
-                )
-                self._status_lbl.setStyleSheet('color: #b85c00; font-weight: bold; padding: 2px 0;')
+            self._save_to_excel(self._ausstehend)
         except Exception as e:
-            QMessageBox.critical(self, 'Fehler', f'Fehler beim Neu-Laden:\n{e}')
+            QMessageBox.critical(
+                self, 'Fehler beim Speichern',
+                f'Die Excel-Datei konnte nicht gespeichert werden:\n{e}\n\n'
+                f'Die Änderungen bleiben vorgemerkt.'
+            )
+            return False
+
+        namen = ', '.join(
+            f'{a["anzeigename"]} -> {a["dienst"]}' for a in self._ausstehend.values()
+        )
+        self._ausstehend.clear()
+        self._aktualisiere_ausstehend_anzeige()
+
+        if fremd_geaendert:
+            # Ansichten veraltet: nicht in den Cache übernehmen und die Datei
+            # neu einlesen lassen (Watcher bzw. das laufende load())
+            self._geladener_stand = None
+            try:
+                from functions.dienstplan_cache import invalidieren
+                invalidieren(excel_path)
+            except Exception:
+                pass
+            self._status_lbl.setText(
+                f'\u2705 Gespeichert: {namen}  \u2013 Datei wurde zwischenzeitlich '
+                f'von einem anderen PC ge\u00e4ndert und wird neu eingelesen ...'
+            )
+            self._status_lbl.setStyleSheet('color: #b85c00; font-weight: bold; padding: 2px 0;')
+            return True
+
+        # Die Ansichten entsprechen jetzt dem geschriebenen Dateistand
+        self._geladener_stand = self._datei_stand(excel_path)
+        if self._zeilen_basis is not None and excel_path:
+            try:
+                from functions.dienstplan_cache import uebernehmen
+                uebernehmen(excel_path, {
+                    'success': True,
+                    'error':   None,
+                    'display': self._display_data,
+                    'export':  self._parsed_data,
+                    'raw':     self._raw_data,
+                    'zeilen':  self._zeilen_basis,
+                })
+            except Exception:
+                pass
+
+        self._status_lbl.setText(
+            f'\u2705 Gespeichert: {namen}'
+            f'  \u26a0\ufe0f Andere Nutzer m\u00fcssen die Datei neu \u00f6ffnen, '
+            f'sonst werden die \u00c4nderungen \u00fcberschrieben!'
+        )
+        self._status_lbl.setStyleSheet('color: #b85c00; font-weight: bold; padding: 2px 0;')
+        self.gespeichert.emit(self._pane_index)
+        return True
+
+    @staticmethod
+    def _datei_stand(path: str) -> tuple | None:
+        """(mtime_ns, Größe) der Datei oder None, falls sie fehlt."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _aktualisiere_ansichten(self, person: dict, dienst: str, von: str, bis: str) -> dict | None:
+        """Leitet Anzeige-, Export- und Roh-Ansicht nach der Änderung einer Zeile neu ab."""
+        if self._zeilen_basis is None:
+            return None
+        try:
+            from functions.dienstplan_parser import DienstplanParser
+            return DienstplanParser.aktualisiere_zeile(
+                {'success': True, 'display': self._display_data, 'zeilen': self._zeilen_basis},
+                person.get('excel_row'), dienst, von, bis,
+                dienst_fill_rgb=_KRANK_FILL_RGB if (dienst or '').upper() in ('KRANK', 'K') else None,
+            )
+        except Exception:
+            return None
 
     # ---------- Excel-Schutz ----------
 
@@ -1138,16 +1665,21 @@ class _DienstplanPane(QWidget):
                 f'Bitte sicherstellen, dass die Datei nicht anderweitig geöffnet ist.'
             )
 
-    def _save_to_excel(self, person: dict, dienst: str, von: str, bis: str):
-        """Schreibt Dienst/Von/Bis sicher in die Excel-Datei zurück (3-Ebenen-Schutz)."""
+    def _save_to_excel(self, aenderungen: dict[int, dict]):
+        """
+        Schreibt Dienst/Von/Bis mehrerer Zeilen sicher in die Excel-Datei zurück
+        (3-Ebenen-Schutz). aenderungen: excel_row → {'dienst', 'von', 'bis'}.
+        Sperre, Schreiben und Backup erfolgen einmal pro Aufruf.
+
+        Geschrieben wird direkt in die XML-Teile der xlsx-Datei (nur die
+        betroffenen Zellen); nur wenn das nicht möglich ist, über openpyxl.
+        """
         import os
-        import openpyxl
-        from openpyxl.styles import PatternFill
+        from functions.excel_patch import patche_zellen, PatchNichtMoeglich
 
         excel_path = (self._display_data or {}).get('excel_path', '')
         column_map = (self._display_data or {}).get('column_map', {})
-        excel_row  = person.get('excel_row')
-        if not excel_path or not column_map or not excel_row:
+        if not excel_path or not column_map or not all(aenderungen):
             raise ValueError('Excel-Pfad oder Zeilennummer nicht gefunden.')
 
         ordner    = os.path.dirname(excel_path)
@@ -1171,26 +1703,11 @@ class _DienstplanPane(QWidget):
             with open(nesk_lock, 'w') as lf:
                 lf.write('nesk3')
 
-            wb = openpyxl.load_workbook(excel_path)
-            ws = wb.active
-
-            dienst_cell = ws.cell(row=excel_row, column=column_map['dienst'] + 1)
-            dienst_cell.value = dienst or None
-
-            if dienst.upper() in ('KRANK', 'K'):
-                dienst_cell.fill = PatternFill(patternType='solid', fgColor='FFFF0000')
-            else:
-                dienst_cell.fill = PatternFill(patternType='none')
-
-            if column_map.get('beginn') is not None:
-                ws.cell(row=excel_row, column=column_map['beginn'] + 1).value = \
-                    self._parse_time_str(von)
-            if column_map.get('ende') is not None:
-                ws.cell(row=excel_row, column=column_map['ende'] + 1).value = \
-                    self._parse_time_str(bis)
-
-            wb.save(temp_path)
-            wb.close()
+            zellen = self._zellen_fuer_excel(aenderungen, column_map)
+            try:
+                patche_zellen(excel_path, temp_path, zellen)
+            except PatchNichtMoeglich:
+                self._save_mit_openpyxl(excel_path, temp_path, zellen)
             self._check_excel_locked(excel_path)
             os.replace(temp_path, excel_path)
             self._backup_excel_save(excel_path)
@@ -1203,6 +1720,44 @@ class _DienstplanPane(QWidget):
                 except OSError:
                     pass
 
+    def _zellen_fuer_excel(self, aenderungen: dict[int, dict], column_map: dict) -> dict:
+        """Zellangaben (zeile, spalte) → {'wert', 'fill'} für patche_zellen()."""
+        zellen = {}
+        for excel_row, aenderung in aenderungen.items():
+            dienst = aenderung['dienst'] or ''
+            zellen[(excel_row, column_map['dienst'] + 1)] = {
+                'wert': dienst or None,
+                'fill': _KRANK_FILL_RGB if dienst.upper() in ('KRANK', 'K') else None,
+            }
+            if column_map.get('beginn') is not None:
+                zellen[(excel_row, column_map['beginn'] + 1)] = {
+                    'wert': self._parse_time_str(aenderung['von'])
+                }
+            if column_map.get('ende') is not None:
+                zellen[(excel_row, column_map['ende'] + 1)] = {
+                    'wert': self._parse_time_str(aenderung['bis'])
+                }
+        return zellen
+
+    @staticmethod
+    def _save_mit_openpyxl(excel_path: str, temp_path: str, zellen: dict):
+        """Fallback: komplette Arbeitsmappe über openpyxl laden und speichern."""
+        import openpyxl
+        from openpyxl.styles import PatternFill
+
+        wb = openpyxl.load_workbook(excel_path)
+        ws = wb.active
+        for (zeile, spalte), angabe in zellen.items():
+            cell = ws.cell(row=zeile, column=spalte)
+            cell.value = angabe['wert']
+            if 'fill' in angabe:
+                if angabe['fill']:
+                    cell.fill = PatternFill(patternType='solid', fgColor=angabe['fill'])
+                else:
+                    cell.fill = PatternFill(patternType='none')
+        wb.save(temp_path)
+        wb.close()
+
     @staticmethod
     def _backup_excel_save(excel_path: str):
         """Erstellt nach jedem erfolgreichen Excel-Save eine Sicherungskopie."""
@@ -1247,8 +1802,14 @@ class DienstplanWidget(QWidget):
         self._fs_model: QFileSystemModel | None = None
         self._export_pane_idx: int              = 0   # Index der fuer Export aktiven Pane
         self._html_generiert:  bool             = False  # True nach erstem HTML-Export
-        self._html_watcher = QFileSystemWatcher(parent=self)
-        self._html_watcher.fileChanged.connect(self._on_excel_geaendert)
+        self._html_quelle:     str              = ''     # Excel-Datei der HTML-Seite
+        # Laufender Ordner-Import (Signal-Objekt muss bis zum Auftragsende leben)
+        self._import_signale: _ImportSignale | None   = None
+        self._import_dialog:  QProgressDialog | None  = None
+        self._waechter = DateiWaechter(self)
+        self._waechter.geaendert.connect(self._on_excel_geaendert)
+        self._html_parse_service = DienstplanParseService(self)
+        self._html_parse_service.fertig.connect(self._on_html_parse_fertig)
         self._build_ui()
 
     def _build_ui(self):
@@ -1293,6 +1854,16 @@ class DienstplanWidget(QWidget):
         html_btn.clicked.connect(self._html_exportieren)
         top.addWidget(html_btn)
 
+        import_btn = QPushButton("In Datenbank übernehmen")
+        import_btn.setMinimumHeight(36)
+        import_btn.setToolTip(
+            "Alle Tagesdienstpläne des konfigurierten Ordners in die Datenbank importieren.\n"
+            "Unveränderte Dateien werden übersprungen."
+        )
+        import_btn.clicked.connect(self._ordner_importieren)
+        top.addWidget(import_btn)
+        self._import_btn = import_btn
+
         reload_btn = QPushButton("Neu laden")
         reload_btn.setToolTip("Ordner-Ansicht neu laden")
         reload_btn.setMinimumHeight(36)
@@ -1379,6 +1950,8 @@ class DienstplanWidget(QWidget):
         for i in range(self.MAX_PANES):
             pane = _DienstplanPane(pane_index=i)
             pane.export_selected.connect(self._set_export_pane)
+            pane.geladen.connect(self._on_pane_geladen)
+            pane.gespeichert.connect(self._on_pane_gespeichert)
             self._panes.append(pane)
             self._pane_splitter.addWidget(pane)
 
@@ -1481,6 +2054,27 @@ class DienstplanWidget(QWidget):
         else:
             self._export_lbl.setText("")
 
+    def _on_pane_geladen(self, idx: int):
+        """Export-Beschriftung nachziehen und Datei überwachen, sobald eine Pane geladen ist."""
+        pane = self._panes[idx]
+        self._waechter.beobachte(pane.excel_path)
+        if idx == self._export_pane_idx:
+            self._set_export_pane(idx)
+        # HTML-Seite folgt dem neu eingelesenen Stand ihrer Quelldatei
+        if self._html_generiert and pane.excel_path == self._html_quelle:
+            self._schreibe_html_auto(pane, pane._display_data)
+
+    def _on_pane_gespeichert(self, idx: int):
+        """
+        Eigene Änderungen geschrieben: Die Pane-Daten entsprechen bereits dem
+        neuen Dateistand – kein erneutes Einlesen durch den Watcher, die
+        HTML-Seite wird direkt aus den Pane-Daten aktualisiert.
+        """
+        pane = self._panes[idx]
+        self._waechter.setze_stand(pane.excel_path)
+        if self._html_generiert and pane.excel_path == self._html_quelle and pane._display_data:
+            self._schreibe_html_auto(pane, pane._display_data)
+
     def _export_pane(self) -> '_DienstplanPane':
         return self._panes[self._export_pane_idx]
 
@@ -1490,9 +2084,9 @@ class DienstplanWidget(QWidget):
         Bereits geoeffnet -> neu laden.
         Alle 4 voll -> erste Pane ersetzen.
         """
-        # Bereits geoeffnet?
+        # Bereits geoeffnet oder wird gerade geladen?
         for i, pane in enumerate(self._panes):
-            if pane.excel_path == path:
+            if pane.excel_path == path or pane._lade_pfad == path:
                 pane.load(path)
                 self._set_export_pane(i)
                 return
@@ -1526,49 +2120,126 @@ class DienstplanWidget(QWidget):
         pane.load(path)
         self._set_export_pane(self._export_pane_idx)
 
-    def _watch_excel(self, path: str):
-        """Fügt eine Excel-Datei dem Datei-Watcher hinzu (einmalig)."""
-        if path and path not in self._html_watcher.files():
-            self._html_watcher.addPath(path)
-
     def _on_excel_geaendert(self, path: str):
         """
-        Wird aufgerufen wenn eine geladene Excel-Datei auf der Festplatte
-        geändert wird. Erzeugt die HTML-Seite neu – aber nur wenn der
-        Benutzer sie mindestens einmal manuell generiert hat.
+        Wird (entprellt) aufgerufen, wenn sich der Inhalt einer geladenen
+        Excel-Datei auf der Festplatte geändert hat. Alle Panes mit dieser
+        Datei werden im Hintergrund neu eingelesen; die HTML-Seite wird danach
+        neu erzeugt – aber nur wenn der Benutzer sie mindestens einmal
+        manuell generiert hat.
         """
-        if not self._html_generiert:
+        betroffen = [pane for pane in self._panes if pane.excel_path == path]
+        ist_html  = self._html_generiert and path == self._html_quelle
+        if not betroffen and not ist_html:
+            self._waechter.entferne(path)
             return
-        # Kleines Delay: Excel schreibt manchmal in mehreren Schritten
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(1500, lambda: self._html_auto_update(path))
+
+        from datetime import datetime as _dt
+        for pane in betroffen:
+            pane.load(
+                path,
+                status_nach_laden=f'Datei wurde geändert – neu geladen ({_dt.now().strftime("%H:%M:%S")})',
+            )
+        if ist_html and not betroffen:
+            self._html_auto_update(path)
 
     def _html_auto_update(self, path: str):
-        """Stille automatische HTML-Aktualisierung nach Dateiänderung."""
-        # Passende Pane suchen
-        for pane in self._panes:
-            if pane.excel_path == path and pane._display_data:
-                try:
-                    from functions.dienstplan_parser import DienstplanParser
-                    result = DienstplanParser(path, alle_anzeigen=True).parse()
-                    if not result.get('success'):
-                        return
-                    from functions.dienstplan_html_export import generiere_html
-                    generiere_html(result)
-                    # Status-Zeile aktualisieren
-                    from datetime import datetime as _dt
-                    pane._status_lbl.setText(
-                        f'🌐 Webseite automatisch aktualisiert – {_dt.now().strftime("%H:%M:%S")}'
-                    )
-                    pane._status_lbl.setStyleSheet('color: #1e7e34; font-weight: bold; padding: 2px 0;')
-                except Exception:
-                    pass
-                return
+        """Stille automatische HTML-Aktualisierung nach Dateiänderung (Einlesen im Hintergrund)."""
+        # Schlüssel = Pfad: ein erneutes Ändern bricht den laufenden Auftrag ab
+        self._html_parse_service.starte(path, path, 'display')
+
+    def _on_html_parse_fertig(self, _schluessel, path: str, result: dict):
+        """Schreibt die HTML-Seite, sobald der Hintergrund-Parse fertig ist."""
+        if not result.get('success') or path != self._html_quelle:
+            return
+        self._schreibe_html_auto(self._export_pane(), result)
+
+    def _schreibe_html_auto(self, pane: '_DienstplanPane', result: dict):
+        try:
+            from functions.dienstplan_html_export import generiere_html
+            generiere_html(result)
+            # Status-Zeile aktualisieren
+            from datetime import datetime as _dt
+            pane._status_lbl.setText(
+                f'🌐 Webseite automatisch aktualisiert – {_dt.now().strftime("%H:%M:%S")}'
+            )
+            pane._status_lbl.setStyleSheet('color: #1e7e34; font-weight: bold; padding: 2px 0;')
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Bulk-Import in die Datenbank
+    # ------------------------------------------------------------------
+
+    def _ordner_importieren(self):
+        """
+        Importiert alle Tagesdienstpläne des Dienstplan-Ordners in die Tabelle
+        'dienstplan' – im Hintergrund (QThreadPool), Fortschritt im Dialog.
+        """
+        if self._import_signale is not None:
+            return   # Import läuft bereits
+        self._import_btn.setEnabled(False)
+        dlg = QProgressDialog("Dienstpläne werden gesucht …", None, 0, 0, self)
+        dlg.setWindowTitle("Import in die Datenbank")
+        dlg.setWindowModality(Qt.WindowModality.WindowModal)
+        dlg.setMinimumDuration(0)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.show()
+        self._import_dialog = dlg
+
+        signale = _ImportSignale()
+        signale.fortschritt.connect(self._on_import_fortschritt)
+        signale.fertig.connect(self._on_import_fertig)
+        signale.fehler.connect(self._on_import_fehler)
+        self._import_signale = signale
+        QThreadPool.globalInstance().start(_OrdnerImportAuftrag(signale))
+
+    @Slot(int, int)
+    def _on_import_fortschritt(self, erledigt: int, gesamt: int):
+        dlg = self._import_dialog
+        dlg.setMaximum(gesamt)
+        dlg.setValue(erledigt)
+        dlg.setLabelText(f"Dienstpläne werden eingelesen … {erledigt} / {gesamt}")
+
+    def _import_beenden(self):
+        self._import_dialog.close()
+        self._import_dialog = None
+        self._import_signale = None
+        self._import_btn.setEnabled(True)
+
+    @Slot(str)
+    def _on_import_fehler(self, meldung: str):
+        self._import_beenden()
+        QMessageBox.critical(self, "Fehler beim Import", f"Fehler:\n{meldung}")
+
+    @Slot(object)
+    def _on_import_fertig(self, stat: dict):
+        self._import_beenden()
+        text = (
+            f"Dateien gesamt:        {stat['gesamt']}\n"
+            f"Neu importiert:        {stat['importiert']}  ({stat['schichten']} Schichten)\n"
+            f"Unverändert:           {stat['uebersprungen'] + stat['unveraendert']}\n"
+            f"Entfernt:              {stat['entfernt']}"
+        )
+        if stat['fehler']:
+            text += "\n\nFehler:\n" + "\n".join(
+                f"  - {datei}: {msg}" for datei, msg in stat['fehler'][:15]
+            )
+            QMessageBox.warning(self, "Import abgeschlossen (mit Fehlern)", text)
+        else:
+            QMessageBox.information(self, "Import abgeschlossen", text)
 
     # ------------------------------------------------------------------
     # Datenladen
     # ------------------------------------------------------------------
 
+    def hideEvent(self, event):
+        """Beim Verlassen der Seite vorgemerkte Dienstplan-Änderungen schreiben."""
+        for pane in self._panes:
+            pane.speichere_ausstehende()
+        super().hideEvent(event)
+
     def refresh(self):
         self._alle = []
         for pane in self._panes:
@@ -1593,9 +2264,10 @@ class DienstplanWidget(QWidget):
             from functions.dienstplan_html_export import generiere_html, html_pfad
             pfad = generiere_html(pane._display_data)
             self._html_generiert = True
+            self._html_quelle    = pane.excel_path
 
             # Excel in Watcher aufnehmen für automatische Aktualisierung
-            self._watch_excel(pane.excel_path)
+            self._waechter.beobachte(pane.excel_path)
 
             # Im Standard-Browser öffnen
             import webbrowser
@@ -1625,13 +2297,9 @@ class DienstplanWidget(QWidget):
 
         # ── Schritt 1: Dispo-Zeiten Vorschau / Bearbeitung ──────────────────
         # Roh-Zeiten aus Excel ohne jede Rundung für die Vergleichsspalten
-        try:
-            from functions.dienstplan_parser import DienstplanParser
-            raw_result = DienstplanParser(
-                pane.excel_path, alle_anzeigen=True, round_dispo=False
-            ).parse()
-            raw_data = raw_result if raw_result.get('success') else None
-        except Exception:
+        # (wurden beim Laden der Pane bereits mit eingelesen)
+        raw_data = pane.raw_data
+        if raw_data is not None and not raw_data.get('success'):
             raw_data = None
 
         vorschau = _DispoZeitenVorschauDialog(pane.parsed_data, raw_data=raw_data, parent=self)
@@ -475,6 +475,22 @@ class EinstellungenWidget(QWidget):
 
         layout.addWidget(grp_archiv)
 
+        # ── Diagnose ─────────────────────────────────────────────
+        grp_diag = QGroupBox("🩺 Diagnose")
+        grp_diag.setStyleSheet(
+            "QGroupBox { font-weight: bold; font-size: 12px; "
+            "border: 2px solid #b8c8d8; border-radius: 6px; margin-top: 10px; padding-top: 8px; }"
+            "QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 4px; }"
+        )
+        grp_diag_layout = QHBoxLayout(grp_diag)
+        diag_btn = QPushButton("📊 Datenbank-Abfragen anzeigen")
+        diag_btn.setFixedHeight(34)
+        diag_btn.setToolTip("Laufzeiten aller SQL-Abfragen, langsame Abfragen und Query-Pläne")
+        diag_btn.clicked.connect(self._diagnose_oeffnen)
+        grp_diag_layout.addWidget(diag_btn)
+        grp_diag_layout.addStretch()
+        layout.addWidget(grp_diag)
+
         # ── Speichern-Button ───────────────────────────────────────────
         save_btn = QPushButton("💾 Einstellungen speichern")
         save_btn.setMinimumHeight(42)
@@ -761,6 +777,11 @@ class EinstellungenWidget(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Archiv konnte nicht geladen werden:\n{e}")
 
+    def _diagnose_oeffnen(self):
+        """Öffnet den Diagnose-Dialog mit den gemessenen DB-Abfragen."""
+        from gui.diagnose_dialog import DiagnoseDialog
+        DiagnoseDialog(self).exec()
+
     def _archiv_details_popup(self):
         """Zeigt ein Detail-Popup für das ausgewählte Archiv-Protokoll."""
         selected = self._archiv_list.selectedItems()
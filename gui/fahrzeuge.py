@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView, QDateEdit,
     QDialog, QDialogButtonBox, QCheckBox, QSizePolicy, QInputDialog
 )
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtCore import Qt, QDate, QTimer
 from PySide6.QtGui import QFont, QColor
 
 from config import FIORI_BLUE, FIORI_TEXT, FIORI_WHITE, FIORI_BORDER, FIORI_SUCCESS, FIORI_ERROR, FIORI_SIDEBAR_BG
@@ -29,8 +29,13 @@ from functions.fahrzeug_functions import (
     markiere_schaden_behoben, loesche_schaden,
     erstelle_termin, aktualisiere_termin, lade_termine,
     markiere_termin_erledigt, loesche_termin,
-    lade_komplette_historie,
+    lade_historie_seite, historie_cursor, lade_historie_jahre,
+    lade_fahrzeug_suchtexte,
 )
+from functions.fahrzeug_auswertung import (
+    ausfall_bericht, export_ausfall_excel, AUSFALL_STATUS,
+)
+from database.datum_sql import zeitraum
 
 # ── Hilfsdaten ────────────────────────────────────────────────────────────────
 STATUS_META = {
@@ -436,10 +441,16 @@ class _TerminDialog(QDialog):
 class FahrzeugeWidget(QWidget):
     """Haupt-Widget für die Fahrzeugverwaltung."""
 
+    # Änderungs-Monitor (database/aenderungen.py): refresh() nur bei Änderungen
+    ABO_TABELLEN = ("fahrzeuge", "fahrzeug_status", "fahrzeug_schaeden", "fahrzeug_termine")
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._aktives_fid: int | None = None
         self._liste_items: dict = {}  # fid → (frame, status, aktiv)
+        self._fz_suchindex: dict = {}  # fid → {bereich: suchtext}, aufgebaut in _refresh_liste
+        self._ausfall_bericht: dict | None = None  # zuletzt berechnete Auswertung
+        self._ausfall_veraltet = False              # Daten seit der Berechnung geändert
         self._build_ui()
         self.refresh()
 
@@ -456,7 +467,20 @@ class FahrzeugeWidget(QWidget):
         splitter.addWidget(self._build_liste())
         splitter.addWidget(self._build_detail())
         splitter.setSizes([260, 740])
-        root.addWidget(splitter, 1)
+
+        self._haupt_tabs = QTabWidget()
+        self._haupt_tabs.setStyleSheet("""
+            QTabWidget::pane{border:none;}
+            QTabBar::tab{padding:6px 18px;font-size:12px;}
+            QTabBar::tab:selected{font-weight:bold;border-bottom:2px solid #0a6ed1;color:#0a6ed1;}
+        """)
+        self._haupt_tabs.addTab(splitter, "🚗 Fahrzeuge")
+        self._haupt_tabs.addTab(self._build_auswertung(), "📊 Ausfallzeiten")
+        # Auswertung erst beim Öffnen des Tabs berechnen (bzw. wenn veraltet)
+        self._haupt_tabs.currentChanged.connect(
+            lambda i: i == 1 and self._auswertung_bei_bedarf()
+        )
+        root.addWidget(self._haupt_tabs, 1)
 
     def _build_header(self) -> QWidget:
         h = QFrame()
@@ -481,6 +505,165 @@ class FahrzeugeWidget(QWidget):
         layout.addWidget(btn)
         return h
 
+    # ── Ausfallzeiten-Auswertung ───────────────────────────────────────────────
+
+    def _build_auswertung(self) -> QWidget:
+        w = QWidget()
+        layout = QVBoxLayout(w)
+        layout.setContentsMargins(16, 12, 16, 12)
+        layout.setSpacing(8)
+
+        # Zeitraum + Aktionen
+        row = QHBoxLayout()
+        heute = QDate.currentDate()
+        row.addWidget(QLabel("Von:"))
+        self._aus_von = QDateEdit(QDate(heute.year(), 1, 1))
+        self._aus_von.setCalendarPopup(True)
+        self._aus_von.setDisplayFormat("dd.MM.yyyy")
+        self._aus_von.setStyleSheet(_field_style())
+        row.addWidget(self._aus_von)
+        row.addWidget(QLabel("Bis:"))
+        self._aus_bis = QDateEdit(heute)
+        self._aus_bis.setCalendarPopup(True)
+        self._aus_bis.setDisplayFormat("dd.MM.yyyy")
+        self._aus_bis.setStyleSheet(_field_style())
+        row.addWidget(self._aus_bis)
+        self._aus_nur_aktive = QCheckBox("Nur aktive Fahrzeuge")
+        self._aus_nur_aktive.setChecked(True)
+        row.addSpacing(12)
+        row.addWidget(self._aus_nur_aktive)
+        row.addStretch()
+        btn_calc = QPushButton("🔄 Berechnen")
+        btn_calc.setStyleSheet(_btn_style(FIORI_BLUE, "#0855a9"))
+        btn_calc.clicked.connect(self._auswertung_laden)
+        btn_xls = QPushButton("📥 Excel-Export")
+        btn_xls.setStyleSheet(_btn_style("#217346", "#185c37"))
+        btn_xls.clicked.connect(self._auswertung_exportieren)
+        row.addWidget(btn_calc)
+        row.addWidget(btn_xls)
+        layout.addLayout(row)
+
+        self._aus_summe = QLabel("")
+        self._aus_summe.setStyleSheet(f"color:{FIORI_TEXT};font-size:12px;")
+        self._aus_summe.setWordWrap(True)
+        layout.addWidget(self._aus_summe)
+
+        def _tabelle(kopf: list[str]) -> QTableWidget:
+            t = QTableWidget(0, len(kopf))
+            t.setHorizontalHeaderLabels(kopf)
+            t.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+            t.horizontalHeader().setStretchLastSection(True)
+            t.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+            t.setAlternatingRowColors(True)
+            t.setStyleSheet("QTableWidget{border:1px solid #ddd;font-size:12px;}")
+            t.verticalHeader().setVisible(False)
+            return t
+
+        status_kopf = [STATUS_META[s]["label"] for s in STATUS_KEYS]
+        self._aus_tab_fz = _tabelle(
+            ["Kennzeichen", "Typ", "Tage", "Ausfalltage", "Verfügbarkeit %"] + status_kopf
+        )
+        self._aus_tab_fz.setSortingEnabled(True)
+        self._aus_tab_mo = _tabelle(
+            ["Monat", "Fahrzeugtage", "Ausfalltage", "Verfügbarkeit %"] + status_kopf
+        )
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self._aus_tab_fz)
+        splitter.addWidget(self._aus_tab_mo)
+        splitter.setSizes([360, 240])
+        layout.addWidget(splitter, 1)
+        return w
+
+    def _auswertung_bei_bedarf(self):
+        if self._ausfall_bericht is None or self._ausfall_veraltet:
+            self._auswertung_laden()
+
+    def _auswertung_laden(self):
+        self._ausfall_veraltet = False
+        von = self._aus_von.date()
+        bis = self._aus_bis.date().addDays(1)   # Bis-Datum inklusive
+        try:
+            self._ausfall_bericht = ausfall_bericht(
+                von.toString("yyyy-MM-dd"), bis.toString("yyyy-MM-dd"),
+                nur_aktive=self._aus_nur_aktive.isChecked(),
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler", f"Auswertung fehlgeschlagen:\n{e}")
+            return
+        b = self._ausfall_bericht
+
+        def _zahl(wert) -> QTableWidgetItem:
+            item = QTableWidgetItem()
+            item.setData(Qt.ItemDataRole.DisplayRole, wert)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            return item
+
+        def _prozent(wert):
+            return round(wert * 100, 1) if wert is not None else "–"
+
+        t = self._aus_tab_fz
+        t.setSortingEnabled(False)
+        t.setRowCount(len(b["fahrzeuge"]))
+        for r, fz in enumerate(b["fahrzeuge"]):
+            t.setItem(r, 0, QTableWidgetItem(fz["kennzeichen"]))
+            t.setItem(r, 1, QTableWidgetItem(fz["typ"]))
+            t.setItem(r, 2, _zahl(int(fz["tage"])))
+            t.setItem(r, 3, _zahl(round(fz["ausfall_tage"], 1)))
+            it = _zahl(_prozent(fz["verfuegbarkeit"]))
+            if fz["verfuegbarkeit"] is not None and fz["verfuegbarkeit"] < 0.9:
+                it.setForeground(QColor(FIORI_ERROR))
+            t.setItem(r, 4, it)
+            for c, sk in enumerate(STATUS_KEYS, 5):
+                t.setItem(r, c, _zahl(round(fz["je_status"].get(sk, 0.0), 1)))
+        t.setSortingEnabled(True)
+
+        t = self._aus_tab_mo
+        t.setRowCount(len(b["monate"]))
+        for r, mo in enumerate(b["monate"]):
+            t.setItem(r, 0, QTableWidgetItem(mo["monat"]))
+            t.setItem(r, 1, _zahl(int(mo["fahrzeug_tage"])))
+            t.setItem(r, 2, _zahl(round(mo["ausfall_tage"], 1)))
+            t.setItem(r, 3, _zahl(_prozent(mo["verfuegbarkeit"])))
+            for c, sk in enumerate(STATUS_KEYS, 4):
+                t.setItem(r, c, _zahl(round(mo["je_status"].get(sk, 0.0), 1)))
+
+        gesamt = sum(fz["tage"] for fz in b["fahrzeuge"])
+        ausfall = sum(fz["ausfall_tage"] for fz in b["fahrzeuge"])
+        je = "  ·  ".join(
+            f"{STATUS_META[sk]['label']}: {b['je_status'].get(sk, 0.0):.0f} T"
+            for sk in AUSFALL_STATUS
+        )
+        self._aus_summe.setText(
+            f"{len(b['fahrzeuge'])} Fahrzeuge · {gesamt:.0f} Fahrzeugtage · "
+            f"{ausfall:.0f} Ausfalltage · Verfügbarkeit "
+            f"{(1 - ausfall / gesamt) * 100 if gesamt else 100:.1f} %   |   {je}"
+        )
+
+    def _auswertung_exportieren(self):
+        if self._ausfall_bericht is None:
+            self._auswertung_laden()
+        if not self._ausfall_bericht or not self._ausfall_bericht["fahrzeuge"]:
+            QMessageBox.information(self, "Kein Inhalt", "Keine Status-Daten im gewählten Zeitraum.")
+            return
+        from PySide6.QtWidgets import QFileDialog
+        b = self._ausfall_bericht
+        vorschlag = f"Fahrzeug_Ausfallzeiten_{b['von']}_{b['bis']}.xlsx"
+        ziel, _ = QFileDialog.getSaveFileName(
+            self, "Excel-Datei speichern", vorschlag, "Excel-Dateien (*.xlsx)"
+        )
+        if not ziel:
+            return
+        try:
+            pfad = export_ausfall_excel(b, ziel)
+        except ImportError as e:
+            QMessageBox.critical(self, "Modul fehlt", str(e))
+            return
+        except Exception as exc:
+            QMessageBox.critical(self, "Export-Fehler", f"Fehler beim Exportieren:\n{exc}")
+            return
+        QMessageBox.information(self, "Export", f"Gespeichert:\n{pfad}")
+
     # ── Fahrzeug-Liste ─────────────────────────────────────────────────────────
 
     def _build_liste(self) -> QWidget:
@@ -513,7 +696,12 @@ class FahrzeugeWidget(QWidget):
             "Termine: in Wartungs-/TÜV-Terminen suchen\n"
             "Historie: in der vollständigen Statushistorie suchen"
         )
-        self._fz_search.textChanged.connect(self._apply_fahrzeug_filter)
+        # Filter erst nach kurzer Tipp-Pause anwenden
+        self._fz_filter_timer = QTimer(self)
+        self._fz_filter_timer.setSingleShot(True)
+        self._fz_filter_timer.setInterval(150)
+        self._fz_filter_timer.timeout.connect(self._apply_fahrzeug_filter)
+        self._fz_search.textChanged.connect(lambda _: self._fz_filter_timer.start())
 
         filter_row = QHBoxLayout()
         filter_lbl = QLabel("Filter:")
@@ -556,69 +744,62 @@ class FahrzeugeWidget(QWidget):
                 item.widget().deleteLater()
 
         fahrzeuge = lade_alle_fahrzeuge()
+        try:
+            suchtexte = lade_fahrzeug_suchtexte()
+        except Exception:
+            suchtexte = {}
+        self._fz_suchindex = {}
         for f in fahrzeuge:
             frame = self._make_liste_item(f)
             self._liste_layout.insertWidget(self._liste_layout.count() - 1, frame)
-            self._liste_items[f["id"]] = (frame, f.get("aktueller_status") or "fahrbereit", bool(f.get("aktiv", 1)))
+            status = f.get("aktueller_status") or "fahrbereit"
+            self._liste_items[f["id"]] = (frame, status, bool(f.get("aktiv", 1)))
+            self._fz_suchindex[f["id"]] = self._suchindex_eintrag(f, status, suchtexte.get(f["id"], {}))
         self._update_liste_selection()
         self._apply_fahrzeug_filter()
 
+    @staticmethod
+    def _suchindex_eintrag(f: dict, status: str, texte: dict) -> dict:
+        """Suchtexte eines Fahrzeugs je Filterbereich (Kleinbuchstaben)."""
+        sm = STATUS_META.get(status, {})
+        termine = texte.get("termine", "")
+        termin_labels = " ".join(
+            label.lower() for key, label in TERMIN_TYP_META.items() if key in termine
+        )
+        return {
+            "basis":    f"{f.get('kennzeichen') or ''} {f.get('typ') or ''}".lower(),
+            "status":   f"{sm.get('label') or ''} {status}".lower(),
+            "schaeden": texte.get("schaeden", ""),
+            "termine":  f"{termine} {termin_labels}",
+            "historie": texte.get("historie", ""),
+        }
+
+    # Filterbereich → durchsuchte Einträge des Suchindex
+    _FILTER_BEREICHE = {
+        "Status":   ("basis", "status"),
+        "Schäden":  ("basis", "schaeden"),
+        "Termine":  ("basis", "termine"),
+        "Historie": ("basis", "historie"),
+        "Alle":     ("basis", "status", "schaeden", "termine"),
+    }
+
     def _apply_fahrzeug_filter(self):
-        """Zeigt/versteckt Fahrzeuge anhand des Suchtextes und des gewählten Filters."""
+        """
+        Zeigt/versteckt Fahrzeuge anhand des Suchtextes und des gewählten Filters.
+        Sucht nur im Suchindex (_refresh_liste), ohne Datenbankzugriff.
+        """
+        self._fz_filter_timer.stop()
         text = self._fz_search.text().strip().lower()
-        filter_mode = self._fz_filter_combo.currentText()
+        bereiche = self._FILTER_BEREICHE.get(
+            self._fz_filter_combo.currentText(), self._FILTER_BEREICHE["Alle"]
+        )
 
         for fid, (frame, status, aktiv) in self._liste_items.items():
             if not text:
                 frame.setVisible(True)
                 continue
-
-            fz = lade_fahrzeug(fid) or {}
-            kz  = (fz.get("kennzeichen") or "").lower()
-            typ = (fz.get("typ") or "").lower()
-            match_basis = text in kz or text in typ
-
-            if filter_mode == "Status":
-                sm = STATUS_META.get(status, {})
-                match = match_basis or text in (sm.get("label") or "").lower() or text in (status or "").lower()
-
-            elif filter_mode == "Schäden":
-                schaeden = lade_schaeden(fid) or []
-                match = match_basis or any(
-                    text in (s.get("beschreibung") or "").lower() or
-                    text in (s.get("kommentar") or "").lower() or
-                    text in (s.get("schwere") or "").lower()
-                    for s in schaeden
-                )
-
-            elif filter_mode == "Termine":
-                termine = lade_termine(fid) or []
-                match = match_basis or any(
-                    text in (t.get("typ") or "").lower() or
-                    text in (t.get("notiz") or "").lower()
-                    for t in termine
-                )
-
-            elif filter_mode == "Historie":
-                historie = lade_komplette_historie(fid) or []
-                match = match_basis or any(
-                    text in (h.get("status") or "").lower() or
-                    text in (h.get("notiz") or "").lower() or
-                    text in (h.get("datum") or "").lower()
-                    for h in historie
-                )
-
-            else:  # Alle
-                schaeden = lade_schaeden(fid) or []
-                termine  = lade_termine(fid) or []
-                match = (
-                    match_basis
-                    or text in (STATUS_META.get(status, {}).get("label") or "").lower()
-                    or any(text in (s.get("beschreibung") or "").lower() for s in schaeden)
-                    or any(text in (t.get("typ") or "").lower() for t in termine)
-                )
-
-            frame.setVisible(match)
+            eintrag = self._fz_suchindex.get(fid, {})
+            frame.setVisible(any(text in eintrag.get(b, "") for b in bereiche))
 
     def _make_liste_item(self, f: dict) -> QFrame:
         fid     = f["id"]
@@ -770,7 +951,12 @@ class FahrzeugeWidget(QWidget):
         tabs.addTab(self._tab_status(fid, stat_key), "🚦 Status")
         tabs.addTab(self._tab_schaeden(fid),       "⚠ Schäden")
         tabs.addTab(self._tab_termine(fid),        "📅 Termine")
-        tabs.addTab(self._tab_historie(fid),       "📜 Historie")
+        historie = self._tab_historie(fid)
+        tabs.addTab(historie,                      "📜 Historie")
+        # Historie erst beim ersten Öffnen des Tabs laden
+        tabs.currentChanged.connect(
+            lambda i: tabs.widget(i) is historie and historie.laden()
+        )
 
         layout.addWidget(tabs, 1)
 
@@ -1213,7 +1399,14 @@ class FahrzeugeWidget(QWidget):
 
     # ── Tab: Historie ──────────────────────────────────────────────────────────
 
+    _HISTORIE_SEITE = 100
+
     def _tab_historie(self, fid: int) -> QWidget:
+        """
+        Historie seitenweise: die erste Seite beim Öffnen des Tabs (w.laden()),
+        weitere beim Scrollen ans Tabellenende. Jahr/Monat/Art-Filter werden
+        als neue Abfrage an die DB gegeben.
+        """
         w = QWidget()
         layout = QVBoxLayout(w)
         layout.setContentsMargins(16, 12, 16, 12)
@@ -1228,7 +1421,63 @@ class FahrzeugeWidget(QWidget):
             "schaden": "⚠ Schaden",
             "termin": "📅 Termin",
         }
+        MONATE = ["Jan", "Feb", "Mär", "Apr", "Mai", "Jun",
+                  "Jul", "Aug", "Sep", "Okt", "Nov", "Dez"]
+        _cb_style = (
+            "QComboBox{background:white;border:1px solid #ccc;border-radius:3px;"
+            "padding:2px 6px;font-size:11px;}"
+        )
+        _lbl_style = "border:none; font-size:11px; color:#444;"
+
+        # ── Filterleiste ──────────────────────────────────────────────────────
+        bar = QFrame()
+        bar.setStyleSheet(
+            "QFrame{background:#f5f6fa; border:1px solid #e0e4ec; border-radius:4px;}"
+        )
+        bl = QHBoxLayout(bar)
+        bl.setContentsMargins(8, 4, 8, 4)
+        bl.setSpacing(6)
+
+        lbl_j = QLabel("Jahr:")
+        lbl_j.setStyleSheet(_lbl_style)
+        bl.addWidget(lbl_j)
+        jahr_cb = QComboBox()
+        jahr_cb.setToolTip("Einträge nach Jahr filtern")
+        jahr_cb.addItem("Alle", None)
+        jahr_cb.setStyleSheet(_cb_style)
+        bl.addWidget(jahr_cb)
 
+        bl.addSpacing(12)
+        lbl_m = QLabel("Monat:")
+        lbl_m.setStyleSheet(_lbl_style)
+        bl.addWidget(lbl_m)
+        monat_cb = QComboBox()
+        monat_cb.setToolTip("Einträge nach Monat filtern")
+        monat_cb.addItem("Alle", None)
+        for i, m in enumerate(MONATE, 1):
+            monat_cb.addItem(f"{i:02d} – {m}", i)
+        monat_cb.setStyleSheet(_cb_style)
+        bl.addWidget(monat_cb)
+
+        bl.addSpacing(12)
+        lbl_a = QLabel("Art:")
+        lbl_a.setStyleSheet(_lbl_style)
+        bl.addWidget(lbl_a)
+        art_cb = QComboBox()
+        art_cb.setToolTip("Einträge nach Art filtern")
+        art_cb.addItem("Alle", None)
+        for art, lbl in ART_LABELS.items():
+            art_cb.addItem(lbl, art)
+        art_cb.setStyleSheet(_cb_style)
+        bl.addWidget(art_cb)
+        bl.addStretch()
+
+        lbl_anzahl = QLabel("")
+        lbl_anzahl.setStyleSheet(_lbl_style)
+        bl.addWidget(lbl_anzahl)
+        layout.addWidget(bar)
+
+        # ── Tabelle ───────────────────────────────────────────────────────────
         table = QTableWidget()
         table.setColumnCount(6)
         table.setHorizontalHeaderLabels(["Datum", "Art", "Titel/Status", "Bis", "Details", "Kommentar"])
@@ -1238,34 +1487,87 @@ class FahrzeugeWidget(QWidget):
         table.setAlternatingRowColors(True)
         table.setStyleSheet("QTableWidget{border:1px solid #ddd;font-size:12px;}")
         table.verticalHeader().setVisible(False)
-
-        eintraege = lade_komplette_historie(fid)
-        table.setRowCount(len(eintraege))
-        for row, e in enumerate(eintraege):
-            art = e.get("art","")
-            farbe = INFO_COLORS.get(art, FIORI_TEXT)
-            art_lbl = ART_LABELS.get(art, art)
-
-            titel = e.get("titel","") or ""
-            if art == "status":
-                sm = STATUS_META.get(titel, STATUS_META["sonstiges"])
-                titel = sm["label"]
-                bis_raw = e.get("bis","")
-                bis_str = _fmt_date(bis_raw) if bis_raw else "unbestimmt"
-            else:
-                bis_str = "–"
-
-            table.setItem(row, 0, QTableWidgetItem(_fmt_date(e.get("datum",""))))
-            it_art = QTableWidgetItem(art_lbl)
-            it_art.setForeground(QColor(farbe))
-            table.setItem(row, 1, it_art)
-            table.setItem(row, 2, QTableWidgetItem(titel))
-            table.setItem(row, 3, QTableWidgetItem(bis_str))
-            table.setItem(row, 4, QTableWidgetItem(e.get("beschreibung","") or "–"))
-            table.setItem(row, 5, QTableWidgetItem(e.get("kommentar","") or "–"))
-
-        self._add_zeitfilter(layout, eintraege, "datum", table)
         layout.addWidget(table, 1)
+
+        # Ladezustand: Cursor der letzten Zeile, None = keine weiteren Seiten
+        zustand = {"geladen": False, "cursor": None, "weitere": True}
+
+        def _filter() -> dict:
+            jahr, monat = jahr_cb.currentData(), monat_cb.currentData()
+            art = art_cb.currentData()
+            von = bis = None
+            if jahr:
+                von, bis = zeitraum(int(jahr), monat)
+                monat = None
+            return {"von": von, "bis": bis, "monat": monat,
+                    "arten": (art,) if art else None}
+
+        def _seite_anhaengen():
+            if not zustand["weitere"]:
+                return
+            eintraege = lade_historie_seite(
+                fid, nach=zustand["cursor"], limit=self._HISTORIE_SEITE, **_filter()
+            )
+            zustand["weitere"] = len(eintraege) == self._HISTORIE_SEITE
+            if eintraege:
+                zustand["cursor"] = historie_cursor(eintraege[-1])
+
+            row = table.rowCount()
+            table.setRowCount(row + len(eintraege))
+            for e in eintraege:
+                art = e.get("art","")
+                farbe = INFO_COLORS.get(art, FIORI_TEXT)
+                art_lbl = ART_LABELS.get(art, art)
+
+                titel = e.get("titel","") or ""
+                if art == "status":
+                    sm = STATUS_META.get(titel, STATUS_META["sonstiges"])
+                    titel = sm["label"]
+                    bis_raw = e.get("bis","")
+                    bis_str = _fmt_date(bis_raw) if bis_raw else "unbestimmt"
+                else:
+                    bis_str = "–"
+
+                table.setItem(row, 0, QTableWidgetItem(_fmt_date(e.get("datum",""))))
+                it_art = QTableWidgetItem(art_lbl)
+                it_art.setForeground(QColor(farbe))
+                table.setItem(row, 1, it_art)
+                table.setItem(row, 2, QTableWidgetItem(titel))
+                table.setItem(row, 3, QTableWidgetItem(bis_str))
+                table.setItem(row, 4, QTableWidgetItem(e.get("beschreibung","") or "–"))
+                table.setItem(row, 5, QTableWidgetItem(e.get("kommentar","") or "–"))
+                row += 1
+
+            lbl_anzahl.setText(
+                f"{table.rowCount()}{'+' if zustand['weitere'] else ''} Einträge"
+            )
+            # Passt die Seite komplett in die Ansicht, gibt es keinen
+            # Scrollbalken → direkt nachladen
+            if zustand["weitere"] and table.verticalScrollBar().maximum() == 0:
+                QTimer.singleShot(0, _seite_anhaengen)
+
+        def _neu_laden():
+            zustand.update(geladen=True, cursor=None, weitere=True)
+            table.setRowCount(0)
+            _seite_anhaengen()
+
+        def _laden():
+            if zustand["geladen"]:
+                return
+            for jahr in lade_historie_jahre(fid):
+                jahr_cb.addItem(jahr, jahr)
+            _neu_laden()
+
+        def _gescrollt(wert: int):
+            sb = table.verticalScrollBar()
+            if zustand["geladen"] and zustand["weitere"] and wert >= sb.maximum() - 5:
+                _seite_anhaengen()
+
+        table.verticalScrollBar().valueChanged.connect(_gescrollt)
+        for cb in (jahr_cb, monat_cb, art_cb):
+            cb.currentIndexChanged.connect(lambda _: zustand["geladen"] and _neu_laden())
+
+        w.laden = _laden
         return w
 
     # ── Aktionen ───────────────────────────────────────────────────────────────
@@ -1455,3 +1757,14 @@ class FahrzeugeWidget(QWidget):
         self._refresh_liste()
         if self._aktives_fid:
             self._zeige_fahrzeug(self._aktives_fid)
+        if self._ausfall_bericht is not None:
+            # Nur neu berechnen, wenn die Auswertung gerade sichtbar ist
+            self._ausfall_veraltet = True
+            if self.isVisible() and self._haupt_tabs.currentIndex() == 1:
+                self._auswertung_laden()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Veraltete Auswertung nachholen, wenn die Seite mit offenem Tab erscheint
+        if self._haupt_tabs.currentIndex() == 1 and self._ausfall_veraltet:
+            self._auswertung_laden()
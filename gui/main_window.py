@@ -9,10 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QPushButton, QLabel, QStackedWidget, QFrame, QSizePolicy
+    QPushButton, QLabel, QStackedWidget, QFrame, QSizePolicy, QApplication
 )
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QFont, QColor, QPixmap
+from PySide6.QtCore import Qt, QSize, QUrl, QTimer
+from PySide6.QtGui import QFont, QColor, QPixmap, QShortcut, QKeySequence, QDesktopServices
 
 from config import (
     APP_NAME, APP_VERSION, BASE_DIR,
@@ -30,6 +30,7 @@ from gui.dokument_browser       import DokumentBrowserWidget
 from gui.mitarbeiter_dokumente  import MitarbeiterDokumenteWidget
 from gui.hilfe_dialog           import HilfeDialog
 from gui.dienstliches           import DienstlichesWidget
+from gui.suchpalette            import SuchPalette
 
 
 NAV_ITEMS = [
@@ -115,9 +116,27 @@ class MainWindow(QMainWindow):
         self.resize(1280, 800)
         self.setMinimumSize(900, 600)
         self._nav_buttons: list[SidebarButton] = []
+        self._abo_stand: dict = {}   # Seite → zuletzt geladener Änderungsstand
         self._build_ui()
         self._navigate(0)
 
+        # Änderungen (auch anderer PCs) erkennen und sichtbare Seite nachladen
+        from database.aenderungen import PRUEF_INTERVALL_MS
+        self._aenderungs_timer = QTimer(self)
+        self._aenderungs_timer.setInterval(PRUEF_INTERVALL_MS)
+        self._aenderungs_timer.timeout.connect(self._auf_aenderungen_pruefen)
+        self._aenderungs_timer.start()
+
+        # Schnellsuche über alle Module (Index wird im Hintergrund gepflegt)
+        self._suchpalette = SuchPalette(self)
+        self._suchpalette.eintrag_gewaehlt.connect(self._oeffne_suchtreffer)
+        QShortcut(QKeySequence("Ctrl+K"), self, activated=self._suchpalette.zeige)
+        try:
+            from functions.suchindex import starte_hintergrund
+            starte_hintergrund()
+        except Exception as e:
+            print(f"[WARNUNG] Suchindex nicht verfügbar: {e}")
+
     # ── UI aufbauen ────────────────────────────────────────────────────────────
     def _build_ui(self):
         central = QWidget()
@@ -274,6 +293,9 @@ class MainWindow(QMainWindow):
             btn.setActive(i == index)
         self._stack.setCurrentIndex(index)
 
+        if not self._abo_geaendert(self._stack.widget(index)):
+            return   # Seite zeigt bereits den aktuellen Stand
+
         if index == 0:
             self._dashboard_page.refresh()
         elif index == 1:
@@ -296,3 +318,49 @@ class MainWindow(QMainWindow):
             self._ausdrucke_page.refresh()
         elif index == 10:
             self._krankmeldungen_page.refresh()
+
+    # ── Änderungs-Monitor ──────────────────────────────────────────────────────
+    def _abo_geaendert(self, page) -> bool:
+        """
+        True, wenn die Seite neu laden muss: Seiten ohne Abo (ABO_TABELLEN /
+        ABO_DATENBANKEN) immer, sonst nur bei geändertem Stand.
+        Der Stand wird vor dem Neuladen gemerkt – Änderungen während des
+        Ladens führen so beim nächsten Mal erneut zum Neuladen.
+        """
+        tabellen    = getattr(page, "ABO_TABELLEN", ())
+        datenbanken = getattr(page, "ABO_DATENBANKEN", ())
+        if not tabellen and not datenbanken:
+            return True
+        try:
+            from database.aenderungen import stand
+            neu = stand(tabellen, datenbanken)
+        except Exception:
+            return True
+        if self._abo_stand.get(page) == neu:
+            return False
+        self._abo_stand[page] = neu
+        return True
+
+    def _auf_aenderungen_pruefen(self):
+        """Timer: fremde Änderungen erkennen, sichtbare abonnierte Seite nachladen."""
+        try:
+            from database.aenderungen import pruefen
+            pruefen()
+        except Exception:
+            return
+        # Nicht in offene Dialoge / Popups hinein neu laden
+        if QApplication.activeModalWidget() or QApplication.activePopupWidget():
+            return
+        page = self._stack.currentWidget()
+        if (getattr(page, "ABO_TABELLEN", ()) or getattr(page, "ABO_DATENBANKEN", ())) \
+                and self._abo_geaendert(page):
+            page.refresh()
+
+    # ── Schnellsuche ───────────────────────────────────────────────────────────
+    def _oeffne_suchtreffer(self, treffer: dict):
+        """Öffnet Dokument-Treffer direkt, bei Datensätzen wird zur Seite gewechselt."""
+        ziel = treffer.get("ziel") or ""
+        if os.path.isabs(ziel) and os.path.isfile(ziel):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(ziel))
+        elif treffer.get("seite") is not None:
+            self._navigate(int(treffer["seite"]))
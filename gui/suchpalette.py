@@ -0,0 +1,129 @@
+"""
+Schnellsuche (Strg+K)
+Befehlspaletten-Dialog über dem Hauptfenster: durchsucht den globalen
+Suchindex (functions/suchindex.py) während der Eingabe.
+"""
+from __future__ import annotations
+
+import re
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel,
+)
+from PySide6.QtCore import Qt, QTimer, Signal
+
+from config import FIORI_TEXT
+
+
+class SuchPalette(QDialog):
+    """Eingabezeile + Trefferliste; Enter öffnet den gewählten Treffer."""
+
+    # Treffer-dict aus suchindex.suche()
+    eintrag_gewaehlt = Signal(dict)
+
+    SUCH_VERZOEGERUNG_MS = 120
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
+        self.setMinimumWidth(640)
+        self.setStyleSheet("""
+            QDialog { background: white; border: 1px solid #c8d1dc; border-radius: 6px; }
+            QLineEdit {
+                border: none; border-bottom: 1px solid #e0e5eb;
+                padding: 10px 12px; font-size: 15px;
+            }
+            QListWidget { border: none; font-size: 12px; }
+            QListWidget::item { padding: 6px 10px; border-bottom: 1px solid #f0f2f4; }
+            QListWidget::item:selected { background: #eef4fa; color: %s; }
+        """ % FIORI_TEXT)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self._eingabe = QLineEdit()
+        self._eingabe.setPlaceholderText(
+            "🔍  Suchen in Protokollen, Schäden, Stellungnahmen, Einsätzen, Dokumenten …"
+        )
+        self._eingabe.textChanged.connect(lambda _: self._timer.start())
+        self._eingabe.returnPressed.connect(self._oeffnen)
+        self._eingabe.installEventFilter(self)
+        layout.addWidget(self._eingabe)
+
+        self._liste = QListWidget()
+        self._liste.setMinimumHeight(360)
+        self._liste.itemActivated.connect(lambda _: self._oeffnen())
+        layout.addWidget(self._liste)
+
+        self._status = QLabel("")
+        self._status.setStyleSheet("color: #888; font-size: 10px; padding: 4px 10px;")
+        layout.addWidget(self._status)
+
+        # Suche erst nach kurzer Tipp-Pause
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SUCH_VERZOEGERUNG_MS)
+        self._timer.timeout.connect(self._suchen)
+
+    def zeige(self):
+        """Zentriert oben über dem Elternfenster anzeigen, Eingabe fokussieren."""
+        p = self.parentWidget()
+        if p is not None:
+            geo = p.geometry()
+            self.resize(min(760, geo.width() - 80), 440)
+            self.move(geo.x() + (geo.width() - self.width()) // 2, geo.y() + 80)
+        self._eingabe.selectAll()
+        self.show()
+        self._eingabe.setFocus()
+
+    def eventFilter(self, obj, event):
+        # Pfeiltasten aus der Eingabezeile an die Trefferliste weitergeben
+        if obj is self._eingabe and event.type() == event.Type.KeyPress:
+            if event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up):
+                zeile = self._liste.currentRow()
+                schritt = 1 if event.key() == Qt.Key.Key_Down else -1
+                zeile = max(0, min(self._liste.count() - 1, zeile + schritt))
+                self._liste.setCurrentRow(zeile)
+                return True
+        return super().eventFilter(obj, event)
+
+    def _suchen(self):
+        from functions.suchindex import suche, BEREICH_LABEL, MIN_ZEICHEN
+        text = self._eingabe.text().strip()
+        self._liste.clear()
+        if not text:
+            self._status.setText("")
+            return
+        if len(re.sub(r"\W", "", text)) < MIN_ZEICHEN:
+            self._status.setText(f"Mindestens {MIN_ZEICHEN} Zeichen eingeben …")
+            return
+        try:
+            treffer = suche(text)
+        except Exception as e:
+            self._status.setText(f"Suche nicht möglich: {e}")
+            return
+        for t in treffer:
+            zeile = f"{BEREICH_LABEL.get(t['bereich'], t['bereich'])}   {t['titel']}"
+            if t.get("untertitel"):
+                zeile += f"  ·  {t['untertitel']}"
+            if t.get("auszug"):
+                zeile += f"\n{t['auszug'].strip()}"
+            item = QListWidgetItem(zeile)
+            item.setData(Qt.ItemDataRole.UserRole, t)
+            self._liste.addItem(item)
+        if treffer:
+            self._liste.setCurrentRow(0)
+        self._status.setText(
+            f"{len(treffer)} Treffer  ·  ↑↓ auswählen  ·  Enter öffnen  ·  Esc schließen"
+        )
+
+    def _oeffnen(self):
+        if self._timer.isActive():
+            self._timer.stop()
+            self._suchen()
+        item = self._liste.currentItem()
+        if item is None:
+            return
+        self.hide()
+        self.eintrag_gewaehlt.emit(item.data(Qt.ItemDataRole.UserRole))
@@ -22,17 +22,13 @@ from config import (
     FIORI_SUCCESS, FIORI_ERROR, FIORI_SIDEBAR_BG
 )
 from functions.uebergabe_functions import (
-    erstelle_protokoll, aktualisiere_protokoll,
     lade_protokolle, lade_protokoll_by_id, loesche_protokoll,
     schliesse_protokoll_ab,
-    speichere_fahrzeug_notizen, lade_fahrzeug_notizen,
-    speichere_handy_eintraege, lade_handy_eintraege,
+    lade_handy_eintraege,
+    speichere_uebergabe,
 )
 from functions.fahrzeug_functions import (
-    lade_alle_fahrzeuge,
-    lade_termine as lade_fahrzeug_termine,
-    aktueller_status as aktueller_fahrzeug_status,
-    lade_schaeden_letzte_tage,
+    fleet_snapshot,
     markiere_schaden_gesendet,
 )
 
@@ -135,6 +131,9 @@ class _ProtokolListItem(QFrame):
 class UebergabeWidget(QWidget):
     """Haupt-Widget für Tagdienst- und Nachtdienst-Übergabeprotokolle."""
 
+    # Änderungs-Monitor (database/aenderungen.py): refresh() nur bei Änderungen
+    ABO_TABELLEN = ("uebergabe_protokolle",)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._aktives_protokoll_id: int | None = None
@@ -779,51 +778,47 @@ class UebergabeWidget(QWidget):
             ersteller        = self._f_ersteller.text().strip(),
         )
 
+        # Notizen + Handy-Einträge zusammen mit dem Protokoll speichern
+        notizen_fz = {
+            fid: w.text().strip()
+            for fid, w in self._fahrzeug_notiz_widgets.items()
+        }
+        eintraege_handy = [
+            (nr.text().strip(), notiz.text().strip())
+            for nr, notiz in self._handy_eintraege_widgets
+            if nr.text().strip()
+        ]
+        if self._ist_neu:
+            kwargs.update(datum=datum_str, schicht_typ=self._aktueller_typ)
+        else:
+            kwargs.update(abzeichner=self._f_abzeichner.text().strip(), status="offen")
+
         try:
-            if self._ist_neu:
-                new_id = erstelle_protokoll(
-                    datum=datum_str,
-                    schicht_typ=self._aktueller_typ,
-                    **kwargs
-                )
-                self._aktives_protokoll_id = new_id
-                self._ist_neu = False
-                self._btn_abschliessen.setEnabled(True)
-                self._btn_loeschen.setEnabled(True)
-                self._btn_email.setEnabled(True)
-                QMessageBox.information(
-                    self, "Gespeichert",
-                    f"Protokoll #{new_id} wurde erfolgreich gespeichert."
-                )
-            else:
-                aktualisiere_protokoll(
-                    protokoll_id=self._aktives_protokoll_id,
-                    abzeichner=self._f_abzeichner.text().strip(),
-                    status="offen",
-                    **kwargs
-                )
-                QMessageBox.information(
-                    self, "Gespeichert",
-                    f"Protokoll #{self._aktives_protokoll_id} wurde aktualisiert."
-                )
+            protokoll_id = speichere_uebergabe(
+                None if self._ist_neu else self._aktives_protokoll_id,
+                kwargs, notizen_fz, eintraege_handy,
+            )
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Speichern fehlgeschlagen:\n{e}")
             return
 
+        if self._ist_neu:
+            self._aktives_protokoll_id = protokoll_id
+            self._ist_neu = False
+            self._btn_abschliessen.setEnabled(True)
+            self._btn_loeschen.setEnabled(True)
+            self._btn_email.setEnabled(True)
+            QMessageBox.information(
+                self, "Gespeichert",
+                f"Protokoll #{protokoll_id} wurde erfolgreich gespeichert."
+            )
+        else:
+            QMessageBox.information(
+                self, "Gespeichert",
+                f"Protokoll #{protokoll_id} wurde aktualisiert."
+            )
+
         self._lade_liste()
-        # Notizen + Handy-Einträge speichern
-        if self._aktives_protokoll_id:
-            notizen_fz = {
-                fid: w.text().strip()
-                for fid, w in self._fahrzeug_notiz_widgets.items()
-            }
-            speichere_fahrzeug_notizen(self._aktives_protokoll_id, notizen_fz)
-            eintraege_handy = [
-                (nr.text().strip(), notiz.text().strip())
-                for nr, notiz in self._handy_eintraege_widgets
-                if nr.text().strip()
-            ]
-            speichere_handy_eintraege(self._aktives_protokoll_id, eintraege_handy)
 
     def _abschliessen(self):
         if self._aktives_protokoll_id is None:
@@ -884,15 +879,13 @@ class UebergabeWidget(QWidget):
                 item.widget().deleteLater()
         self._fahrzeug_notiz_widgets.clear()
 
-        fahrzeuge = lade_alle_fahrzeuge(nur_aktive=True)
+        fahrzeuge = fleet_snapshot(protokoll_id)["fahrzeuge"]
         if not fahrzeuge:
             lbl = QLabel("Keine aktiven Fahrzeuge vorhanden")
             lbl.setStyleSheet("color:#aaa;font-size:10px;border:none;")
             self._fahrzeug_section_layout.addWidget(lbl)
             return
 
-        existing = lade_fahrzeug_notizen(protokoll_id) if protokoll_id else {}
-
         _STAT_LABELS = {
             "fahrbereit":   "✅ Fahrbereit",
             "defekt":        "❌ Defekt",
@@ -913,13 +906,11 @@ class UebergabeWidget(QWidget):
             kz   = f.get("kennzeichen", "?")
             typ  = f.get("typ", "")
 
-            stat     = aktueller_fahrzeug_status(fid)
-            stat_key = (stat.get("status", "fahrbereit") if stat else "fahrbereit")
+            stat_key = f.get("aktueller_status") or "fahrbereit"
             stat_lbl = _STAT_LABELS.get(stat_key, stat_key)
             stat_col = _STAT_COLORS.get(stat_key, "#555")
 
-            termine       = lade_fahrzeug_termine(fid)
-            offene_termin = [t for t in termine if not t.get("erledigt")]
+            offene_termin = f["offene_termine"]
 
             frame = QFrame()
             frame.setStyleSheet(
@@ -968,7 +959,7 @@ class UebergabeWidget(QWidget):
                 "border:1px solid #ccc;border-radius:3px;"
                 "padding:2px 6px;font-size:11px;background:white;"
             )
-            ne.setText(existing.get(fid, ""))
+            ne.setText(f["notiz"])
             nr.addWidget(nl)
             nr.addWidget(ne)
             fl.addLayout(nr)
@@ -1009,26 +1000,20 @@ class UebergabeWidget(QWidget):
             "sonstiges":     "ℹ Sonstiges",
         }
         try:
-            alle_fz = lade_alle_fahrzeuge(nur_aktive=True)
-            fz_map  = {f["id"]: f for f in lade_alle_fahrzeuge()}
+            snapshot = fleet_snapshot(pid)
         except Exception:
-            alle_fz = []
-            fz_map  = {}
+            snapshot = {"fahrzeuge": [], "schaeden": []}
+        alle_fz = snapshot["fahrzeuge"]
 
         nicht_fb: list[tuple] = []
         for fz in alle_fz:
-            fid  = fz["id"]
-            stat = aktueller_fahrzeug_status(fid)
-            sk   = stat.get("status", "fahrbereit") if stat else "fahrbereit"
+            sk = fz.get("aktueller_status") or "fahrbereit"
             if sk != "fahrbereit":
                 nicht_fb.append((fz.get("kennzeichen", "?"), sk,
-                                  stat.get("grund", "") if stat else ""))
+                                  fz.get("status_grund") or ""))
 
         # ── Schäden letzte 7 Tage ─────────────────────────────────────────────
-        try:
-            all_schaeden = lade_schaeden_letzte_tage(7)
-        except Exception:
-            all_schaeden = []
+        all_schaeden = snapshot["schaeden"]
 
         offene_schaeden  = [s for s in all_schaeden if not s.get("gesendet")]
         bereits_gesendet = [s for s in all_schaeden if s.get("gesendet")]
@@ -1051,13 +1036,12 @@ class UebergabeWidget(QWidget):
             for fz in alle_fz:
                 fid   = fz["id"]
                 kz    = fz.get("kennzeichen", "?")
-                stat  = aktueller_fahrzeug_status(fid)
-                sk    = stat.get("status", "fahrbereit") if stat else "fahrbereit"
+                sk    = fz.get("aktueller_status") or "fahrbereit"
                 slbl  = _STAT_LABELS.get(sk, sk)
                 ne    = self._fahrzeug_notiz_widgets.get(fid)
-                notiz = ne.text().strip() if ne else ""
+                notiz = ne.text().strip() if ne else fz["notiz"].strip()
                 hint  = f" [{slbl}]" if sk != "fahrbereit" else ""
-                grund = f" – {stat['grund']}" if (sk != "fahrbereit" and stat and stat.get("grund")) else ""
+                grund = f" – {fz['status_grund']}" if (sk != "fahrbereit" and fz.get("status_grund")) else ""
                 lines.append(f"  • {kz}{hint}{grund}" + (f": {notiz}" if notiz else ""))
             if nicht_fb:
                 lines.append("")
@@ -46,6 +46,9 @@ def _db_startup_backup():
         src.backup(dst)
         dst.close()
         src.close()
+        # Pool-Verbindungen nach Backup neu aufbauen (nie alte Handles weiterverwenden)
+        from database.connection import reset_verbindungen
+        reset_verbindungen()
         # Nur die letzten 7 Backups behalten
         alle = sorted(glob.glob(os.path.join(backup_dir, "nesk3_*.db")))
         for alt in alle[:-7]:
@@ -160,4 +163,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Nötig für den Prozess-Pool des Dienstplan-Imports in der EXE (PyInstaller)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
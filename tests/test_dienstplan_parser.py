@@ -0,0 +1,177 @@
+"""
+Vergleichstest DienstplanParser: Streaming-Engine (schnell=True) gegen die
+Vollständig-Laden-Engine (schnell=False).
+
+Erzeugt Dienstpläne mit openpyxl (Abschnitte, Kranke, stille Dienste,
+Zellfarben, Kopfzeile auf verschiedenen Zeilen, fehlende Kopfzeile) und
+prüft, dass beide Engines in allen drei Ansichten identisch ausgeben.
+
+Ausführen:  python -m pytest tests   oder   python -m unittest discover tests
+"""
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+from openpyxl.styles import PatternFill
+
+from functions.dienstplan_parser import DienstplanParser
+
+# Ansicht → (alle_anzeigen, round_dispo), wie in parse_alle_ansichten()
+ANSICHTEN = {
+    "display": (True, True),
+    "export":  (False, True),
+    "raw":     (True, False),
+}
+
+_VORNAMEN  = ["Hans", "Anna", "Petra", "Lars", "Eva", "Uwe", "Olaf", "Tim", "Jana", "Mia"]
+_NACHNAMEN = ["Müller", "Meier", "Peters", "Schmidt", "Foo-Bar", "Bauschke", "Kranz", "Lang"]
+_DIENSTE   = ["T", "N", "K", "krank", "R", "DT", "DN", "T10", "N10", "XYZ", "", None]
+_ZEITEN    = [time(6, 0), time(7, 15), time(18, 0), time(19, 45), "18:00", "0915",
+              datetime(2026, 1, 1, 19, 20), None]
+_FARBEN    = ["FFFFFF00", "FFF5F5F5", "FFFF0000", "FF00B050"]
+
+
+def _kopf_und_zeilen(ws, kopf_zeile: int, zeilen: list, datum_zelle: str = "C2"):
+    ws["A1"] = "Dienstplan"
+    ws[datum_zelle] = datetime(2026, 3, 5)
+    for spalte, titel in enumerate(["NAME", "DIENST", "BEGINN", "ENDE"], 1):
+        ws.cell(row=kopf_zeile, column=spalte, value=titel)
+    for i, werte in enumerate(zeilen, kopf_zeile + 1):
+        for spalte, wert in enumerate(werte, 1):
+            ws.cell(row=i, column=spalte, value=wert)
+
+
+def _roster_fest(pfad: str, kopf_zeile: int = 4):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    zeilen = [
+        ("[Stamm FH]", None, None, None),
+        ("Müller, Hans", "T", time(6, 0), time(18, 0)),
+        ("Meier, Anna", "N", "18:00", "06:00"),
+        ("Müller, Petra", "K", time(6, 0), time(18, 0)),
+        ("Peters, Lars", "T", time(6, 0), time(18, 0)),
+        ("Schmidt, X", "R", time(6, 0), time(18, 0)),
+        ("Foo-Bar, Eva", "XYZ", "0915", "1700"),
+        ("Dispo", None, None, None),
+        ("Bauschke, Uwe", "DT", time(7, 15), time(19, 45)),
+        ("Kranz, Olaf", "krank", time(19, 30), time(7, 0)),
+        ("Lang, Tim", "DN", datetime(2026, 1, 1, 19, 20), None),
+        ("Kurz", None, None, None),
+        (None, "T", None, None),
+        ("Yellow, Ya", "T10", time(9, 0), time(19, 0)),
+    ]
+    _kopf_und_zeilen(ws, kopf_zeile, zeilen)
+    ws.cell(row=ws.max_row, column=1).fill = PatternFill("solid", fgColor="FFFFFF00")
+    ws.cell(row=kopf_zeile + 2, column=2).fill = PatternFill("solid", fgColor="FFF5F5F5")
+    ws.cell(row=kopf_zeile + 3, column=1).fill = PatternFill("solid", fgColor="FFF5F5F5")
+    ws.cell(row=kopf_zeile + 4, column=2).fill = PatternFill("solid", fgColor="FFFF0000")
+    wb.save(pfad)
+
+
+def _roster_zufall(pfad: str, seed: int):
+    rnd = random.Random(seed)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    kopf_zeile = rnd.choice([3, 4, 8, 19, 20])
+    zeilen = []
+    for _ in range(rnd.randint(20, 120)):
+        r = rnd.random()
+        if r < 0.08:
+            zeilen.append((rnd.choice(["Dispo", "[Stamm FH]", "Betreuer", "Kurz"]), None, None, None))
+        elif r < 0.12:
+            zeilen.append((None, rnd.choice(_DIENSTE), None, None))
+        else:
+            name = f"{rnd.choice(_NACHNAMEN)}, {rnd.choice(_VORNAMEN)}"
+            zeilen.append((name, rnd.choice(_DIENSTE), rnd.choice(_ZEITEN), rnd.choice(_ZEITEN)))
+    _kopf_und_zeilen(ws, kopf_zeile, zeilen)
+    for zeile in range(kopf_zeile + 1, kopf_zeile + 1 + len(zeilen)):
+        if rnd.random() < 0.15:
+            spalte = rnd.choice([1, 2])
+            ws.cell(row=zeile, column=spalte).fill = PatternFill("solid", fgColor=rnd.choice(_FARBEN))
+    wb.save(pfad)
+
+
+def _roster_ohne_kopf(pfad: str):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws["A1"] = "Kein Dienstplan"
+    ws.append(["Müller, Hans", "T", time(6, 0), time(18, 0)])
+    wb.save(pfad)
+
+
+def _normiert(ergebnis: dict) -> dict:
+    ergebnis = dict(ergebnis)
+    if "unbekannte_dienste" in ergebnis:
+        ergebnis["unbekannte_dienste"] = sorted(ergebnis["unbekannte_dienste"])
+    return ergebnis
+
+
+class StreamingEngineVergleich(unittest.TestCase):
+    """schnell=True muss für jede Ansicht dasselbe liefern wie schnell=False."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.dateien = []
+        for kopf in (4, 19, 20):
+            pfad = os.path.join(cls._tmp.name, f"fest_{kopf}.xlsx")
+            _roster_fest(pfad, kopf)
+            cls.dateien.append(pfad)
+        for seed in range(8):
+            pfad = os.path.join(cls._tmp.name, f"zufall_{seed}.xlsx")
+            _roster_zufall(pfad, seed)
+            cls.dateien.append(pfad)
+        pfad = os.path.join(cls._tmp.name, "ohne_kopf.xlsx")
+        _roster_ohne_kopf(pfad)
+        cls.dateien.append(pfad)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def setUp(self):
+        # Ausschlussliste fest vorgeben, statt die Einstellungs-DB zu lesen
+        patcher = mock.patch(
+            "functions.settings_functions.get_ausgeschlossene_namen",
+            return_value=["anna meier"],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_alle_ansichten(self):
+        for pfad in self.dateien:
+            for ansicht, (alle_anzeigen, round_dispo) in ANSICHTEN.items():
+                with self.subTest(datei=os.path.basename(pfad), ansicht=ansicht):
+                    schnell = DienstplanParser(pfad, alle_anzeigen, round_dispo, schnell=True).parse()
+                    voll    = DienstplanParser(pfad, alle_anzeigen, round_dispo, schnell=False).parse()
+                    self.assertEqual(_normiert(schnell), _normiert(voll))
+
+    def test_ein_durchlauf_gleich_einzelansichten(self):
+        for pfad in self.dateien:
+            for schnell in (True, False):
+                alle = DienstplanParser(pfad, schnell=schnell).parse_alle_ansichten()
+                for ansicht, (alle_anzeigen, round_dispo) in ANSICHTEN.items():
+                    with self.subTest(datei=os.path.basename(pfad), schnell=schnell, ansicht=ansicht):
+                        einzeln = DienstplanParser(
+                            pfad, alle_anzeigen, round_dispo, schnell=schnell
+                        ).parse()
+                        self.assertEqual(_normiert(alle[ansicht]), _normiert(einzeln))
+
+    def test_testdaten_decken_faelle_ab(self):
+        """Die erzeugten Pläne enthalten Personen, Kranke und einen Fehlerfall."""
+        ergebnisse = [DienstplanParser(p, True, True).parse() for p in self.dateien]
+        self.assertTrue(any(not e["success"] for e in ergebnisse))
+        erfolgreich = [e for e in ergebnisse if e["success"]]
+        self.assertTrue(erfolgreich)
+        self.assertTrue(any(e.get("kranke") for e in erfolgreich))
+
+
+if __name__ == "__main__":
+    unittest.main()